@@ -0,0 +1,36 @@
+-- analyses/skills_extraction_report.sql
+-- Rapport de couverture de l'extraction des compétences
+-- Usage: dbt compile --select skills_extraction_report, puis exécuter le SQL
+-- compilé (target/compiled/...) dans DuckDB
+
+WITH jobs AS (
+    SELECT COUNT(DISTINCT job_url) as total_jobs
+    FROM {{ ref('int_job_title_normalization') }}
+),
+
+skills_per_job AS (
+    SELECT
+        job_url,
+        COUNT(*) as skills_count
+    FROM {{ ref('int_skills_extraction') }}
+    GROUP BY job_url
+),
+
+per_skill AS (
+    SELECT
+        skill_name,
+        COUNT(DISTINCT job_url) as jobs_matched
+    FROM {{ ref('int_skills_extraction') }}
+    GROUP BY skill_name
+)
+
+SELECT
+    p.skill_name,
+    p.jobs_matched,
+    ROUND(100.0 * p.jobs_matched / j.total_jobs, 2) as pct_of_jobs,
+    (SELECT COUNT(*) FROM skills_per_job) as jobs_with_any_skill,
+    (SELECT ROUND(AVG(skills_count), 2) FROM skills_per_job) as avg_skills_per_job,
+    j.total_jobs
+FROM per_skill p
+CROSS JOIN jobs j
+ORDER BY p.jobs_matched DESC
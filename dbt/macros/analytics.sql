@@ -0,0 +1,40 @@
+-- macros/analytics.sql
+-- Utilitaires des agrégats gold (cubes et répartitions par catégorie)
+
+{% macro cube_grouping_set(dimensions) %}
+    {#-
+        Nom du grouping set d'une ligne de CUBE: les dimensions non agrégées,
+        séparées par des virgules ('' pour le total général). Distingue un
+        sous-total (dimension agrégée) d'une vraie valeur NULL.
+    -#}
+    CONCAT_WS(','
+        {%- for dimension in dimensions %},
+        CASE WHEN GROUPING({{ dimension }}) = 0 THEN '{{ dimension }}' END
+        {%- endfor %}
+    )
+{% endmacro %}
+
+
+{% macro job_category_counts(category_column, id_column) %}
+    {#-
+        Une colonne <categorie>_count par catégorie du seed job_title_patterns
+        (plus la catégorie par défaut), au lieu d'une liste figée dans le modèle
+    -#}
+    {%- if execute -%}
+        {%- set query -%}
+            SELECT job_category, REGEXP_REPLACE(LOWER(job_category), '[^a-z0-9]+', '_', 'g') || '_count'
+            FROM (
+                SELECT job_category, MIN(priority) as priority FROM {{ ref('job_title_patterns') }} GROUP BY job_category
+                UNION ALL
+                SELECT 'Other Data/AI Role', NULL
+            )
+            ORDER BY priority NULLS LAST
+        {%- endset -%}
+        {%- set categories = run_query(query).rows -%}
+    {%- else -%}
+        {%- set categories = [] -%}
+    {%- endif -%}
+    {%- for category, column_name in categories %}
+    COUNT({{ id_column }}) FILTER (WHERE {{ category_column }} = '{{ category | replace("'", "''") }}') as {{ column_name }},
+    {%- endfor %}
+{% endmacro %}
@@ -0,0 +1,68 @@
+-- macros/incremental.sql
+-- Utilitaires des modèles incrémentaux (silver et gold)
+
+{% macro incremental_filter(column, target_column=none, lookback_days=0) %}
+    {#-
+        Condition de sélection des lignes nouvelles lors d'un run incrémental:
+        `column` > MAX(target_column) de la table existante, moins `lookback_days`
+        jours pour réintégrer les mises à jour tardives. Vaut TRUE en full refresh,
+        ainsi que pour une table vide ou une valeur NULL (ligne retraitée).
+    -#}
+    {%- if is_incremental() -%}
+        ({{ column }} > (
+            SELECT MAX({{ target_column or column }}){% if lookback_days %} - INTERVAL {{ lookback_days }} DAY{% endif %}
+            FROM {{ this }}
+        )) IS NOT FALSE
+    {%- else -%}
+        TRUE
+    {%- endif -%}
+{% endmacro %}
+
+
+{% macro partition_filter(partition_column, target_column) %}
+    {#-
+        Élagage des partitions Hive: `partition_column` >= date de MAX(target_column)
+        de la table existante, résolue à la compilation et insérée comme littéral
+        DATE (DuckDB n'élague pas les fichiers sur une sous-requête). TRUE en full
+        refresh et pour une table vide.
+    -#}
+    {%- set high_water = none -%}
+    {%- if is_incremental() and execute -%}
+        {%- set high_water = run_query("SELECT CAST(MAX(" ~ target_column ~ ") AS DATE) FROM " ~ this).columns[0].values()[0] -%}
+    {%- endif -%}
+    {%- if high_water is not none -%}
+        {{ partition_column }} >= DATE '{{ high_water }}'
+    {%- else -%}
+        TRUE
+    {%- endif -%}
+{% endmacro %}
+
+
+{% macro stable_surrogate_id(id_column, order_by, existing_id=none) %}
+    {#-
+        Clé de substitution stable d'un run à l'autre: les lignes déjà connues
+        gardent `existing_id`, les nouvelles sont numérotées à la suite du
+        MAX(id_column) existant. En full refresh: ROW_NUMBER() OVER (ORDER BY ...).
+    -#}
+    {%- if is_incremental() -%}
+        {%- if existing_id %}COALESCE({{ existing_id }}, {% endif -%}
+        (SELECT COALESCE(MAX({{ id_column }}), 0) FROM {{ this }})
+            + ROW_NUMBER() OVER ({% if existing_id %}PARTITION BY {{ existing_id }} IS NULL {% endif %}ORDER BY {{ order_by }})
+        {%- if existing_id %}){% endif -%}
+    {%- else -%}
+        ROW_NUMBER() OVER (ORDER BY {{ order_by }})
+    {%- endif -%}
+{% endmacro %}
+
+
+{% macro delete_orphans(column, parent_relation, parent_column=none) %}
+    {#-
+        Post-hook: supprime les lignes dont la clé n'existe plus dans le parent
+        (ex: offre remplacée par une republication plus récente lors du dédoublonnage)
+    -#}
+    DELETE FROM {{ this }}
+    WHERE {{ column }} NOT IN (
+        SELECT {{ parent_column or column }} FROM {{ parent_relation }}
+        WHERE {{ parent_column or column }} IS NOT NULL
+    )
+{% endmacro %}
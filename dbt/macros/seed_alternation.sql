@@ -0,0 +1,33 @@
+-- macros/seed_alternation.sql
+-- Compile les motifs d'un seed en une seule alternance regex
+
+{% macro seed_alternation(seed_name, pattern_column, prefix='\\b(', suffix=')\\b') %}
+    {#-
+        Retourne le littéral SQL prefix || '(?:alt1)|(?:alt2)|...' || suffix, construit
+        à la compilation depuis le seed (les alternatives de chaque motif sont séparées
+        par '|'): la regex est constante, compilée une seule fois par DuckDB, et
+        chaque texte n'est parcouru qu'une fois. Les alternatives les plus longues
+        passent en premier ("machine learning engineer" avant "machine learning").
+    -#}
+    {%- if execute -%}
+        {%- set query -%}
+            SELECT '{{ prefix }}' || STRING_AGG('(?:' || alternative || ')', '|' ORDER BY LENGTH(alternative) DESC, alternative) || '{{ suffix }}'
+            FROM (SELECT UNNEST(STRING_SPLIT({{ pattern_column }}, '|')) as alternative FROM {{ ref(seed_name) }})
+        {%- endset -%}
+        {%- set regex = run_query(query).columns[0].values()[0] -%}
+    {%- else -%}
+        {%- set regex = prefix ~ suffix -%}
+    {%- endif -%}
+    '{{ regex | replace("'", "''") }}'
+{% endmacro %}
+
+
+{% macro skills_alternation() %}
+    {{- seed_alternation('skills_patterns', 'skill_pattern') -}}
+{% endmacro %}
+
+
+{% macro city_alternation() %}
+    {#- Villes en mots entiers (bornes explicites: \b de RE2 ignore les lettres accentuées) -#}
+    {{- seed_alternation('morocco_cities', 'city', '(?:^|[^a-zà-ÿ])(', ')(?:[^a-zà-ÿ]|$)') -}}
+{% endmacro %}
@@ -1,6 +1,7 @@
 
 -- models/bronze/stg_jobs_raw.sql
--- Bronze layer: Lecture directe des données brutes depuis final_data.csv
+-- Bronze layer: Lecture des dépôts bruts convertis en Parquet par run_pipeline.py
+-- (data/bronze/jobs/ingestion_date=YYYY-MM-DD/*.parquet, var bronze_jobs_glob)
 -- Renommage et typage minimal
 
 {{ config(
@@ -10,7 +11,7 @@
     meta={'owner': 'data_engineering'}
 ) }}
 
--- Read directly from CSV file
+-- Partitions Hive: le filtre sur ingestion_date des modèles aval élague les fichiers
 SELECT
     -- Renommer les colonnes pour cohérence
     title as job_title,
@@ -24,11 +25,13 @@ SELECT
     contractType as contract_type,
     workType as work_type,
     
-    -- Métadonnées de traçabilité
-    NOW() as ingestion_timestamp,
+    -- Métadonnées de traçabilité (horodatage de conversion du dépôt)
+    _ingested_at as ingestion_timestamp,
+    ingestion_date,
+    _source_file as source_file,
     '{{ run_started_at }}' as dbt_run_id
 
-FROM read_csv_auto('D:/lab2/final_data.csv')
+FROM read_parquet('{{ var("bronze_jobs_glob") }}', hive_partitioning = true, union_by_name = true)
 
 WHERE 1=1
     -- Filtrer les lignes vides
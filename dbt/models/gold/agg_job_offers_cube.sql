@@ -0,0 +1,46 @@
+-- models/gold/agg_job_offers_cube.sql
+-- Gold layer: Aggregate - Cube des offres (catégorie × mois × pays × contrat)
+-- Tous les sous-totaux en une seule passe (GROUP BY CUBE); grouping_set indique
+-- les dimensions détaillées de chaque ligne ('' = total général)
+
+{{ config(
+    materialized='table',
+    schema='gold',
+    tags=['gold', 'aggregate', 'cube'],
+    meta={'owner': 'analytics'}
+) }}
+
+{% set dimensions = var('analytics_cube_dimensions') %}
+
+WITH offers AS (
+    SELECT
+        f.job_offer_id,
+        f.company_id,
+        f.job_category,
+        f.published_year_month,
+        f.contract_type,
+        f.is_remote,
+        f.is_permanent,
+        f.description_length,
+        l.country
+    FROM {{ ref('fact_job_offers') }} f
+    LEFT JOIN {{ ref('dim_location') }} l ON f.location_id = l.location_id
+)
+
+SELECT
+    {{ cube_grouping_set(dimensions) }} as grouping_set,
+    {%- for dimension in dimensions %}
+    {{ dimension }},
+    {%- endfor %}
+    
+    COUNT(*) as count_job_offers,
+    COUNT(DISTINCT company_id) as count_companies,
+    COUNT(*) FILTER (WHERE is_remote = 1) as remote_jobs,
+    COUNT(*) FILTER (WHERE is_permanent = 1) as permanent_jobs,
+    AVG(description_length) as avg_description_length,
+    
+    NOW() as created_at
+    
+FROM offers
+GROUP BY CUBE({{ dimensions | join(', ') }})
+ORDER BY grouping_set, count_job_offers DESC
@@ -16,18 +16,15 @@ SELECT
     dl.country,
     dl.work_location_type,
     
-    COUNT(DISTINCT f.job_offer_id) as count_job_offers,
+    COUNT(f.job_offer_id) as count_job_offers,
     COUNT(DISTINCT f.company_id) as count_companies,
     
-    -- Distribution by job category
-    COUNT(DISTINCT CASE WHEN f.job_category = 'Data Engineer' THEN f.job_offer_id END) as data_engineer_count,
-    COUNT(DISTINCT CASE WHEN f.job_category = 'Data Scientist' THEN f.job_offer_id END) as data_scientist_count,
-    COUNT(DISTINCT CASE WHEN f.job_category = 'Data Analyst' THEN f.job_offer_id END) as data_analyst_count,
-    COUNT(DISTINCT CASE WHEN f.job_category = 'ML Engineer' THEN f.job_offer_id END) as ml_engineer_count,
+    -- Distribution by job category (une colonne par catégorie du seed job_title_patterns)
+    {{- job_category_counts('f.job_category', 'f.job_offer_id') }}
     
     -- Remote percentage
     ROUND(
-        100.0 * SUM(CASE WHEN f.is_remote = 1 THEN 1 ELSE 0 END) / COUNT(DISTINCT f.job_offer_id),
+        100.0 * SUM(f.is_remote) / NULLIF(COUNT(f.job_offer_id), 0),
         2
     ) as pct_remote,
     
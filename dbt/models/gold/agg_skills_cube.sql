@@ -0,0 +1,69 @@
+-- models/gold/agg_skills_cube.sql
+-- Gold layer: Aggregate - Cube des compétences (compétence × catégorie × mois × pays × contrat)
+-- Une passe sur fact_job_skills; pct_of_jobs rapporte chaque cellule au même
+-- grouping set de agg_job_offers_cube
+
+{{ config(
+    materialized='table',
+    schema='gold',
+    tags=['gold', 'aggregate', 'cube'],
+    meta={'owner': 'analytics'}
+) }}
+
+{% set dimensions = var('analytics_cube_dimensions') %}
+
+WITH skill_offers AS (
+    SELECT
+        fs.skill_id,
+        sd.skill_name,
+        sd.skill_category,
+        f.job_offer_id,
+        f.company_id,
+        f.job_category,
+        f.published_year_month,
+        f.contract_type,
+        l.country
+    FROM {{ ref('fact_job_skills') }} fs
+    INNER JOIN {{ ref('dim_skills') }} sd ON fs.skill_id = sd.skill_id
+    INNER JOIN {{ ref('fact_job_offers') }} f ON fs.job_offer_id = f.job_offer_id
+    LEFT JOIN {{ ref('dim_location') }} l ON f.location_id = l.location_id
+),
+
+skills_cube AS (
+    SELECT
+        {{ cube_grouping_set(dimensions) }} as grouping_set,
+        skill_id,
+        skill_name,
+        skill_category,
+        {%- for dimension in dimensions %}
+        {{ dimension }},
+        {%- endfor %}
+        -- (offre, compétence) est unique dans fact_job_skills
+        COUNT(*) as count_job_offers,
+        COUNT(DISTINCT company_id) as count_companies
+    FROM skill_offers
+    GROUP BY skill_id, skill_name, skill_category, CUBE({{ dimensions | join(', ') }})
+)
+
+SELECT
+    s.grouping_set,
+    s.skill_id,
+    s.skill_name,
+    s.skill_category,
+    {%- for dimension in dimensions %}
+    s.{{ dimension }},
+    {%- endfor %}
+    
+    s.count_job_offers,
+    s.count_companies,
+    ROUND(100.0 * s.count_job_offers / NULLIF(o.count_job_offers, 0), 2) as pct_of_jobs,
+    
+    NOW() as created_at
+    
+FROM skills_cube s
+LEFT JOIN {{ ref('agg_job_offers_cube') }} o
+    ON s.grouping_set = o.grouping_set
+    {%- for dimension in dimensions %}
+    AND s.{{ dimension }} IS NOT DISTINCT FROM o.{{ dimension }}
+    {%- endfor %}
+ORDER BY s.grouping_set, s.count_job_offers DESC
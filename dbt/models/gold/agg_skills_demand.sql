@@ -9,19 +9,23 @@
     meta={'owner': 'analytics'}
 ) }}
 
+WITH totals AS (
+    -- Calculé une fois (et non une sous-requête par compétence)
+    SELECT COUNT(*) as total_jobs FROM {{ ref('fact_job_offers') }}
+)
+
 SELECT
     sd.skill_id,
     sd.skill_name,
     sd.skill_category,
     
-    COUNT(DISTINCT fs.job_offer_id) as count_jobs_requiring_skill,
+    -- (offre, compétence) est unique dans fact_job_skills
+    COUNT(fs.job_offer_id) as count_jobs_requiring_skill,
     COUNT(DISTINCT f.company_id) as count_companies_requiring_skill,
     
     -- Percentage of all jobs
     ROUND(
-        100.0 * COUNT(DISTINCT fs.job_offer_id) / (
-            SELECT COUNT(DISTINCT job_offer_id) FROM {{ ref('fact_job_offers') }}
-        ),
+        100.0 * COUNT(fs.job_offer_id) / NULLIF(ANY_VALUE(t.total_jobs), 0),
         2
     ) as pct_of_total_jobs,
     
@@ -32,6 +36,7 @@ SELECT
     NOW() as created_at
     
 FROM {{ ref('dim_skills') }} sd
+CROSS JOIN totals t
 LEFT JOIN {{ ref('fact_job_skills') }} fs ON sd.skill_id = fs.skill_id
 LEFT JOIN {{ ref('fact_job_offers') }} f ON fs.job_offer_id = f.job_offer_id
 GROUP BY
@@ -1,9 +1,11 @@
 
 -- models/gold/dim_company.sql
 -- Gold layer: Dimension Company
+-- Append-only: les entreprises connues gardent leur company_id
 
 {{ config(
-    materialized='table',
+    materialized='incremental',
+    incremental_strategy='append',
     schema='gold',
     tags=['gold', 'dimension'],
     unique_id='company_id',
@@ -14,13 +16,20 @@ WITH jobs AS (
     SELECT DISTINCT
         company_name_cleaned,
         company_url
-    FROM {{ ref('int_job_title_normalization') }}
+    FROM {{ ref('int_job_title_normalization') }} j
     WHERE company_name_cleaned IS NOT NULL
+    {% if is_incremental() %}
+        AND NOT EXISTS (
+            SELECT 1 FROM {{ this }} d
+            WHERE d.company_name = j.company_name_cleaned
+                AND d.company_url IS NOT DISTINCT FROM j.company_url
+        )
+    {% endif %}
 ),
 
 ranked_companies AS (
     SELECT
-        ROW_NUMBER() OVER (ORDER BY company_name_cleaned) as company_id,
+        {{ stable_surrogate_id('company_id', 'company_name_cleaned') }} as company_id,
         company_name_cleaned as company_name,
         company_url,
         NOW() as created_at
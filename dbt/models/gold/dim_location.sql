@@ -2,9 +2,11 @@
 -- models/gold/dim_location.sql
 -- Gold layer: Dimension Location
 -- RecruiterAI - Enhanced with Morocco Focus
+-- Append-only: les localisations connues gardent leur location_id
 
 {{ config(
-    materialized='table',
+    materialized='incremental',
+    incremental_strategy='append',
     schema='gold',
     tags=['gold', 'dimension'],
     unique_id='location_id',
@@ -16,6 +18,29 @@ WITH jobs AS (
         location_cleaned as location_raw
     FROM {{ ref('int_job_title_normalization') }}
     WHERE location_cleaned IS NOT NULL
+    {% if is_incremental() %}
+        AND location_cleaned NOT IN (SELECT location_raw FROM {{ this }})
+    {% endif %}
+),
+
+region_cities AS (
+    SELECT city, region, priority FROM {{ ref('morocco_cities') }}
+),
+
+location_regions AS (
+    -- Une seule passe regex par localisation: villes trouvées (mots entiers),
+    -- la plus petite priorité l'emporte (une ville avant "morocco"/"maroc"), puis la région
+    SELECT
+        l.location_raw,
+        ARG_MIN(r.region, (r.priority, r.region)) as morocco_region
+    FROM (
+        SELECT
+            location_raw,
+            UNNEST(REGEXP_EXTRACT_ALL(LOWER(location_raw), {{ city_alternation() }}, 1)) as city
+        FROM jobs
+    ) l
+    JOIN region_cities r ON l.city = r.city
+    GROUP BY l.location_raw
 ),
 
 location_parsed AS (
@@ -42,48 +67,18 @@ location_parsed AS (
             ELSE 'On-site'
         END as work_location_type,
         
-        -- Morocco region classification
-        CASE 
-            WHEN LOWER(location_raw) LIKE '%casablanca%' THEN 'Casablanca-Settat'
-            WHEN LOWER(location_raw) LIKE '%rabat%' OR LOWER(location_raw) LIKE '%salé%' OR LOWER(location_raw) LIKE '%sale%' THEN 'Rabat-Salé-Kénitra'
-            WHEN LOWER(location_raw) LIKE '%marrakech%' OR LOWER(location_raw) LIKE '%marrakesh%' THEN 'Marrakech-Safi'
-            WHEN LOWER(location_raw) LIKE '%tanger%' OR LOWER(location_raw) LIKE '%tangier%' OR LOWER(location_raw) LIKE '%tetouan%' THEN 'Tanger-Tétouan-Al Hoceïma'
-            WHEN LOWER(location_raw) LIKE '%fes%' OR LOWER(location_raw) LIKE '%fez%' OR LOWER(location_raw) LIKE '%meknes%' THEN 'Fès-Meknès'
-            WHEN LOWER(location_raw) LIKE '%agadir%' THEN 'Souss-Massa'
-            WHEN LOWER(location_raw) LIKE '%oujda%' OR LOWER(location_raw) LIKE '%nador%' THEN 'Oriental'
-            WHEN LOWER(location_raw) LIKE '%kenitra%' OR LOWER(location_raw) LIKE '%kénitra%' THEN 'Rabat-Salé-Kénitra'
-            WHEN LOWER(location_raw) LIKE '%mohammedia%' THEN 'Casablanca-Settat'
-            WHEN LOWER(location_raw) LIKE '%el jadida%' THEN 'Casablanca-Settat'
-            WHEN LOWER(location_raw) LIKE '%beni mellal%' THEN 'Béni Mellal-Khénifra'
-            WHEN LOWER(location_raw) LIKE '%morocco%' OR LOWER(location_raw) LIKE '%maroc%' THEN 'Morocco (General)'
-            ELSE NULL
-        END as morocco_region,
+        -- Morocco region (seed morocco_cities, partagé avec le recommender)
+        lr.morocco_region,
         
         -- Priority flag for Morocco jobs
-        CASE 
-            WHEN LOWER(location_raw) LIKE '%morocco%' 
-                OR LOWER(location_raw) LIKE '%maroc%'
-                OR LOWER(location_raw) LIKE '%casablanca%'
-                OR LOWER(location_raw) LIKE '%rabat%'
-                OR LOWER(location_raw) LIKE '%marrakech%'
-                OR LOWER(location_raw) LIKE '%tanger%'
-                OR LOWER(location_raw) LIKE '%fes%'
-                OR LOWER(location_raw) LIKE '%agadir%'
-                OR LOWER(location_raw) LIKE '%oujda%'
-                OR LOWER(location_raw) LIKE '%kenitra%'
-                OR LOWER(location_raw) LIKE '%tetouan%'
-                OR LOWER(location_raw) LIKE '%meknes%'
-                OR LOWER(location_raw) LIKE '%salé%'
-                OR LOWER(location_raw) LIKE '%mohammedia%'
-            THEN TRUE
-            ELSE FALSE
-        END as is_morocco
+        lr.morocco_region IS NOT NULL as is_morocco
     FROM jobs
+    LEFT JOIN location_regions lr USING (location_raw)
 ),
 
 ranked_locations AS (
     SELECT
-        ROW_NUMBER() OVER (ORDER BY is_morocco DESC, location_raw) as location_id,
+        {{ stable_surrogate_id('location_id', 'is_morocco DESC, location_raw') }} as location_id,
         location_raw,
         city,
         country,
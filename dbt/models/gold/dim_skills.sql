@@ -1,9 +1,11 @@
 
 -- models/gold/dim_skills.sql
 -- Gold layer: Dimension Skills
+-- Append-only: les compétences connues gardent leur skill_id
 
 {{ config(
-    materialized='table',
+    materialized='incremental',
+    incremental_strategy='append',
     schema='gold',
     tags=['gold', 'dimension'],
     unique_id='skill_id',
@@ -15,29 +17,23 @@ WITH skills AS (
         skill_name
     FROM {{ ref('int_skills_extraction') }}
     WHERE skill_name IS NOT NULL
+    {% if is_incremental() %}
+        AND skill_name NOT IN (SELECT skill_name FROM {{ this }})
+    {% endif %}
 ),
 
 skill_categorization AS (
+    -- Catégorie portée par le seed skills_patterns (même taxonomie que le recommender)
     SELECT
-        skill_name,
-        CASE
-            WHEN skill_name IN ('Python', 'Java', 'Scala', 'R') THEN 'Programming Language'
-            WHEN skill_name IN ('SQL', 'NoSQL') THEN 'Database'
-            WHEN skill_name IN ('Spark', 'Hadoop', 'Hive', 'Kafka') THEN 'Big Data Framework'
-            WHEN skill_name IN ('TensorFlow', 'PyTorch', 'Scikit-learn') THEN 'ML/DL Library'
-            WHEN skill_name IN ('AWS', 'Azure', 'GCP') THEN 'Cloud Platform'
-            WHEN skill_name IN ('Tableau', 'Power BI', 'Looker') THEN 'BI Tool'
-            WHEN skill_name IN ('Airflow', 'DBT', 'Kubernetes', 'Docker') THEN 'DataOps/DevOps'
-            WHEN skill_name IN ('Pandas', 'NumPy', 'Matplotlib') THEN 'Data Analysis Library'
-            WHEN skill_name IN ('Machine Learning', 'Statistics', 'Data Visualization') THEN 'Domain Knowledge'
-            ELSE 'Other'
-        END as skill_category
-    FROM skills
+        s.skill_name,
+        COALESCE(p.skill_category, 'Other') as skill_category
+    FROM skills s
+    LEFT JOIN {{ ref('skills_patterns') }} p ON s.skill_name = p.skill_name
 ),
 
 ranked_skills AS (
     SELECT
-        ROW_NUMBER() OVER (ORDER BY skill_name) as skill_id,
+        {{ stable_surrogate_id('skill_id', 'skill_name') }} as skill_id,
         skill_name,
         skill_category,
         NOW() as created_at
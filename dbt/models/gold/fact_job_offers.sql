@@ -3,7 +3,10 @@
 -- Gold layer: Fact Table - Job Offers (Schéma en Étoile)
 
 {{ config(
-    materialized='table',
+    materialized='incremental',
+    incremental_strategy='delete+insert',
+    unique_key='job_url',
+    post_hook="{{ delete_orphans('job_url', ref('int_job_title_normalization')) }}",
     schema='gold',
     tags=['gold', 'fact'],
     meta={'owner': 'analytics'}
@@ -13,6 +16,16 @@ WITH jobs AS (
     SELECT
         j.*
     FROM {{ ref('int_job_title_normalization') }} j
+    WHERE {{ incremental_filter('j.ingestion_timestamp', 'ingestion_timestamp') }}
+),
+
+existing_ids AS (
+    -- Identifiants déjà attribués (stables d'un run à l'autre)
+    {% if is_incremental() %}
+    SELECT job_url, job_offer_id FROM {{ this }}
+    {% else %}
+    SELECT NULL::VARCHAR as job_url, NULL::BIGINT as job_offer_id WHERE FALSE
+    {% endif %}
 ),
 
 companies AS (
@@ -30,7 +43,7 @@ times AS (
 fact_table AS (
     SELECT
         -- Surrogate keys
-        ROW_NUMBER() OVER (ORDER BY j.job_url, j.company_name_cleaned) as job_offer_id,
+        {{ stable_surrogate_id('job_offer_id', 'j.job_url, j.company_name_cleaned', 'e.job_offer_id') }} as job_offer_id,
         
         -- Foreign keys
         c.company_id,
@@ -73,6 +86,7 @@ fact_table AS (
     LEFT JOIN companies c ON j.company_name_cleaned = c.company_name
     LEFT JOIN locations l ON j.location_cleaned = l.location_raw
     LEFT JOIN times t ON j.published_date = t.date_id
+    LEFT JOIN existing_ids e ON j.job_url = e.job_url
 )
 
 SELECT
@@ -1,20 +1,24 @@
-
 -- models/gold/fact_job_skills.sql
 -- Gold layer: Bridge Table - Job Skills
 
 {{ config(
-    materialized='table',
+    materialized='incremental',
+    incremental_strategy='delete+insert',
+    unique_key='job_offer_id',
+    post_hook="{{ delete_orphans('job_offer_id', ref('fact_job_offers')) }}",
     schema='gold',
     tags=['gold', 'fact', 'bridge'],
     meta={'owner': 'analytics'}
 ) }}
 
 WITH skills_raw AS (
-    SELECT DISTINCT
+    SELECT
         job_url,
-        company_name_cleaned,
-        skill_name
+        skill_name,
+        MAX(ingestion_timestamp) as ingestion_timestamp
     FROM {{ ref('int_skills_extraction') }}
+    WHERE {{ incremental_filter('ingestion_timestamp') }}
+    GROUP BY job_url, skill_name
 ),
 
 jobs AS (
@@ -31,16 +35,27 @@ skills_dim AS (
     FROM {{ ref('dim_skills') }}
 ),
 
+existing_ids AS (
+    -- Identifiants déjà attribués (stables d'un run à l'autre)
+    {% if is_incremental() %}
+    SELECT job_offer_id, skill_id, job_skill_id FROM {{ this }}
+    {% else %}
+    SELECT NULL::BIGINT as job_offer_id, NULL::BIGINT as skill_id, NULL::BIGINT as job_skill_id WHERE FALSE
+    {% endif %}
+),
+
 fact_table AS (
     SELECT
-        ROW_NUMBER() OVER (ORDER BY s.job_url, sd.skill_id) as job_skill_id,
+        {{ stable_surrogate_id('job_skill_id', 's.job_url, sd.skill_id', 'e.job_skill_id') }} as job_skill_id,
         j.job_offer_id,
         sd.skill_id,
         s.skill_name,
-        NOW() as created_at
+        NOW() as created_at,
+        s.ingestion_timestamp
     FROM skills_raw s
     LEFT JOIN jobs j ON s.job_url = j.job_url
     LEFT JOIN skills_dim sd ON s.skill_name = sd.skill_name
+    LEFT JOIN existing_ids e ON j.job_offer_id = e.job_offer_id AND sd.skill_id = e.skill_id
 )
 
 SELECT
@@ -48,7 +63,8 @@ SELECT
     job_offer_id,
     skill_id,
     skill_name,
-    created_at
+    created_at,
+    ingestion_timestamp
 FROM fact_table
 WHERE job_offer_id IS NOT NULL
 ORDER BY job_offer_id, skill_id
@@ -1,10 +1,13 @@
 
 -- models/silver/int_job_title_normalization.sql
 -- Silver layer: Normaliser les intitulés de postes
+-- Catégories définies dans le seed job_title_patterns (partagé avec le recommender)
 -- RecruiterAI - Enhanced for Data & AI Job Categories
 
 {{ config(
-    materialized='table',
+    materialized='incremental',
+    incremental_strategy='delete+insert',
+    unique_key='dedup_key',
     schema='silver',
     tags=['silver', 'normalization'],
     meta={'owner': 'recruiter_ai'}
@@ -12,33 +15,40 @@
 
 WITH cleaned_jobs AS (
     SELECT * FROM {{ ref('int_jobs_cleaned') }}
+    WHERE {{ incremental_filter('ingestion_timestamp') }}
+),
+
+title_patterns AS (
+    -- Une ligne par terme du seed (ex: 'ml engineer' → ML Engineer, priorité 7)
+    SELECT
+        priority,
+        job_category,
+        UNNEST(STRING_SPLIT(pattern, '|')) as matched_term
+    FROM {{ ref('job_title_patterns') }}
+),
+
+title_terms AS (
+    -- Une seule passe regex par intitulé distinct
+    SELECT
+        job_title_cleaned,
+        UNNEST(REGEXP_EXTRACT_ALL(job_title_cleaned, {{ seed_alternation('job_title_patterns', 'pattern', '(', ')') }}, 1)) as matched_term
+    FROM (SELECT DISTINCT job_title_cleaned FROM cleaned_jobs WHERE job_title_cleaned IS NOT NULL)
+),
+
+title_categories AS (
+    -- Le terme de plus petite priorité l'emporte (ordre du seed)
+    SELECT
+        t.job_title_cleaned,
+        ARG_MIN(p.job_category, p.priority) as job_category
+    FROM title_terms t
+    JOIN title_patterns p ON t.matched_term = p.matched_term
+    GROUP BY t.job_title_cleaned
 ),
 
 title_normalized AS (
     SELECT
-        *,
-        CASE
-            -- AI/ML Roles (Priority - Most Specific First)
-            WHEN job_title_cleaned LIKE '%llm%' OR job_title_cleaned LIKE '%large language model%' OR job_title_cleaned LIKE '%generative ai%' OR job_title_cleaned LIKE '%genai%' THEN 'GenAI/LLM Engineer'
-            WHEN job_title_cleaned LIKE '%nlp%' OR job_title_cleaned LIKE '%natural language processing%' THEN 'NLP Engineer'
-            WHEN job_title_cleaned LIKE '%computer vision%' OR job_title_cleaned LIKE '%cv engineer%' OR job_title_cleaned LIKE '%image recognition%' THEN 'Computer Vision Engineer'
-            WHEN job_title_cleaned LIKE '%deep learning%' THEN 'Deep Learning Engineer'
-            WHEN job_title_cleaned LIKE '%mlops%' OR job_title_cleaned LIKE '%ml ops%' OR job_title_cleaned LIKE '%machine learning ops%' THEN 'MLOps Engineer'
-            WHEN job_title_cleaned LIKE '%ai engineer%' OR job_title_cleaned LIKE '%artificial intelligence engineer%' THEN 'AI Engineer'
-            WHEN job_title_cleaned LIKE '%ml engineer%' OR job_title_cleaned LIKE '%machine learning engineer%' THEN 'ML Engineer'
-            WHEN job_title_cleaned LIKE '%machine learning%' OR job_title_cleaned LIKE '%ml specialist%' THEN 'ML Engineer'
-            
-            -- Data Science & Analytics Roles
-            WHEN job_title_cleaned LIKE '%data scientist%' THEN 'Data Scientist'
-            WHEN job_title_cleaned LIKE '%data engineer%' THEN 'Data Engineer'
-            WHEN job_title_cleaned LIKE '%data analyst%' THEN 'Data Analyst'
-            WHEN job_title_cleaned LIKE '%analytics engineer%' THEN 'Analytics Engineer'
-            WHEN job_title_cleaned LIKE '%data architect%' THEN 'Data Architect'
-            WHEN job_title_cleaned LIKE '%bi developer%' OR job_title_cleaned LIKE '%business intelligence%' THEN 'BI Developer'
-            WHEN job_title_cleaned LIKE '%etl%' OR job_title_cleaned LIKE '%pipeline%' THEN 'ETL/Pipeline Engineer'
-            
-            ELSE 'Other Data/AI Role'
-        END as job_category,
+        c.*,
+        COALESCE(tc.job_category, 'Other Data/AI Role') as job_category,
         
         CASE
             WHEN contract_type_cleaned LIKE '%cdi%' OR contract_type_cleaned LIKE '%permanent%' OR contract_type_cleaned LIKE '%full-time%' OR contract_type_cleaned LIKE '%full time%' THEN 'Full-time'
@@ -56,8 +66,24 @@ title_normalized AS (
             ELSE 'Not Specified'
         END as work_type_normalized
     
-    FROM cleaned_jobs
-    WHERE dedup_rank = 1  -- Keep only first occurrence (most recent)
+    FROM cleaned_jobs c
+    LEFT JOIN title_categories tc ON c.job_title_cleaned = tc.job_title_cleaned
+),
+
+candidates AS (
+    SELECT * FROM title_normalized
+    {% if is_incremental() %}
+    -- Les offres déjà retenues concourent avec le lot pour le dédoublonnage
+    UNION ALL BY NAME
+    SELECT * FROM {{ this }}
+    WHERE dedup_key IN (SELECT dedup_key FROM title_normalized)
+    {% endif %}
 )
 
-SELECT * FROM title_normalized
+SELECT *
+FROM candidates
+-- Keep only first occurrence (most recent)
+QUALIFY ROW_NUMBER() OVER (
+    PARTITION BY dedup_key
+    ORDER BY published_date DESC NULLS LAST, ingestion_timestamp DESC
+) = 1
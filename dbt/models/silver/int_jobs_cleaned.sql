@@ -1,9 +1,13 @@
 
 -- models/silver/int_jobs_cleaned.sql
 -- Silver layer: Nettoyage et normalisation des données brutes
+-- Incrémental: seules les partitions bronze ingérées depuis le dernier run sont
+-- lues; une offre présente dans plusieurs dépôts garde sa version la plus récente
 
 {{ config(
-    materialized='table',
+    materialized='incremental',
+    incremental_strategy='delete+insert',
+    unique_key='job_url',
     schema='silver',
     tags=['silver', 'cleanup'],
     meta={'owner': 'data_engineering'}
@@ -11,6 +15,10 @@
 
 WITH raw_jobs AS (
     SELECT * FROM {{ ref('stg_jobs_raw') }}
+    WHERE {{ incremental_filter('ingestion_timestamp') }}
+        -- Élagage des partitions déjà traitées (littéral DATE résolu à la compilation)
+        AND {{ partition_filter('ingestion_date', 'ingestion_timestamp') }}
+    QUALIFY job_url IS NULL OR ROW_NUMBER() OVER (PARTITION BY job_url ORDER BY ingestion_timestamp DESC) = 1
 ),
 
 cleaned_jobs AS (
@@ -43,7 +51,10 @@ cleaned_jobs AS (
 
 SELECT
     *,
-    -- Deduplication flag
+    -- Clé de dédoublonnage (intitulé, entreprise, localisation)
+    MD5(CONCAT_WS('|', COALESCE(job_title_cleaned, ''), COALESCE(company_name_cleaned, ''), COALESCE(location_cleaned, ''))) as dedup_key,
+    -- Deduplication flag (relatif au lot traité en mode incrémental;
+    -- int_job_title_normalization dédoublonne sur l'ensemble des offres)
     ROW_NUMBER() OVER (
         PARTITION BY job_title_cleaned, company_name_cleaned, location_cleaned 
         ORDER BY published_date DESC
@@ -1,65 +1,70 @@
-
 -- models/silver/int_skills_extraction.sql
 -- Silver layer: Extraction des compétences depuis la description
+-- Une seule passe regex par description (alternance compilée depuis le seed
+-- skills_patterns), puis rattachement des termes trouvés à leurs compétences:
+-- un terme composé ("azure databricks") compte aussi pour les compétences
+-- citées en mots entiers à l'intérieur (Azure, Databricks)
 
 {{ config(
-    materialized='table',
+    materialized='incremental',
+    incremental_strategy='delete+insert',
+    unique_key='job_url',
+    post_hook="{{ delete_orphans('job_url', ref('int_job_title_normalization')) }}",
     schema='silver',
     tags=['silver', 'skills_extraction'],
     meta={'owner': 'data_engineering'}
 ) }}
 
 WITH jobs_with_titles AS (
-    SELECT * FROM {{ ref('int_job_title_normalization') }}
+    SELECT
+        job_url,
+        company_name_cleaned,
+        job_title_cleaned,
+        job_category,
+        published_date,
+        ingestion_timestamp,
+        job_description_cleaned
+    FROM {{ ref('int_job_title_normalization') }}
+    WHERE job_description_cleaned IS NOT NULL
+        AND {{ incremental_filter('ingestion_timestamp') }}
 ),
 
-skills_mapping AS (
-    -- Définir un mapping de compétences communes Data/Tech
-    SELECT
-        'Python' as skill_name,
-        'python|py |\.py' as skill_pattern
-    UNION ALL SELECT 'SQL', 'sql|sql|sql server|postgres|oracle'
-    UNION ALL SELECT 'Spark', 'spark|pyspark'
-    UNION ALL SELECT 'Hadoop', 'hadoop|hdfs'
-    UNION ALL SELECT 'Scala', 'scala'
-    UNION ALL SELECT 'Java', '\bjava\b'
-    UNION ALL SELECT 'R', '\br\b|r programming'
-    UNION ALL SELECT 'Tableau', 'tableau'
-    UNION ALL SELECT 'Power BI', 'power bi|powerbi'
-    UNION ALL SELECT 'Looker', 'looker'
-    UNION ALL SELECT 'AWS', 'aws|amazon web|s3 |ec2|redshift'
-    UNION ALL SELECT 'Azure', 'azure|microsoft azure|synapse|cosmos'
-    UNION ALL SELECT 'GCP', 'gcp|google cloud|bigquery'
-    UNION ALL SELECT 'Airflow', 'airflow'
-    UNION ALL SELECT 'DBT', '\bdbt\b|dbt'
-    UNION ALL SELECT 'Kubernetes', 'kubernetes|k8s'
-    UNION ALL SELECT 'Docker', 'docker'
-    UNION ALL SELECT 'Git', 'git|github|gitlab'
-    UNION ALL SELECT 'TensorFlow', 'tensorflow'
-    UNION ALL SELECT 'PyTorch', 'pytorch'
-    UNION ALL SELECT 'Scikit-learn', 'scikit|sklearn'
-    UNION ALL SELECT 'Pandas', 'pandas'
-    UNION ALL SELECT 'NumPy', 'numpy'
-    UNION ALL SELECT 'Machine Learning', 'machine learning|deep learning|ml|artificial intelligence'
-    UNION ALL SELECT 'Statistics', 'statistics|statistical|probability'
-    UNION ALL SELECT 'Data Visualization', 'data visualization|visualization|charts|graphs'
+skills_patterns AS (
+    SELECT skill_name, skill_pattern FROM {{ ref('skills_patterns') }}
+),
+
+matched_terms AS (
+    -- Tous les termes reconnus dans la description, en un seul parcours
+    SELECT DISTINCT
+        job_url,
+        company_name_cleaned,
+        job_title_cleaned,
+        job_category,
+        published_date,
+        ingestion_timestamp,
+        UNNEST(REGEXP_EXTRACT_ALL(job_description_cleaned, {{ skills_alternation() }}, 1)) as matched_term
+    FROM jobs_with_titles
 ),
 
-jobs_exploded AS (
+term_skills AS (
+    -- Vocabulaire des termes trouvés (quelques centaines) → compétences
     SELECT
-        j.*,
-        s.skill_name,
-        CASE 
-            WHEN job_description_cleaned ILIKE '%' || s.skill_pattern || '%' THEN 1 
-            ELSE 0 
-        END as has_skill
-    FROM jobs_with_titles j
-    CROSS JOIN skills_mapping s
+        t.matched_term,
+        s.skill_name
+    FROM (SELECT DISTINCT matched_term FROM matched_terms) t
+    JOIN skills_patterns s
+        ON REGEXP_MATCHES(t.matched_term, '\b(?:' || s.skill_pattern || ')\b')
 )
 
-SELECT
-    *
-FROM jobs_exploded
-WHERE has_skill = 1
+SELECT DISTINCT
+    m.job_url,
+    m.company_name_cleaned,
+    m.job_title_cleaned,
+    m.job_category,
+    m.published_date,
+    m.ingestion_timestamp,
+    ts.skill_name
+FROM matched_terms m
+JOIN term_skills ts ON m.matched_term = ts.matched_term
 
 ORDER BY job_title_cleaned, published_date DESC
@@ -0,0 +1,154 @@
+"""
+Requêtes analytiques servies depuis les cubes pré-agrégés de la couche Gold
+
+agg_job_offers_cube et agg_skills_cube contiennent tous les sous-totaux
+(GROUP BY CUBE) des dimensions catégorie × mois × pays × contrat; la colonne
+grouping_set liste les dimensions détaillées de chaque ligne. Une tranche
+(dimensions groupées + filtres d'égalité) correspond donc à un seul grouping
+set déjà calculé: aucune agrégation à la requête, seulement un filtre et un tri
+sur quelques milliers de lignes en mémoire.
+"""
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional
+
+import pandas as pd
+
+from config import ANALYTICS_CUBES, ANALYTICS_DEFAULT_LIMIT, ANALYTICS_MAX_LIMIT, DUCKDB_PATH, GOLD_DIR
+
+# Colonnes techniques des cubes (ni dimension, ni attribut, ni mesure)
+_TECHNICAL_COLUMNS = ['grouping_set', 'created_at']
+
+
+class Cube:
+    """Un cube chargé, découpé par grouping set"""
+
+    def __init__(self, name: str, df: pd.DataFrame, measures: List[str]):
+        self.name = name
+        self.measures = [measure for measure in measures if measure in df.columns]
+        grouping_sets = df['grouping_set'].fillna('').astype(str)
+        # Dimensions du CUBE: déduites des grouping sets (même liste que la var dbt)
+        self.dimensions = sorted({dim for value in grouping_sets.unique() for dim in value.split(',') if dim})
+        # Attributs présents dans chaque ligne (skill_name, skill_category... pour le cube compétences)
+        self.attributes = [
+            column for column in df.columns
+            if column not in self.dimensions and column not in self.measures and column not in _TECHNICAL_COLUMNS
+        ]
+        # Les filtres arrivent en texte: dimensions comparées comme chaînes (dates en YYYY-MM-DD)
+        for dim in self.dimensions:
+            values = df[dim].dt.strftime('%Y-%m-%d') if pd.api.types.is_datetime64_any_dtype(df[dim]) else df[dim]
+            df[dim] = values.map(lambda value: None if pd.isna(value) else str(value))
+        self.slices: Dict[FrozenSet[str], pd.DataFrame] = {
+            frozenset(key.split(',')) - {''}: frame.drop(columns=_TECHNICAL_COLUMNS, errors='ignore').reset_index(drop=True)
+            for key, frame in df.groupby(grouping_sets, sort=False)
+        }
+
+    def query(
+        self,
+        group_by: Optional[List[str]] = None,
+        filters: Optional[Dict[str, str]] = None,
+        measure: Optional[str] = None,
+        limit: int = ANALYTICS_DEFAULT_LIMIT
+    ) -> Dict:
+        """
+        Tranche du cube
+
+        Args:
+            group_by: Dimensions détaillées dans le résultat
+            filters: Égalités sur des dimensions (ajoutées au grouping set) ou des attributs
+            measure: Mesure de tri décroissant (défaut: première mesure du cube)
+            limit: Nombre maximum de lignes
+
+        Returns:
+            Dict avec le grouping set utilisé, le nombre de lignes trouvées et les lignes
+        """
+        group_by = list(dict.fromkeys(group_by or []))
+        filters = {key: value for key, value in (filters or {}).items() if value is not None}
+        measure = measure or self.measures[0]
+
+        unknown = [dim for dim in group_by if dim not in self.dimensions]
+        unknown += [key for key in filters if key not in self.dimensions and key not in self.attributes]
+        if unknown:
+            raise ValueError(
+                f"Dimension(s) inconnue(s) pour le cube '{self.name}': {', '.join(unknown)} "
+                f"(disponibles: {', '.join(self.dimensions + self.attributes)})"
+            )
+        if measure not in self.measures:
+            raise ValueError(f"Mesure inconnue: {measure} (disponibles: {', '.join(self.measures)})")
+
+        grouping_set = frozenset(group_by) | {key for key in filters if key in self.dimensions}
+        frame = self.slices.get(grouping_set)
+        columns = self.attributes + [dim for dim in self.dimensions if dim in grouping_set] + self.measures
+        if frame is None:
+            frame = pd.DataFrame(columns=columns)
+
+        mask = pd.Series(True, index=frame.index)
+        for key, value in filters.items():
+            column = frame[key] if key in self.dimensions else frame[key].astype(str)
+            mask &= column == str(value)
+        matched = frame.loc[mask, columns]
+
+        limit = max(1, min(int(limit), ANALYTICS_MAX_LIMIT))
+        top = matched.nlargest(limit, measure) if len(matched) > limit else matched.sort_values(measure, ascending=False)
+        rows = top.astype(object).where(top.notna(), None).to_dict('records')
+
+        return {
+            'cube': self.name,
+            'grouping_set': [dim for dim in self.dimensions if dim in grouping_set],
+            'measure': measure,
+            'total_rows': int(len(matched)),
+            'rows': rows,
+        }
+
+
+class CubeStore:
+    """Cubes analytiques chargés une fois en mémoire (API, dashboards)"""
+
+    def __init__(self, cubes: Dict[str, Cube]):
+        self.cubes = cubes
+
+    @classmethod
+    def load(cls, gold_dir: Optional[Path] = None) -> 'CubeStore':
+        """
+        Charge les cubes: base DuckDB de dbt si présente, sinon exports Parquet, sinon CSV
+
+        Raises:
+            FileNotFoundError: si un cube est introuvable (pipeline dbt non exécuté)
+        """
+        import duckdb
+
+        cubes = {}
+        use_warehouse = gold_dir is None and DUCKDB_PATH.exists()
+        gold_dir = Path(gold_dir) if gold_dir is not None else GOLD_DIR
+        conn = duckdb.connect(str(DUCKDB_PATH), read_only=True) if use_warehouse else duckdb.connect()
+        try:
+            for name, spec in ANALYTICS_CUBES.items():
+                table = spec['table']
+                parquet_path = gold_dir / f"{table}.parquet"
+                csv_path = gold_dir / f"{table}.csv"
+                if use_warehouse:
+                    relation = f"gold.{table}"
+                elif parquet_path.exists():
+                    relation = f"read_parquet('{parquet_path.as_posix()}')"
+                elif csv_path.exists():
+                    relation = f"read_csv_auto('{csv_path.as_posix()}', header = true)"
+                else:
+                    raise FileNotFoundError(f"Cube introuvable: {table} (exécuter le pipeline dbt)")
+                df = conn.execute(f"SELECT * FROM {relation}").df()
+                cubes[name] = Cube(name, df, spec['measures'])
+                print(f"  → Cube {name}: {len(df):,} lignes, {len(cubes[name].slices)} grouping sets")
+        finally:
+            conn.close()
+        return cls(cubes)
+
+    def describe(self) -> Dict:
+        """Dimensions, attributs et mesures de chaque cube"""
+        return {
+            name: {'dimensions': cube.dimensions, 'attributes': cube.attributes, 'measures': cube.measures}
+            for name, cube in self.cubes.items()
+        }
+
+    def query(self, cube: str, **kwargs) -> Dict:
+        """Tranche d'un cube (KeyError si le cube n'existe pas)"""
+        if cube not in self.cubes:
+            raise KeyError(f"Cube inconnu: {cube} (disponibles: {', '.join(self.cubes)})")
+        return self.cubes[cube].query(**kwargs)
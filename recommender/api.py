@@ -2,14 +2,36 @@
 RecruiterAI - FastAPI REST API
 Data & AI Job Recommendation API - Focus Morocco
 """
-from fastapi import FastAPI, File, UploadFile, HTTPException, Query
+import asyncio
+import hmac
+import io
+import json
+import time
+import zipfile
+from datetime import datetime
+
+from fastapi import FastAPI, File, UploadFile, HTTPException, Query, Request, Response, Header
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 import uvicorn
 
 from job_recommender import JobRecommender
-from config import API_HOST, API_PORT, DEFAULT_TOP_K, MAX_TOP_K, PROJECT_NAME, PROJECT_TAGLINE
+from timing import StageTimer, timing_stats
+from metrics import REGISTRY, CONTENT_TYPE, HTTP_REQUESTS, HTTP_LATENCY, HTTP_IN_FLIGHT, JOBS_INDEXED
+from cv_parser import CVParseError, get_parse_pool, shutdown_parse_pool
+from bulk_match import iter_cv_zip, stream_results, OUTPUT_FORMATS
+from tasks import TaskQueue, QueueFullError, InvalidCallbackError, validate_callback_url
+from pagination import ResultPageStore, InvalidCursorError, CursorExpiredError
+from profiler import sample, to_collapsed, install_signal_handler, ProfilerBusyError
+from analytics import CubeStore
+from config import (
+    API_HOST, API_PORT, DEFAULT_TOP_K, MAX_TOP_K, PROJECT_NAME, PROJECT_TAGLINE,
+    ADMIN_TOKEN, PROFILER_INTERVAL, PROFILER_MAX_SECONDS, BULK_MAX_ZIP_BYTES,
+    PAGINATION_MAX_RESULTS, ANALYTICS_DEFAULT_LIMIT, ANALYTICS_MAX_LIMIT
+)
 
 # Initialize FastAPI application
 app = FastAPI(
@@ -29,9 +51,36 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def metrics_middleware(request: Request, call_next):
+    """Compte et chronomètre chaque requête par route (gabarit, pas l'URL brute)"""
+    HTTP_IN_FLIGHT.inc()
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        HTTP_IN_FLIGHT.dec()
+        route = request.scope.get("route")
+        route_path = getattr(route, "path", "unmatched")
+        HTTP_REQUESTS.labels(method=request.method, route=route_path, status=status).inc()
+        HTTP_LATENCY.labels(method=request.method, route=route_path).observe(time.perf_counter() - start)
+
 # Initialiser le recommender (sera fait au démarrage)
 recommender: Optional[JobRecommender] = None
 
+# File des tâches asynchrones (requêtes longues: CV, lots de CV)
+task_queue = TaskQueue()
+
+# Listes scorées des requêtes paginées (servies par curseur)
+page_store = ResultPageStore()
+
+# Cubes analytiques pré-agrégés par dbt (chargés au démarrage)
+cube_store: Optional[CubeStore] = None
+
 
 # Modèles Pydantic pour la validation
 class CandidateProfile(BaseModel):
@@ -80,6 +129,10 @@ class RecommendationResponse(BaseModel):
     recommendations: List[dict]
     total_found: int
     search_params: dict
+    timings: Optional[Dict[str, float]] = Field(
+        None,
+        description="Durées par étape en ms (si include_timings=true)"
+    )
 
 
 class JobDetailsResponse(BaseModel):
@@ -98,16 +151,75 @@ class StatsResponse(BaseModel):
     statistics: dict
 
 
+class RecommendationPageResponse(BaseModel):
+    """Page de recommandations et curseur de la page suivante"""
+    recommendations: List[dict]
+    offset: int
+    page_size: int
+    total_found: int = Field(..., description="Nombre total de résultats paginables")
+    next_cursor: Optional[str] = Field(None, description="Curseur de la page suivante (null en fin de liste)")
+    expires_at: float
+    search_params: dict
+
+
+class TaskResponse(BaseModel):
+    """État d'une tâche asynchrone"""
+    task_id: str
+    kind: str
+    status: str = Field(..., description="queued, running, succeeded, failed ou cancelled")
+    progress: float
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    expires_at: Optional[float] = None
+    error: Optional[str] = None
+    result: Optional[Any] = None
+
+
+class TimingsResponse(BaseModel):
+    """Durées agrégées par opération et par étape"""
+    timings: dict
+
+
+class CubeSliceResponse(BaseModel):
+    """Tranche d'un cube analytique"""
+    cube: str
+    grouping_set: List[str] = Field(..., description="Dimensions détaillées dans les lignes")
+    measure: str
+    total_rows: int = Field(..., description="Lignes correspondant aux filtres (avant limit)")
+    rows: List[dict]
+
+
 # Events
 @app.on_event("startup")
 async def startup_event():
     """Initialize on API startup"""
-    global recommender
+    global recommender, cube_store
     print("\n🤖 Starting RecruiterAI API...")
-    recommender = JobRecommender()
+    if install_signal_handler():
+        print("  → Profilage à la demande: kill -USR2 <pid>")
+    try:
+        # Indépendants de l'index: les endpoints analytiques restent servis sans lui
+        cube_store = CubeStore.load()
+    except Exception as e:
+        print(f"⚠️ Cubes analytiques non chargés: {e}")
+    try:
+        # Serving never builds the index: artifacts come from build_index.py
+        recommender = JobRecommender(allow_build=False)
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
+        return
+    JOBS_INDEXED.set(len(recommender.jobs_df))
     print("✅ RecruiterAI API ready to serve requests!\n")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Arrête les workers de parsing de CV et la file de tâches"""
+    shutdown_parse_pool()
+    task_queue.shutdown()
+
+
 # Endpoints
 @app.get("/", tags=["Health"])
 async def root():
@@ -121,10 +233,18 @@ async def root():
         "endpoints": {
             "docs": "/docs",
             "recommend": "/api/v1/recommend",
+            "recommend_stream": "/api/v1/recommend/stream",
+            "recommend_page": "/api/v1/recommend/page",
             "recommend_cv": "/api/v1/recommend/cv",
+            "recommend_cv_bulk": "/api/v1/recommend/cv/bulk",
             "job_details": "/api/v1/jobs/{job_id}",
             "similar_jobs": "/api/v1/jobs/{job_id}/similar",
-            "statistics": "/api/v1/stats"
+            "tasks": "/api/v1/tasks/{task_id}",
+            "statistics": "/api/v1/stats",
+            "timings": "/api/v1/timings",
+            "analytics_cubes": "/api/v1/analytics/cubes",
+            "analytics_cube": "/api/v1/analytics/cube/{cube}",
+            "metrics": "/metrics"
         }
     }
 
@@ -135,12 +255,23 @@ async def health_check():
     return {
         "status": "healthy",
         "recommender_loaded": recommender is not None,
-        "total_jobs": len(recommender.jobs_df) if recommender else 0
+        "total_jobs": len(recommender.jobs_df) if recommender else 0,
+        "index_type": recommender.index_meta.get("index_type", "flat") if recommender else None
     }
 
 
+@app.get("/metrics", tags=["Health"])
+async def metrics():
+    """Métriques au format texte Prometheus (requêtes, latences, caches, mémoire...)"""
+    return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
 @app.post("/api/v1/recommend", response_model=RecommendationResponse, tags=["Recommendations"])
-async def recommend_jobs(profile: CandidateProfile):
+async def recommend_jobs(
+    profile: CandidateProfile,
+    response: Response,
+    include_timings: bool = Query(False, description="Inclure les durées par étape dans la réponse")
+):
     """
     Recommande des offres d'emploi basées sur un profil candidat
     
@@ -151,20 +282,28 @@ async def recommend_jobs(profile: CandidateProfile):
     - **experience_level**: Niveau d'expérience
     - **top_k**: Nombre de recommandations (max 50)
     - **min_score**: Score minimum
+    
+    Les durées par étape sont renvoyées dans l'en-tête `Server-Timing`.
     """
     if not recommender:
         raise HTTPException(status_code=503, detail="Le système de recommandation n'est pas initialisé")
     
+    timer = StageTimer()
     try:
-        recommendations = recommender.recommend(
+        # Encodage, FAISS et scoring hors de la boucle d'événements
+        recommendations = await run_in_threadpool(
+            recommender.recommend,
             candidate_profile=profile.profile_text,
             keywords=profile.keywords,
             location_preference=profile.location_preference,
             contract_type_preference=profile.contract_type_preference,
             experience_level=profile.experience_level,
             top_k=profile.top_k,
-            min_score=profile.min_score
+            min_score=profile.min_score,
+            timer=timer
         )
+        timing_stats.record('recommend', timer)
+        response.headers["Server-Timing"] = timer.server_timing()
         
         return RecommendationResponse(
             recommendations=recommendations,
@@ -176,21 +315,132 @@ async def recommend_jobs(profile: CandidateProfile):
                 "experience_level": profile.experience_level,
                 "top_k": profile.top_k,
                 "min_score": profile.min_score
-            }
+            },
+            timings=timer.as_dict() if include_timings else None
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erreur lors de la recommandation: {str(e)}")
 
 
+@app.post("/api/v1/recommend/page", response_model=RecommendationPageResponse, tags=["Recommendations"])
+async def recommend_jobs_paginated(
+    profile: CandidateProfile,
+    max_results: int = Query(
+        PAGINATION_MAX_RESULTS, ge=1, le=PAGINATION_MAX_RESULTS,
+        description="Nombre total de résultats parcourables"
+    )
+):
+    """
+    Recommandations paginées au-delà de MAX_TOP_K
+    
+    La liste complète (jusqu'à `max_results`) est scorée une seule fois; `top_k`
+    donne la taille des pages. Les pages suivantes s'obtiennent avec
+    `GET /api/v1/recommend/page?cursor=...` tant que `next_cursor` n'est pas null.
+    """
+    if not recommender:
+        raise HTTPException(status_code=503, detail="Le système de recommandation n'est pas initialisé")
+    
+    try:
+        recommendations = await run_in_threadpool(
+            recommender.recommend,
+            candidate_profile=profile.profile_text,
+            keywords=profile.keywords,
+            location_preference=profile.location_preference,
+            contract_type_preference=profile.contract_type_preference,
+            experience_level=profile.experience_level,
+            top_k=max_results,
+            min_score=profile.min_score
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Erreur lors de la recommandation: {str(e)}")
+    
+    page = page_store.create(
+        recommendations,
+        page_size=profile.top_k,
+        build=recommender.build_recommendation,
+        search_params={
+            "keywords": profile.keywords,
+            "location": profile.location_preference,
+            "contract_type": profile.contract_type_preference,
+            "experience_level": profile.experience_level,
+            "min_score": profile.min_score,
+            "max_results": max_results
+        }
+    )
+    return RecommendationPageResponse(**page)
+
+
+@app.get("/api/v1/recommend/page", response_model=RecommendationPageResponse, tags=["Recommendations"])
+async def get_recommendation_page(cursor: str = Query(..., description="Curseur renvoyé par la page précédente")):
+    """Page suivante d'une recherche paginée (410 si le curseur a expiré)"""
+    try:
+        return RecommendationPageResponse(**page_store.page(cursor))
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except CursorExpiredError as e:
+        raise HTTPException(status_code=410, detail=str(e))
+
+
+def _format_event(event: dict, stream_format: str) -> str:
+    """Sérialise un événement en ligne NDJSON ou en message Server-Sent Events"""
+    data = json.dumps(event, ensure_ascii=False, default=str)
+    if stream_format == "sse":
+        return f"event: {event['event']}\ndata: {data}\n\n"
+    return data + "\n"
+
+
+@app.post("/api/v1/recommend/stream", tags=["Recommendations"])
+async def recommend_jobs_stream(
+    profile: CandidateProfile,
+    stream_format: str = Query("ndjson", alias="format", pattern="^(ndjson|sse)$", description="ndjson ou sse")
+):
+    """
+    Recommandations progressives (NDJSON ou Server-Sent Events)
+    
+    1. `partial`: voisins sémantiques dès la fin de la recherche FAISS
+    2. `result`: résultats finaux rerankés, un événement par offre
+    3. `done`: nombre de résultats et durées par étape
+    """
+    if not recommender:
+        raise HTTPException(status_code=503, detail="Le système de recommandation n'est pas initialisé")
+    
+    events = recommender.recommend_stream(
+        candidate_profile=profile.profile_text,
+        keywords=profile.keywords,
+        location_preference=profile.location_preference,
+        contract_type_preference=profile.contract_type_preference,
+        experience_level=profile.experience_level,
+        top_k=profile.top_k,
+        min_score=profile.min_score
+    )
+    
+    def body():
+        try:
+            for event in events:
+                yield _format_event(event, stream_format)
+        except Exception as e:
+            # Les en-têtes sont déjà partis: l'erreur est signalée dans le flux
+            yield _format_event({"event": "error", "detail": str(e)}, stream_format)
+    
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream" if stream_format == "sse" else "application/x-ndjson",
+        # Désactive la mise en tampon des proxys (nginx) pour livrer chaque événement
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @app.post("/api/v1/recommend/cv", response_model=RecommendationResponse, tags=["Recommendations"])
 async def recommend_from_cv(
+    response: Response,
     cv_file: UploadFile = File(..., description="Fichier CV (PDF, DOCX, TXT)"),
     keywords: Optional[str] = Query(None, description="Mots-clés additionnels (séparés par des virgules)"),
     location_preference: Optional[str] = Query(None, description="Localisation préférée"),
     contract_type_preference: Optional[str] = Query(None, description="Type de contrat"),
     experience_level: Optional[str] = Query(None, description="Niveau d'expérience"),
     top_k: int = Query(DEFAULT_TOP_K, ge=1, le=MAX_TOP_K, description="Nombre de recommandations"),
-    min_score: float = Query(0.0, ge=0.0, le=1.0, description="Score minimum")
+    min_score: float = Query(0.0, ge=0.0, le=1.0, description="Score minimum"),
+    include_timings: bool = Query(False, description="Inclure les durées par étape dans la réponse")
 ):
     """
     Recommande des offres d'emploi basées sur un CV uploadé
@@ -202,13 +452,19 @@ async def recommend_from_cv(
     - **experience_level**: Niveau d'expérience
     - **top_k**: Nombre de recommandations
     - **min_score**: Score minimum
+    
+    Les durées par étape (parse, clean, encode, search, score...) sont
+    renvoyées dans l'en-tête `Server-Timing`.
     """
     if not recommender:
         raise HTTPException(status_code=503, detail="Le système de recommandation n'est pas initialisé")
     
+    timer = StageTimer()
+    
     # Lire le contenu du fichier
     try:
-        cv_bytes = await cv_file.read()
+        with timer.stage('read'):
+            cv_bytes = await cv_file.read()
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Erreur lors de la lecture du fichier: {str(e)}")
     
@@ -219,7 +475,9 @@ async def recommend_from_cv(
     
     # Recommander
     try:
-        recommendations = recommender.recommend_from_cv_bytes(
+        # Le parsing attend le pool de processus (jusqu'à CV_PARSE_TIMEOUT): hors de la boucle d'événements
+        recommendations = await run_in_threadpool(
+            recommender.recommend_from_cv_bytes,
             cv_bytes=cv_bytes,
             cv_filename=cv_file.filename,
             additional_keywords=keywords_list,
@@ -227,8 +485,11 @@ async def recommend_from_cv(
             contract_type_preference=contract_type_preference,
             experience_level=experience_level,
             top_k=top_k,
-            min_score=min_score
+            min_score=min_score,
+            timer=timer
         )
+        timing_stats.record('recommend_cv', timer)
+        response.headers["Server-Timing"] = timer.server_timing()
         
         return RecommendationResponse(
             recommendations=recommendations,
@@ -241,12 +502,211 @@ async def recommend_from_cv(
                 "experience_level": experience_level,
                 "top_k": top_k,
                 "min_score": min_score
-            }
+            },
+            timings=timer.as_dict() if include_timings else None
         )
+    except CVParseError as e:
+        raise HTTPException(status_code=422, detail=f"CV illisible: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erreur lors de la recommandation: {str(e)}")
 
 
+@app.post("/api/v1/recommend/cv/bulk", tags=["Recommendations"])
+async def recommend_from_cv_bulk(
+    cv_archive: UploadFile = File(..., description="Archive .zip de CV (PDF, DOCX, TXT)"),
+    output_format: str = Query("ndjson", pattern=f"^({'|'.join(OUTPUT_FORMATS)})$", description="ndjson ou csv"),
+    keywords: Optional[str] = Query(None, description="Mots-clés ajoutés à chaque CV (séparés par des virgules)"),
+    location_preference: Optional[str] = Query(None, description="Localisation préférée"),
+    contract_type_preference: Optional[str] = Query(None, description="Type de contrat"),
+    experience_level: Optional[str] = Query(None, description="Niveau d'expérience"),
+    top_k: int = Query(DEFAULT_TOP_K, ge=1, le=MAX_TOP_K, description="Nombre de recommandations par CV"),
+    min_score: float = Query(0.0, ge=0.0, le=1.0, description="Score minimum")
+):
+    """
+    Recommande des offres pour chaque CV d'une archive zip
+    
+    Les CV sont parsés en parallèle, encodés par lots et recherchés en une
+    requête FAISS par lot. Les résultats sont renvoyés au fil de l'eau, un
+    CV à la fois, en NDJSON (une ligne par CV) ou en CSV (une ligne par offre).
+    """
+    if not recommender:
+        raise HTTPException(status_code=503, detail="Le système de recommandation n'est pas initialisé")
+    
+    archive = await cv_archive.read(BULK_MAX_ZIP_BYTES + 1)
+    if len(archive) > BULK_MAX_ZIP_BYTES:
+        raise HTTPException(status_code=413, detail=f"Archive trop volumineuse (max {BULK_MAX_ZIP_BYTES // 2**20} MB)")
+    if not zipfile.is_zipfile(io.BytesIO(archive)):
+        raise HTTPException(status_code=400, detail="Le fichier envoyé n'est pas une archive zip")
+    
+    keywords_list = [k.strip() for k in keywords.split(',') if k.strip()] if keywords else None
+    
+    results = recommender.recommend_bulk(
+        iter_cv_zip(archive),
+        additional_keywords=keywords_list,
+        location_preference=location_preference,
+        contract_type_preference=contract_type_preference,
+        experience_level=experience_level,
+        top_k=top_k,
+        min_score=min_score
+    )
+    
+    # Générateur synchrone: Starlette l'itère dans le threadpool
+    return StreamingResponse(
+        stream_results(results, output_format),
+        media_type="text/csv" if output_format == "csv" else "application/x-ndjson"
+    )
+
+
+async def _submit_task(kind: str, function, response: Response, idempotency_key: Optional[str],
+                       callback_url: Optional[str]) -> TaskResponse:
+    """Soumet une tâche: 202 + Location, ou 200 si la clé d'idempotence est déjà connue"""
+    if callback_url:
+        try:
+            # Résolution DNS hors de la boucle d'événements
+            await run_in_threadpool(validate_callback_url, callback_url)
+        except InvalidCallbackError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+    try:
+        task, created = task_queue.submit(kind, function, idempotency_key, callback_url)
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+    
+    response.status_code = 202 if created else 200
+    response.headers["Location"] = f"/api/v1/tasks/{task.id}"
+    return TaskResponse(**task.to_dict())
+
+
+@app.post("/api/v1/tasks/recommend", response_model=TaskResponse, status_code=202, tags=["Tasks"])
+async def submit_recommend_task(
+    profile: CandidateProfile,
+    response: Response,
+    callback_url: Optional[str] = Query(None, description="URL notifiée (POST JSON) à la fin de la tâche"),
+    idempotency_key: Optional[str] = Header(None, description="Clé permettant de re-soumettre sans dupliquer")
+):
+    """Version asynchrone de /api/v1/recommend: renvoie immédiatement un identifiant de tâche"""
+    if not recommender:
+        raise HTTPException(status_code=503, detail="Le système de recommandation n'est pas initialisé")
+    
+    def run(task):
+        recommendations = recommender.recommend(
+            candidate_profile=profile.profile_text,
+            keywords=profile.keywords,
+            location_preference=profile.location_preference,
+            contract_type_preference=profile.contract_type_preference,
+            experience_level=profile.experience_level,
+            top_k=profile.top_k,
+            min_score=profile.min_score
+        )
+        return {"recommendations": recommendations, "total_found": len(recommendations)}
+    
+    return await _submit_task("recommend", run, response, idempotency_key, callback_url)
+
+
+@app.post("/api/v1/tasks/recommend/cv", response_model=TaskResponse, status_code=202, tags=["Tasks"])
+async def submit_recommend_cv_task(
+    response: Response,
+    cv_file: UploadFile = File(..., description="Fichier CV (PDF, DOCX, TXT)"),
+    keywords: Optional[str] = Query(None, description="Mots-clés additionnels (séparés par des virgules)"),
+    location_preference: Optional[str] = Query(None, description="Localisation préférée"),
+    contract_type_preference: Optional[str] = Query(None, description="Type de contrat"),
+    experience_level: Optional[str] = Query(None, description="Niveau d'expérience"),
+    top_k: int = Query(DEFAULT_TOP_K, ge=1, le=MAX_TOP_K, description="Nombre de recommandations"),
+    min_score: float = Query(0.0, ge=0.0, le=1.0, description="Score minimum"),
+    callback_url: Optional[str] = Query(None, description="URL notifiée (POST JSON) à la fin de la tâche"),
+    idempotency_key: Optional[str] = Header(None, description="Clé permettant de re-soumettre sans dupliquer")
+):
+    """Version asynchrone de /api/v1/recommend/cv: le CV est parsé et matché en arrière-plan"""
+    if not recommender:
+        raise HTTPException(status_code=503, detail="Le système de recommandation n'est pas initialisé")
+    
+    cv_bytes = await cv_file.read()
+    filename = cv_file.filename
+    keywords_list = [k.strip() for k in keywords.split(',') if k.strip()] if keywords else None
+    
+    def run(task):
+        recommendations = recommender.recommend_from_cv_bytes(
+            cv_bytes=cv_bytes,
+            cv_filename=filename,
+            additional_keywords=keywords_list,
+            location_preference=location_preference,
+            contract_type_preference=contract_type_preference,
+            experience_level=experience_level,
+            top_k=top_k,
+            min_score=min_score
+        )
+        return {"cv_filename": filename, "recommendations": recommendations, "total_found": len(recommendations)}
+    
+    return await _submit_task("recommend_cv", run, response, idempotency_key, callback_url)
+
+
+@app.post("/api/v1/tasks/recommend/cv/bulk", response_model=TaskResponse, status_code=202, tags=["Tasks"])
+async def submit_recommend_cv_bulk_task(
+    response: Response,
+    cv_archive: UploadFile = File(..., description="Archive .zip de CV (PDF, DOCX, TXT)"),
+    keywords: Optional[str] = Query(None, description="Mots-clés ajoutés à chaque CV (séparés par des virgules)"),
+    location_preference: Optional[str] = Query(None, description="Localisation préférée"),
+    contract_type_preference: Optional[str] = Query(None, description="Type de contrat"),
+    experience_level: Optional[str] = Query(None, description="Niveau d'expérience"),
+    top_k: int = Query(DEFAULT_TOP_K, ge=1, le=MAX_TOP_K, description="Nombre de recommandations par CV"),
+    min_score: float = Query(0.0, ge=0.0, le=1.0, description="Score minimum"),
+    callback_url: Optional[str] = Query(None, description="URL notifiée (POST JSON) à la fin de la tâche"),
+    idempotency_key: Optional[str] = Header(None, description="Clé permettant de re-soumettre sans dupliquer")
+):
+    """
+    Version asynchrone de /api/v1/recommend/cv/bulk
+    
+    La progression de la tâche suit le nombre de CV traités; le résultat est
+    la liste des résultats par CV.
+    """
+    if not recommender:
+        raise HTTPException(status_code=503, detail="Le système de recommandation n'est pas initialisé")
+    
+    archive = await cv_archive.read(BULK_MAX_ZIP_BYTES + 1)
+    if len(archive) > BULK_MAX_ZIP_BYTES:
+        raise HTTPException(status_code=413, detail=f"Archive trop volumineuse (max {BULK_MAX_ZIP_BYTES // 2**20} MB)")
+    if not zipfile.is_zipfile(io.BytesIO(archive)):
+        raise HTTPException(status_code=400, detail="Le fichier envoyé n'est pas une archive zip")
+    keywords_list = [k.strip() for k in keywords.split(',') if k.strip()] if keywords else None
+    
+    def run(task):
+        cv_files = list(iter_cv_zip(archive))
+        results = []
+        for result in recommender.recommend_bulk(
+            cv_files,
+            additional_keywords=keywords_list,
+            location_preference=location_preference,
+            contract_type_preference=contract_type_preference,
+            experience_level=experience_level,
+            top_k=top_k,
+            min_score=min_score
+        ):
+            results.append(result)
+            task.set_progress(len(results) / len(cv_files))
+        return {"results": results, "total_cvs": len(cv_files)}
+    
+    return await _submit_task("recommend_cv_bulk", run, response, idempotency_key, callback_url)
+
+
+@app.get("/api/v1/tasks/{task_id}", response_model=TaskResponse, tags=["Tasks"])
+async def get_task(task_id: str):
+    """État, progression et (une fois terminée) résultat d'une tâche"""
+    task = task_queue.get(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail=f"Tâche {task_id} introuvable ou expirée")
+    return TaskResponse(**task.to_dict())
+
+
+@app.delete("/api/v1/tasks/{task_id}", response_model=TaskResponse, tags=["Tasks"])
+async def cancel_task(task_id: str):
+    """Annule une tâche encore en file d'attente (409 si elle a déjà démarré)"""
+    task = task_queue.get(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail=f"Tâche {task_id} introuvable ou expirée")
+    if not task_queue.cancel(task_id):
+        raise HTTPException(status_code=409, detail=f"Tâche {task_id} déjà {task.status}")
+    return TaskResponse(**task.to_dict())
+
+
 @app.get("/api/v1/jobs/{job_id}", response_model=JobDetailsResponse, tags=["Jobs"])
 async def get_job_details(job_id: int):
     """
@@ -282,7 +742,7 @@ async def get_similar_jobs(
     
     try:
         reference_job = recommender.get_job_details(job_id)
-        similar_jobs = recommender.get_similar_jobs(job_id, top_k)
+        similar_jobs = await run_in_threadpool(recommender.get_similar_jobs, job_id, top_k)
         
         return SimilarJobsResponse(
             reference_job=reference_job,
@@ -305,12 +765,120 @@ async def get_statistics():
         raise HTTPException(status_code=503, detail="Le système de recommandation n'est pas initialisé")
     
     try:
-        stats = recommender.get_statistics()
+        stats = await run_in_threadpool(recommender.get_statistics)
         return StatsResponse(statistics=stats)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erreur: {str(e)}")
 
 
+@app.get("/api/v1/timings", response_model=TimingsResponse, tags=["Statistics"])
+async def get_timings():
+    """
+    Durées agrégées en mémoire depuis le démarrage, par opération et par étape
+    
+    Pour chaque étape: nombre de requêtes, moyenne, p50/p95/p99 (sur les
+    dernières requêtes) et maximum, en millisecondes.
+    """
+    return TimingsResponse(timings=timing_stats.snapshot())
+
+
+@app.get("/api/v1/analytics/cubes", tags=["Analytics"])
+async def list_cubes():
+    """Dimensions, attributs filtrables et mesures des cubes analytiques"""
+    if not cube_store:
+        raise HTTPException(status_code=503, detail="Les cubes analytiques ne sont pas chargés")
+    return {"cubes": cube_store.describe()}
+
+
+@app.get("/api/v1/analytics/cube/{cube}", response_model=CubeSliceResponse, tags=["Analytics"])
+async def get_cube_slice(
+    cube: str,
+    group_by: List[str] = Query([], description="Dimensions détaillées (répéter le paramètre)"),
+    job_category: Optional[str] = Query(None, description="Filtre sur la catégorie de poste"),
+    published_year_month: Optional[str] = Query(None, description="Filtre sur le mois de publication (YYYY-MM-01)"),
+    country: Optional[str] = Query(None, description="Filtre sur le pays"),
+    contract_type: Optional[str] = Query(None, description="Filtre sur le type de contrat"),
+    skill_name: Optional[str] = Query(None, description="Filtre sur la compétence (cube skills)"),
+    skill_category: Optional[str] = Query(None, description="Filtre sur la catégorie de compétence (cube skills)"),
+    measure: Optional[str] = Query(None, description="Mesure de tri décroissant"),
+    limit: int = Query(ANALYTICS_DEFAULT_LIMIT, ge=1, le=ANALYTICS_MAX_LIMIT)
+):
+    """
+    Tranche pré-agrégée d'un cube (job_offers ou skills)
+    
+    Les dimensions groupées et filtrées désignent un grouping set déjà calculé
+    par dbt: la réponse est un filtre et un tri en mémoire, sans requête SQL.
+    Exemple: `/api/v1/analytics/cube/skills?group_by=country&job_category=Data Engineer`
+    """
+    if not cube_store:
+        raise HTTPException(status_code=503, detail="Les cubes analytiques ne sont pas chargés")
+    
+    filters = {
+        'job_category': job_category,
+        'published_year_month': published_year_month,
+        'country': country,
+        'contract_type': contract_type,
+        'skill_name': skill_name,
+        'skill_category': skill_category,
+    }
+    try:
+        result = cube_store.query(cube, group_by=group_by, filters=filters, measure=measure, limit=limit)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return CubeSliceResponse(**result)
+
+
+def _require_admin(token: Optional[str]):
+    """Endpoints d'administration: absents sans ADMIN_TOKEN, 403 si le jeton est faux"""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not token or not hmac.compare_digest(token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Jeton d'administration invalide")
+
+
+@app.get("/admin/profile", tags=["Admin"], include_in_schema=False)
+async def profile_process(
+    seconds: float = Query(10.0, gt=0, le=PROFILER_MAX_SECONDS, description="Durée de la capture"),
+    interval_ms: float = Query(PROFILER_INTERVAL * 1000, ge=1, le=1000, description="Intervalle d'échantillonnage"),
+    include_idle: bool = Query(False, description="Inclure les threads en attente"),
+    x_admin_token: Optional[str] = Header(None)
+):
+    """
+    Profile le processus en cours par échantillonnage pendant `seconds` secondes
+    
+    Retourne un fichier "collapsed stacks" (flamegraph.pl, speedscope).
+    Requiert l'en-tête `X-Admin-Token` (variable RECRUITER_ADMIN_TOKEN).
+    
+    Les workers du pool de parsing des CV (PyPDF2, pdfplumber) sont
+    échantillonnés en même temps; leurs piles sont préfixées par `worker;`.
+    """
+    _require_admin(x_admin_token)
+    
+    try:
+        # Les captures tournent dans des threads du pool, pas dans la boucle d'événements:
+        # les endpoints dont le calcul passe par run_in_threadpool continuent
+        # d'être servis pendant la capture et apparaissent dans le profil
+        stacks, worker_stacks = await asyncio.gather(
+            run_in_threadpool(sample, seconds, interval_ms / 1000, include_idle),
+            run_in_threadpool(get_parse_pool().profile_workers, seconds, interval_ms / 1000, include_idle)
+        )
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    stacks.update(worker_stacks)
+    
+    filename = f"profile_{datetime.now():%Y%m%d_%H%M%S}.folded"
+    return Response(
+        content=to_collapsed(stacks),
+        media_type="text/plain; charset=utf-8",
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "X-Profile-Samples": str(sum(stacks.values()))
+        }
+    )
+
+
 # Launch application
 if __name__ == "__main__":
     print("\n" + "═"*80)
@@ -0,0 +1,131 @@
+"""
+Client HTTP de l'API RecruiterAI
+
+Utilisé par l'application Streamlit en mode client (RECRUITER_APP_MODE=client):
+l'interface ne charge ni le modèle, ni l'index FAISS, ni les offres; elle
+appelle le service FastAPI. Une seule session requests est partagée (pool de
+connexions keep-alive), avec timeouts de connexion et de lecture et nouvelles
+tentatives sur les erreurs de connexion et les réponses 502/503/504.
+
+Les méthodes reprennent la signature de JobRecommender utilisée par l'app.
+"""
+from typing import Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config import (
+    API_BASE_URL, API_CLIENT_POOL_SIZE, API_CLIENT_CONNECT_TIMEOUT, API_CLIENT_READ_TIMEOUT,
+    API_CLIENT_RETRIES, API_CLIENT_BACKOFF
+)
+
+
+class APIError(RuntimeError):
+    """Erreur renvoyée par l'API (statut HTTP et détail)"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(f"API {status_code}: {detail}")
+        self.status_code = status_code
+        self.detail = detail
+
+
+class RecruiterAPIClient:
+    """Client keep-alive de l'API de recommandation"""
+
+    def __init__(self, base_url: str = API_BASE_URL, pool_size: int = API_CLIENT_POOL_SIZE,
+                 retries: int = API_CLIENT_RETRIES):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = (API_CLIENT_CONNECT_TIMEOUT, API_CLIENT_READ_TIMEOUT)
+        # Les recommandations sont sans effet de bord: POST peut être rejoué
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=0,
+            status=retries,
+            backoff_factor=API_CLIENT_BACKOFF,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({'GET', 'POST'}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def _request(self, method: str, path: str, **kwargs) -> Dict:
+        try:
+            response = self.session.request(method, f"{self.base_url}{path}", timeout=self.timeout, **kwargs)
+        except requests.RequestException as e:
+            raise APIError(0, f"API injoignable ({self.base_url}): {e}") from e
+        if response.status_code >= 400:
+            try:
+                detail = response.json().get('detail', response.text)
+            except ValueError:
+                detail = response.text
+            raise APIError(response.status_code, str(detail))
+        return response.json()
+
+    def health(self) -> Dict:
+        """État du service (recommender chargé, nombre d'offres, type d'index)"""
+        return self._request('GET', '/health')
+
+    @property
+    def total_jobs(self) -> int:
+        """Nombre d'offres indexées par le service (APIError s'il n'est pas prêt)"""
+        health = self.health()
+        if not health.get('recommender_loaded'):
+            raise APIError(503, "Le système de recommandation n'est pas initialisé")
+        return health['total_jobs']
+
+    def recommend(
+        self,
+        candidate_profile: str,
+        keywords: Optional[List[str]] = None,
+        location_preference: Optional[str] = None,
+        contract_type_preference: Optional[str] = None,
+        experience_level: Optional[str] = None,
+        top_k: int = 10,
+        min_score: float = 0.0
+    ) -> List[Dict]:
+        """Recommandations pour un profil texte (POST /api/v1/recommend)"""
+        payload = {
+            'profile_text': candidate_profile,
+            'keywords': keywords,
+            'location_preference': location_preference,
+            'contract_type_preference': contract_type_preference,
+            'experience_level': experience_level,
+            'top_k': top_k,
+            'min_score': min_score,
+        }
+        return self._request('POST', '/api/v1/recommend', json=payload)['recommendations']
+
+    def recommend_from_cv_bytes(
+        self,
+        cv_bytes: bytes,
+        cv_filename: str,
+        additional_keywords: Optional[List[str]] = None,
+        location_preference: Optional[str] = None,
+        contract_type_preference: Optional[str] = None,
+        experience_level: Optional[str] = None,
+        top_k: int = 10,
+        min_score: float = 0.0
+    ) -> List[Dict]:
+        """Recommandations pour un CV uploadé (POST /api/v1/recommend/cv)"""
+        params = {
+            'keywords': ','.join(additional_keywords) if additional_keywords else None,
+            'location_preference': location_preference,
+            'contract_type_preference': contract_type_preference,
+            'experience_level': experience_level,
+            'top_k': top_k,
+            'min_score': min_score,
+        }
+        files = {'cv_file': (cv_filename, cv_bytes)}
+        return self._request('POST', '/api/v1/recommend/cv', params=params, files=files)['recommendations']
+
+    def get_statistics(self) -> Dict:
+        """Statistiques globales des offres (GET /api/v1/stats)"""
+        return self._request('GET', '/api/v1/stats')['statistics']
+
+    def close(self):
+        self.session.close()
@@ -5,14 +5,20 @@ Data & AI Job Analytics & Recommendation Platform - Focus Morocco
 import streamlit as st
 import pandas as pd
 from pathlib import Path
+from collections import Counter, OrderedDict
+import hashlib
+import json
 import sys
 
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent))
 
-from job_recommender import JobRecommender
 from cv_parser import CVParser
-from config import PROJECT_NAME, PROJECT_TAGLINE, UI_THEME, MOROCCO_CITIES
+from config import (
+    PROJECT_NAME, PROJECT_TAGLINE, UI_THEME, SKILL_CATEGORIES, AI_SKILL_CATEGORIES, APP_MODE, API_BASE_URL,
+    UI_CACHED_SEARCHES, UI_STATS_CACHE_TTL
+)
+from taxonomy import is_morocco_location
 
 # ============================================================================
 # PAGE CONFIGURATION
@@ -254,23 +260,59 @@ st.markdown(f"""
 
 @st.cache_resource
 def load_recommender():
-    """Load the recommender (cached)"""
+    """Load the recommender, or the API client in client mode (cached, shared by all sessions)"""
+    if APP_MODE == "client":
+        # No model, index or offers in this process: the FastAPI service does the inference
+        from api_client import RecruiterAPIClient
+        return RecruiterAPIClient(API_BASE_URL)
+    from job_recommender import JobRecommender
     with st.spinner("🤖 Initializing RecruiterAI..."):
-        return JobRecommender()
+        # Prebuilt artifacts only (python build_index.py)
+        return JobRecommender(allow_build=False)
+
+def count_jobs(recommender) -> int:
+    """Number of indexed job offers (asked to the API in client mode)"""
+    if APP_MODE == "client":
+        return recommender.total_jobs
+    return len(recommender.jobs_df)
+
+@st.cache_data(ttl=UI_STATS_CACHE_TTL, show_spinner=False)
+def load_statistics(_recommender):
+    """Platform statistics, computed once for all sessions (refreshed every UI_STATS_CACHE_TTL s)"""
+    return _recommender.get_statistics()
+
+def search_key(*params) -> str:
+    """Hash of the search parameters (min_score excluded: it only filters the cached results)"""
+    return hashlib.sha256(json.dumps(params, default=str).encode('utf-8')).hexdigest()
 
-def is_morocco_location(location: str) -> bool:
-    """Check if location is in Morocco"""
-    if not location:
-        return False
-    location_lower = location.lower()
-    return any(city in location_lower for city in MOROCCO_CITIES)
+def cached_search(key: str, run_search) -> dict:
+    """Results of a search, computed once per parameter set in this session (LRU of UI_CACHED_SEARCHES)"""
+    searches = st.session_state.setdefault('searches', OrderedDict())
+    if key in searches:
+        searches.move_to_end(key)
+    else:
+        searches[key] = {'recommendations': run_search(), 'analytics': {}}
+        while len(searches) > UI_CACHED_SEARCHES:
+            searches.popitem(last=False)
+    return searches[key]
+
+def results_analytics(search: dict, min_score: float, recommendations: list) -> dict:
+    """Metrics, location and skill counts of the displayed results (cached per min_score)"""
+    if min_score not in search['analytics']:
+        skill_counts = Counter(skill for r in recommendations for skill in r.get('skills', []))
+        search['analytics'][min_score] = {
+            'morocco_count': sum(1 for r in recommendations if is_morocco_location(r.get('location', ''))),
+            'avg_score': sum(r['score'] for r in recommendations) / len(recommendations),
+            'avg_skills': sum(r['skills_match_count'] for r in recommendations) / len(recommendations),
+            'unique_companies': len(set(r['company'] for r in recommendations)),
+            'location_counts': pd.Series([r['location'] for r in recommendations]).value_counts(),
+            'top_skills': pd.DataFrame(skill_counts.most_common(15), columns=['Skill', 'Count']),
+        }
+    return search['analytics'][min_score]
 
 def get_ai_skills():
-    """Return list of AI-related skills for special highlighting"""
-    return ['LLM', 'GPT', 'Machine Learning', 'Deep Learning', 'NLP', 'AI', 
-            'Artificial Intelligence', 'Neural Networks', 'TensorFlow', 'PyTorch',
-            'Computer Vision', 'Generative AI', 'LangChain', 'Transformers', 
-            'BERT', 'MLOps', 'RAG', 'Hugging Face']
+    """Return the set of AI-related skills for special highlighting (skill taxonomy seed)"""
+    return {skill for skill, category in SKILL_CATEGORIES.items() if category in AI_SKILL_CATEGORIES}
 
 def display_job_card(job: dict, rank: int):
     """Display a job card with modern styling"""
@@ -330,7 +372,7 @@ st.markdown('<div style="text-align: center;"><span class="morocco-badge">🇲
 # ============================================================================
 try:
     recommender = load_recommender()
-    st.success(f"✅ System loaded: **{len(recommender.jobs_df):,}** job offers available")
+    st.success(f"✅ System loaded: **{count_jobs(recommender):,}** job offers available")
 except Exception as e:
     st.error(f"❌ Error loading system: {e}")
     st.stop()
@@ -468,7 +510,7 @@ if search_button:
         st.warning("⚠️ Please upload a CV")
         st.stop()
     
-    # Run search
+    # Run search (once per parameter set: min_score only filters the cached results)
     with st.spinner("🔍 Searching for the best matches..."):
         try:
             # Prepare parameters
@@ -476,120 +518,117 @@ if search_button:
             exp_level = None if experience_level == "Any Level" else experience_level.lower().replace("-level", "").replace("/lead", "")
             
             if search_mode == "✍️ Manual Input":
-                recommendations = recommender.recommend(
+                key = search_key("manual", profile_text, keywords_list, location_pref, contract_type, exp_level, top_k)
+                run_search = lambda: recommender.recommend(
                     candidate_profile=profile_text,
                     keywords=keywords_list if keywords_list else None,
                     location_preference=location_pref,
                     contract_type_preference=contract_type,
                     experience_level=exp_level,
-                    top_k=top_k,
-                    min_score=min_score
+                    top_k=top_k
                 )
             else:
-                cv_bytes = uploaded_file.read()
-                recommendations = recommender.recommend_from_cv_bytes(
+                cv_bytes = uploaded_file.getvalue()
+                cv_digest = hashlib.sha256(cv_bytes).hexdigest()
+                key = search_key("cv", cv_digest, uploaded_file.name, keywords_list, location_pref, contract_type, exp_level, top_k)
+                run_search = lambda: recommender.recommend_from_cv_bytes(
                     cv_bytes=cv_bytes,
                     cv_filename=uploaded_file.name,
                     additional_keywords=keywords_list if keywords_list else None,
                     location_preference=location_pref,
                     contract_type_preference=contract_type,
                     experience_level=exp_level,
-                    top_k=top_k,
-                    min_score=min_score
+                    top_k=top_k
                 )
             
-            # Display results
-            if recommendations:
-                # Count Morocco jobs
-                morocco_count = sum(1 for r in recommendations if is_morocco_location(r.get('location', '')))
-                
-                st.success(f"🎉 Found **{len(recommendations)}** matching jobs! ({morocco_count} in Morocco 🇲🇦)")
-                
-                # Tabs for different views
-                tab1, tab2, tab3 = st.tabs(["📋 Job Cards", "📊 Table View", "📈 Analytics"])
-                
-                with tab1:
-                    for i, job in enumerate(recommendations, 1):
-                        display_job_card(job, i)
-                
-                with tab2:
-                    df_results = pd.DataFrame([{
-                        'Rank': i,
-                        'Title': job['title'],
-                        'Company': job['company'],
-                        'Location': job['location'],
-                        'Morocco': '🇲🇦' if is_morocco_location(job.get('location', '')) else '',
-                        'Contract': job['contract_type'],
-                        'Score': f"{job['score']:.1%}",
-                        'Skills Matched': job['skills_match_count'],
-                        'URL': job.get('job_url', '')
-                    } for i, job in enumerate(recommendations, 1)])
-                    
-                    st.dataframe(
-                        df_results,
-                        use_container_width=True,
-                        hide_index=True,
-                        column_config={
-                            "URL": st.column_config.LinkColumn("Link", display_text="View")
-                        }
-                    )
-                    
-                    # Download button
-                    csv = df_results.to_csv(index=False).encode('utf-8')
-                    st.download_button(
-                        label="📥 Download Results (CSV)",
-                        data=csv,
-                        file_name="recruiter_ai_results.csv",
-                        mime="text/csv"
-                    )
-                
-                with tab3:
-                    st.subheader("📊 Results Analytics")
-                    
-                    col1, col2, col3, col4 = st.columns(4)
-                    
-                    with col1:
-                        avg_score = sum(r['score'] for r in recommendations) / len(recommendations)
-                        st.metric("Avg Score", f"{avg_score:.1%}")
-                    
-                    with col2:
-                        avg_skills = sum(r['skills_match_count'] for r in recommendations) / len(recommendations)
-                        st.metric("Avg Skills Match", f"{avg_skills:.1f}")
-                    
-                    with col3:
-                        st.metric("Morocco Jobs", f"{morocco_count} 🇲🇦")
-                    
-                    with col4:
-                        unique_companies = len(set(r['company'] for r in recommendations))
-                        st.metric("Companies", unique_companies)
-                    
-                    # Location distribution
-                    st.subheader("📍 Location Distribution")
-                    location_counts = pd.Series([r['location'] for r in recommendations]).value_counts()
-                    st.bar_chart(location_counts)
-                    
-                    # Top skills
-                    st.subheader("🔧 Most Demanded Skills")
-                    all_skills = []
-                    for r in recommendations:
-                        all_skills.extend(r.get('skills', []))
-                    
-                    if all_skills:
-                        from collections import Counter
-                        skill_counts = Counter(all_skills)
-                        top_skills_df = pd.DataFrame(
-                            skill_counts.most_common(15),
-                            columns=['Skill', 'Count']
-                        )
-                        st.bar_chart(top_skills_df.set_index('Skill'))
-            
-            else:
-                st.warning("😕 No jobs found matching your criteria. Try broadening your search.")
+            cached_search(key, run_search)
+            st.session_state['active_search'] = key
         
         except Exception as e:
             st.error(f"❌ Search error: {e}")
             import traceback
             st.code(traceback.format_exc())
+            st.stop()
+
+# Results of the last search stay displayed across reruns (tabs, sliders...)
+active_search = st.session_state.get('searches', {}).get(st.session_state.get('active_search'))
+
+if active_search is not None:
+    # Display results
+    recommendations = [r for r in active_search['recommendations'] if r['score'] >= min_score]
+    
+    if recommendations:
+        analytics = results_analytics(active_search, min_score, recommendations)
+        morocco_count = analytics['morocco_count']
+        
+        st.success(f"🎉 Found **{len(recommendations)}** matching jobs! ({morocco_count} in Morocco 🇲🇦)")
+        
+        # Tabs for different views
+        tab1, tab2, tab3 = st.tabs(["📋 Job Cards", "📊 Table View", "📈 Analytics"])
+        
+        with tab1:
+            for i, job in enumerate(recommendations, 1):
+                display_job_card(job, i)
+        
+        with tab2:
+            df_results = pd.DataFrame([{
+                'Rank': i,
+                'Title': job['title'],
+                'Company': job['company'],
+                'Location': job['location'],
+                'Morocco': '🇲🇦' if is_morocco_location(job.get('location', '')) else '',
+                'Contract': job['contract_type'],
+                'Score': f"{job['score']:.1%}",
+                'Skills Matched': job['skills_match_count'],
+                'URL': job.get('job_url', '')
+            } for i, job in enumerate(recommendations, 1)])
+            
+            st.dataframe(
+                df_results,
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    "URL": st.column_config.LinkColumn("Link", display_text="View")
+                }
+            )
+            
+            # Download button
+            csv = df_results.to_csv(index=False).encode('utf-8')
+            st.download_button(
+                label="📥 Download Results (CSV)",
+                data=csv,
+                file_name="recruiter_ai_results.csv",
+                mime="text/csv"
+            )
+        
+        with tab3:
+            st.subheader("📊 Results Analytics")
+            
+            col1, col2, col3, col4 = st.columns(4)
+            
+            with col1:
+                st.metric("Avg Score", f"{analytics['avg_score']:.1%}")
+            
+            with col2:
+                st.metric("Avg Skills Match", f"{analytics['avg_skills']:.1f}")
+            
+            with col3:
+                st.metric("Morocco Jobs", f"{morocco_count} 🇲🇦")
+            
+            with col4:
+                st.metric("Companies", analytics['unique_companies'])
+            
+            # Location distribution
+            st.subheader("📍 Location Distribution")
+            st.bar_chart(analytics['location_counts'])
+            
+            # Top skills
+            st.subheader("🔧 Most Demanded Skills")
+            if not analytics['top_skills'].empty:
+                st.bar_chart(analytics['top_skills'].set_index('Skill'))
+    
+    else:
+        st.warning("😕 No jobs found matching your criteria. Try broadening your search.")
 
 else:
     # Initial display (no search yet)
@@ -599,7 +638,7 @@ else:
     st.markdown("---")
     st.subheader("📊 Platform Statistics")
     
-    stats = recommender.get_statistics()
+    stats = load_statistics(recommender)
     
     col1, col2, col3, col4 = st.columns(4)
     
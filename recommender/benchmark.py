@@ -0,0 +1,260 @@
+"""
+RecruiterAI - Benchmark de performance du recommender
+
+Sur une couche Gold synthétique (voir synthetic_data.py), mesure pour chaque
+taille de corpus:
+- le débit de preprocess_jobs_df (offres/s)
+- le temps de construction (chargement, dédoublonnage, encodage, index)
+- la latence de recommend() (p50 / p95 / p99) pour chaque type d'index FAISS
+- la mémoire (RSS du processus, table des offres, index)
+- le rappel@k de chaque type d'index par rapport à la recherche exacte
+
+Les résultats sont écrits en JSON (data/benchmarks/) pour comparaison entre commits.
+
+Usage:
+    python benchmark.py                                  # 10k offres, modèle de substitution
+    python benchmark.py --sizes 10000 131000 1000000
+    python benchmark.py --model sentence-transformers/distiluse-base-multilingual-cased-v2
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import tempfile
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+import faiss
+import numpy as np
+
+from config import FAISS_INDEX_TYPES, DEFAULT_TOP_K, MOROCCO_REGIONS
+from data_preprocessing import JobDataPreprocessor
+from embedding_builder import ShardedEmbeddingBuilder
+from job_recommender import JobRecommender, build_faiss_index
+from synthetic_data import write_gold_layer, ROLES
+
+RESULTS_DIR = Path(__file__).parent / "data" / "benchmarks"
+HASHING_MODEL = "hashing"
+
+
+class HashingEncoder:
+    """
+    Modèle d'embedding de substitution: sac de mots haché en dimension fixe
+
+    Même interface que SentenceTransformer.encode(), sans téléchargement ni
+    GPU; suffisant pour mesurer la recherche, le scoring et le rappel des index.
+    """
+
+    def __init__(self, dimension: int = 256):
+        self.dimension = dimension
+
+    def encode(self, texts, batch_size: int = 32, show_progress_bar: bool = False,
+               convert_to_numpy: bool = True) -> np.ndarray:
+        embeddings = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for i, text in enumerate(texts):
+            tokens = text.lower().split()
+            hashes = np.fromiter((zlib.crc32(t.encode('utf-8')) for t in tokens), dtype=np.uint32, count=len(tokens))
+            signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+            np.add.at(embeddings[i], hashes % self.dimension, signs)
+        return embeddings
+
+
+def _rss_mb() -> float:
+    """Mémoire résidente courante du processus (MB)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError):
+        # macOS: ru_maxrss en octets (pic et non valeur courante)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024)
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=Path(__file__).parent, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return 'unknown'
+
+
+def _percentiles(samples_ms: List[float]) -> Dict[str, float]:
+    values = np.asarray(samples_ms)
+    return {
+        'p50_ms': round(float(np.percentile(values, 50)), 3),
+        'p95_ms': round(float(np.percentile(values, 95)), 3),
+        'p99_ms': round(float(np.percentile(values, 99)), 3),
+        'mean_ms': round(float(values.mean()), 3),
+    }
+
+
+def make_queries(n_queries: int, seed: int = 7) -> List[Dict]:
+    """Profils candidats synthétiques (arguments de recommend())"""
+    from config import DATA_SKILLS
+
+    rng = np.random.default_rng(seed)
+    roles = [title for titles in ROLES.values() for title in titles]
+    cities = [city for cities in MOROCCO_REGIONS.values() for city in cities] + ['paris', 'remote']
+    queries = []
+    for _ in range(n_queries):
+        skills = rng.choice(DATA_SKILLS, size=4, replace=False).tolist()
+        queries.append({
+            'candidate_profile': f"{rng.choice(roles)} with {int(rng.integers(1, 10))} years of experience "
+                                 f"in {', '.join(skills[:3])}",
+            'keywords': skills,
+            'location_preference': str(rng.choice(cities)) if rng.random() < 0.7 else None,
+            'experience_level': str(rng.choice(['junior', 'mid', 'senior'])) if rng.random() < 0.5 else None,
+        })
+    return queries
+
+
+def run_benchmark(n_jobs: int, model, model_name: str, index_types: List[str],
+                  n_queries: int, top_k: int) -> Dict:
+    """
+    Exécute le benchmark complet pour une taille de corpus
+
+    Returns:
+        Dictionnaire de résultats pour cette taille
+    """
+    print(f"\n{'=' * 80}\nBENCHMARK - {n_jobs:,} offres\n{'=' * 80}")
+    preprocessor = JobDataPreprocessor()
+    result = {'n_jobs': n_jobs, 'stages_s': {}, 'memory_mb': {'rss_start': round(_rss_mb(), 1)}}
+    stages = result['stages_s']
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+
+        t0 = time.perf_counter()
+        write_gold_layer(tmp / 'gold', n_jobs)
+        stages['generate'] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        df_raw = preprocessor.load_jobs(source='csv', gold_dir=tmp / 'gold')
+        stages['load'] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        df = preprocessor.preprocess_jobs_df(df_raw, verbose=False)
+        stages['preprocess'] = time.perf_counter() - t0
+        result['preprocess_jobs_per_s'] = round(len(df_raw) / stages['preprocess'], 1)
+        del df_raw
+
+        t0 = time.perf_counter()
+        df = preprocessor.collapse_near_duplicates(df)
+        stages['dedup'] = time.perf_counter() - t0
+        result['n_indexed'] = len(df)
+
+        t0 = time.perf_counter()
+        builder = ShardedEmbeddingBuilder(model_name=model_name, shards_dir=tmp / 'shards', workers=1, model=model)
+        embeddings = np.ascontiguousarray(builder.build(df['combined_text'].tolist()), dtype=np.float32)
+        faiss.normalize_L2(embeddings)
+        stages['encode'] = time.perf_counter() - t0
+        result['encode_jobs_per_s'] = round(len(df) / stages['encode'], 1)
+
+        jobs_df, job_skills = preprocessor.compact_jobs_df(df)
+        del df
+
+    result['memory_mb']['jobs_table'] = round(
+        (jobs_df.memory_usage(deep=True).sum() + job_skills.memory_usage()) / (1024 * 1024), 1
+    )
+    result['memory_mb']['embeddings'] = round(embeddings.nbytes / (1024 * 1024), 1)
+
+    queries = make_queries(n_queries)
+    query_texts = [' '.join([q['candidate_profile']] + q['keywords'] * 2) for q in queries]
+    query_embeddings = np.ascontiguousarray(model.encode(query_texts, convert_to_numpy=True), dtype=np.float32)
+    faiss.normalize_L2(query_embeddings)
+
+    search_k = min(top_k * 2, len(jobs_df))
+    _, exact_ids = build_faiss_index(embeddings, 'flat').search(query_embeddings, search_k)
+
+    result['index_modes'] = {}
+    for index_type in index_types:
+        t0 = time.perf_counter()
+        index = build_faiss_index(embeddings, index_type)
+        build_s = time.perf_counter() - t0
+
+        _, ann_ids = index.search(query_embeddings, search_k)
+        recall = np.mean([
+            len(set(ann_ids[i]) & set(exact_ids[i])) / search_k for i in range(len(queries))
+        ])
+
+        recommender = JobRecommender.from_components(
+            jobs_df, job_skills, embeddings, index, model, {'index_type': index_type}
+        )
+        recommender.recommend(**queries[0], top_k=top_k)  # échauffement
+
+        latencies = []
+        for query in queries:
+            t0 = time.perf_counter()
+            recommender.recommend(**query, top_k=top_k)
+            latencies.append((time.perf_counter() - t0) * 1000)
+
+        result['index_modes'][index_type] = {
+            'build_s': round(build_s, 3),
+            'index_mb': round(faiss.serialize_index(index).nbytes / (1024 * 1024), 1),
+            f'recall_at_{search_k}': round(float(recall), 4),
+            'recommend_latency': _percentiles(latencies),
+        }
+        print(f"  → {index_type:<5} build {build_s:.2f}s | recall@{search_k} {recall:.3f} | "
+              f"p50 {result['index_modes'][index_type]['recommend_latency']['p50_ms']:.1f}ms | "
+              f"p99 {result['index_modes'][index_type]['recommend_latency']['p99_ms']:.1f}ms")
+
+    result['stages_s'] = {k: round(v, 3) for k, v in stages.items()}
+    result['memory_mb']['rss_end'] = round(_rss_mb(), 1)
+    print(f"  → preprocess {result['preprocess_jobs_per_s']:,.0f} offres/s | "
+          f"encode {result['encode_jobs_per_s']:,.0f} offres/s | RSS {result['memory_mb']['rss_end']:,.0f} MB")
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark latence / rappel du recommender")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000],
+                        help="Tailles de corpus (ex: 10000 131000 1000000)")
+    parser.add_argument('--index-types', nargs='+', choices=FAISS_INDEX_TYPES, default=FAISS_INDEX_TYPES)
+    parser.add_argument('--model', default=HASHING_MODEL,
+                        help="'hashing' (substitut local) ou nom d'un modèle SentenceTransformer")
+    parser.add_argument('--queries', type=int, default=200, help="Nombre de requêtes de latence")
+    parser.add_argument('--top-k', type=int, default=DEFAULT_TOP_K)
+    parser.add_argument('--output', type=str, default=None, help="Fichier JSON de sortie")
+    args = parser.parse_args(argv)
+
+    if args.model == HASHING_MODEL:
+        model = HashingEncoder()
+    else:
+        from sentence_transformers import SentenceTransformer
+        model = SentenceTransformer(args.model)
+
+    commit = _git_commit()
+    report = {
+        'meta': {
+            'git_commit': commit,
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'faiss': faiss.__version__,
+            'model': args.model,
+            'queries': args.queries,
+            'top_k': args.top_k,
+        },
+        'runs': [
+            run_benchmark(n, model, args.model, args.index_types, args.queries, args.top_k)
+            for n in args.sizes
+        ],
+    }
+
+    output = Path(args.output) if args.output else (
+        RESULTS_DIR / f"bench_{datetime.now():%Y%m%d_%H%M%S}_{commit}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    print(f"\nRésultats écrits dans {output}")
+
+
+if __name__ == "__main__":
+    main()
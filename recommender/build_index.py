@@ -0,0 +1,65 @@
+"""
+RecruiterAI - Construction hors ligne de l'index de recommandation
+
+Les processus de service (API, Streamlit) ne construisent jamais l'index:
+ils chargent uniquement les artefacts produits par ce script.
+
+Usage:
+    python build_index.py
+    python build_index.py --sample-size 10000 --index-type hnsw --workers 4
+    python build_index.py --index-only --index-type ivf
+    python -m recommender.build_index ...    (depuis la racine du projet)
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Les modules du recommender s'importent à plat (comme app.py / api.py)
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import EMBEDDING_WORKERS, FAISS_INDEX_TYPE, FAISS_INDEX_TYPES, EMBEDDINGS_DIR
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Construit les embeddings et l'index FAISS des offres")
+    parser.add_argument('--sample-size', type=int, default=None,
+                        help="Nombre d'offres à indexer (toutes par défaut)")
+    parser.add_argument('--index-type', choices=FAISS_INDEX_TYPES, default=FAISS_INDEX_TYPE,
+                        help=f"Type d'index FAISS (défaut: {FAISS_INDEX_TYPE})")
+    parser.add_argument('--workers', type=int, default=EMBEDDING_WORKERS,
+                        help=f"Processus d'encodage (défaut: {EMBEDDING_WORKERS})")
+    parser.add_argument('--index-only', action='store_true',
+                        help="Reconstruire seulement l'index FAISS depuis les embeddings existants")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    from job_recommender import JobRecommender
+
+    print("=" * 80)
+    print("RECRUITERAI - CONSTRUCTION DE L'INDEX")
+    print("=" * 80)
+    start = time.perf_counter()
+
+    if args.index_only:
+        recommender = JobRecommender(allow_build=False)
+        print(f"  → Reconstruction de l'index FAISS ({args.index_type})...")
+        recommender.rebuild_index(args.index_type)
+    else:
+        recommender = JobRecommender(
+            force_reload=True,
+            sample_size=args.sample_size,
+            index_type=args.index_type,
+            embedding_workers=args.workers
+        )
+
+    duration = time.perf_counter() - start
+    print(f"\nIndex '{args.index_type}' prêt: {len(recommender.jobs_df):,} offres "
+          f"en {duration:.1f}s → {EMBEDDINGS_DIR}")
+
+
+if __name__ == "__main__":
+    main()
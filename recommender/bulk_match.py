@@ -0,0 +1,178 @@
+"""
+RecruiterAI - Matching en masse de CV contre le corpus d'offres
+
+Lit un dossier ou une archive zip de CV, les parse en parallèle, les encode
+par lots et écrit les recommandations au fil de l'eau (NDJSON ou CSV).
+
+Usage:
+    python bulk_match.py cvs/ --output resultats.ndjson
+    python bulk_match.py cvs.zip --format csv --top-k 5 --location casablanca > resultats.csv
+"""
+import argparse
+import csv
+import io
+import json
+import sys
+import time
+import zipfile
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Tuple, Union
+
+from config import DEFAULT_TOP_K, MAX_TOP_K, CV_MAX_BYTES, BULK_MAX_FILES
+
+SUPPORTED_EXTENSIONS = {'.pdf', '.docx', '.doc', '.txt'}
+OUTPUT_FORMATS = ['ndjson', 'csv']
+CSV_COLUMNS = [
+    'cv_filename', 'rank', 'job_id', 'title', 'company', 'location', 'contract_type',
+    'score', 'semantic_similarity', 'skills_match_count', 'job_url', 'error'
+]
+
+
+def _is_cv(name: str) -> bool:
+    path = Path(name)
+    return path.suffix.lower() in SUPPORTED_EXTENSIONS and not path.name.startswith(('.', '~$'))
+
+
+def iter_cv_directory(directory: Path, max_files: int = BULK_MAX_FILES) -> Iterator[Tuple[str, bytes]]:
+    """
+    Parcourt (récursivement) un dossier de CV
+
+    Yields:
+        (chemin relatif, contenu) pour chaque CV de format supporté
+    """
+    directory = Path(directory)
+    paths = sorted(p for p in directory.rglob('*') if p.is_file() and _is_cv(p.name))
+    for path in paths[:max_files]:
+        if path.stat().st_size > CV_MAX_BYTES:
+            print(f"  → Ignoré (trop volumineux): {path}", file=sys.stderr)
+            continue
+        yield str(path.relative_to(directory)), path.read_bytes()
+
+
+def iter_cv_zip(source: Union[Path, bytes], max_files: int = BULK_MAX_FILES) -> Iterator[Tuple[str, bytes]]:
+    """
+    Parcourt les CV d'une archive zip (chemin ou contenu en mémoire)
+
+    Les membres dont la taille décompressée annoncée dépasse CV_MAX_BYTES sont
+    ignorés, et la lecture est bornée pour se protéger des archives piégées.
+
+    Yields:
+        (nom du membre, contenu)
+    """
+    handle = io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source
+    with zipfile.ZipFile(handle) as archive:
+        members = [info for info in archive.infolist() if not info.is_dir() and _is_cv(info.filename)]
+        for info in members[:max_files]:
+            if info.file_size > CV_MAX_BYTES:
+                print(f"  → Ignoré (trop volumineux): {info.filename}", file=sys.stderr)
+                continue
+            with archive.open(info) as member:
+                data = member.read(CV_MAX_BYTES + 1)
+            if len(data) > CV_MAX_BYTES:
+                continue
+            yield info.filename, data
+
+
+def iter_cv_source(source: Path, max_files: int = BULK_MAX_FILES) -> Iterator[Tuple[str, bytes]]:
+    """CV d'un dossier ou d'une archive .zip"""
+    source = Path(source)
+    if source.is_dir():
+        return iter_cv_directory(source, max_files)
+    if zipfile.is_zipfile(source):
+        return iter_cv_zip(source, max_files)
+    raise ValueError(f"{source} n'est ni un dossier ni une archive zip")
+
+
+def to_ndjson(result: Dict) -> str:
+    """Une ligne JSON par CV"""
+    return json.dumps(result, ensure_ascii=False, default=str) + '\n'
+
+
+def csv_rows(result: Dict) -> Iterator[Dict]:
+    """Une ligne CSV par (CV, offre recommandée); une ligne d'erreur si le CV a échoué"""
+    if 'error' in result:
+        yield {'cv_filename': result['cv_filename'], 'error': result['error']}
+        return
+    for rank, job in enumerate(result['recommendations'], start=1):
+        yield {
+            'cv_filename': result['cv_filename'],
+            'rank': rank,
+            **{column: job.get(column) for column in CSV_COLUMNS[2:-1]}
+        }
+
+
+def stream_csv(results: Iterable[Dict]) -> Iterator[str]:
+    """Sérialise les résultats en CSV, morceau par morceau (en-tête compris)"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS, extrasaction='ignore')
+    writer.writeheader()
+    yield buffer.getvalue()
+    for result in results:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(csv_rows(result))
+        yield buffer.getvalue()
+
+
+def stream_results(results: Iterable[Dict], output_format: str) -> Iterator[str]:
+    """Flux texte des résultats au format demandé ('ndjson' ou 'csv')"""
+    if output_format == 'csv':
+        return stream_csv(results)
+    return (to_ndjson(result) for result in results)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Matching en masse de CV (dossier ou zip)")
+    parser.add_argument('source', type=str, help="Dossier de CV ou archive .zip")
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='ndjson')
+    parser.add_argument('--output', type=str, default=None, help="Fichier de sortie (stdout par défaut)")
+    parser.add_argument('--top-k', type=int, default=DEFAULT_TOP_K, choices=range(1, MAX_TOP_K + 1),
+                        metavar=f"[1-{MAX_TOP_K}]")
+    parser.add_argument('--min-score', type=float, default=0.0)
+    parser.add_argument('--keywords', type=str, default=None, help="Mots-clés ajoutés à chaque CV (virgules)")
+    parser.add_argument('--location', type=str, default=None)
+    parser.add_argument('--contract-type', type=str, default=None)
+    parser.add_argument('--experience-level', type=str, default=None)
+    parser.add_argument('--max-files', type=int, default=BULK_MAX_FILES)
+    args = parser.parse_args(argv)
+
+    from job_recommender import JobRecommender
+
+    recommender = JobRecommender(allow_build=False)
+    keywords = [k.strip() for k in args.keywords.split(',') if k.strip()] if args.keywords else None
+
+    results = recommender.recommend_bulk(
+        iter_cv_source(Path(args.source), args.max_files),
+        additional_keywords=keywords,
+        location_preference=args.location,
+        contract_type_preference=args.contract_type,
+        experience_level=args.experience_level,
+        top_k=args.top_k,
+        min_score=args.min_score
+    )
+
+    out = open(args.output, 'w', encoding='utf-8', newline='') if args.output else sys.stdout
+    start = time.perf_counter()
+    processed = failed = 0
+    try:
+        def counted():
+            nonlocal processed, failed
+            for result in results:
+                processed += 1
+                failed += 'error' in result
+                yield result
+
+        for chunk in stream_results(counted(), args.format):
+            out.write(chunk)
+            out.flush()
+    finally:
+        if args.output:
+            out.close()
+
+    duration = time.perf_counter() - start
+    print(f"\n{processed} CV traités ({failed} en échec) en {duration:.1f}s "
+          f"({processed / max(duration, 1e-9):.1f} CV/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@
 RecruiterAI - Configuration centralisée pour le système de recommandation
 Data & AI Job Analytics & Recommendation Platform - Focus Morocco
 """
+import csv
 import os
 from pathlib import Path
 
@@ -31,11 +32,83 @@ FACT_JOBS_PATH = GOLD_DIR / "fact_job_offers.csv"
 DIM_COMPANY_PATH = GOLD_DIR / "dim_company.csv"
 DIM_LOCATION_PATH = GOLD_DIR / "dim_location.csv"
 FACT_SKILLS_PATH = GOLD_DIR / "fact_job_skills.csv"
+DIM_SKILLS_PATH = GOLD_DIR / "dim_skills.csv"
+
+# Seeds dbt partagés (référentiels de classification communs au warehouse et au recommender)
+DBT_SEEDS_DIR = BASE_DIR / "dbt" / "seeds"
+
+
+def _read_seed(name: str) -> list:
+    """Lignes d'un seed dbt (dicts de chaînes)"""
+    with open(DBT_SEEDS_DIR / f"{name}.csv", encoding='utf-8', newline='') as f:
+        return list(csv.DictReader(f))
+
+
+# Warehouse DuckDB produit par dbt et exports Parquet de la couche Gold
+DUCKDB_PATH = BASE_DIR / "dbt" / "recruiter_ai.db"
+GOLD_PARQUET_TABLES = {
+    'fact_job_offers': GOLD_DIR / "fact_job_offers.parquet",
+    'dim_company': GOLD_DIR / "dim_company.parquet",
+    'dim_location': GOLD_DIR / "dim_location.parquet",
+    'fact_job_skills': GOLD_DIR / "fact_job_skills.parquet",
+    'dim_skills': GOLD_DIR / "dim_skills.parquet",
+}
+
+# Source des offres: 'auto' (DuckDB, puis Parquet, puis CSV), 'duckdb', 'parquet' ou 'csv'
+JOBS_SOURCE = os.getenv("RECRUITER_JOBS_SOURCE", "auto")
+# Nombre de lignes par record batch Arrow lors du chargement en streaming
+LOADER_BATCH_SIZE = 50_000
+
+# ============================================================================
+# ANALYTICS CUBES
+# ============================================================================
+# Cubes pré-agrégés par dbt (GROUP BY CUBE): nom exposé → table Gold et mesures
+ANALYTICS_CUBES = {
+    'job_offers': {
+        'table': 'agg_job_offers_cube',
+        'measures': ['count_job_offers', 'count_companies', 'remote_jobs', 'permanent_jobs',
+                     'avg_description_length'],
+    },
+    'skills': {
+        'table': 'agg_skills_cube',
+        'measures': ['count_job_offers', 'count_companies', 'pct_of_jobs'],
+    },
+}
+ANALYTICS_DEFAULT_LIMIT = 50
+ANALYTICS_MAX_LIMIT = 1000
+
+# ============================================================================
+# DEDUPLICATION
+# ============================================================================
+# Regrouper les offres republiées avec un texte quasi identique avant l'embedding
+DEDUP_NEAR_DUPLICATES = True
+NEAR_DUPLICATE_THRESHOLD = 0.85   # Similarité de Jaccard estimée (MinHash)
+MINHASH_NUM_PERM = 64
+MINHASH_BANDS = 8                 # 8 bandes x 8 lignes
+SHINGLE_SIZE = 5                  # Shingles de 5 mots
 
 # Model Artifacts Paths
 EMBEDDINGS_PATH = EMBEDDINGS_DIR / "job_embeddings.npy"
 JOBS_PROCESSED_PATH = EMBEDDINGS_DIR / "jobs_processed.pkl"
 FAISS_INDEX_PATH = EMBEDDINGS_DIR / "faiss_index.bin"
+JOB_SKILLS_PATH = EMBEDDINGS_DIR / "job_skills.npz"
+INDEX_META_PATH = EMBEDDINGS_DIR / "index_meta.json"
+
+# ============================================================================
+# IN-MEMORY JOB TABLE
+# ============================================================================
+# Colonnes à faible cardinalité stockées en dtype 'category' (dictionnaire)
+CATEGORICAL_COLUMNS = [
+    'location', 'location_clean', 'contractType', 'contractType_clean',
+    'experience_level', 'companyName', 'workType', 'jobCategory', 'country'
+]
+
+# Colonnes supprimées du DataFrame résident une fois les embeddings calculés
+# (textes dupliqués et compétences remplacées par la matrice CSR)
+DROPPED_RESIDENT_COLUMNS = [
+    'description', 'combined_text', 'title_clean', 'skill_ids',
+    'job_title', 'job_description', 'job_category'
+]
 
 # ============================================================================
 # NLP MODEL CONFIGURATION
@@ -44,156 +117,96 @@ EMBEDDING_MODEL_NAME = "sentence-transformers/distiluse-base-multilingual-cased-
 EMBEDDING_DIMENSION = 512
 SPACY_MODEL = "fr_core_news_lg"  # Supports French & multilingual
 
+# Construction des embeddings par shards (parallèle et reprenable)
+EMBEDDING_SHARDS_DIR = EMBEDDINGS_DIR / "shards"
+EMBEDDING_SHARD_SIZE = 8192
+EMBEDDING_BATCH_SIZE = 32
+EMBEDDING_WORKERS = max(1, min(4, (os.cpu_count() or 1) // 2))
+
+# ============================================================================
+# FAISS INDEX
+# ============================================================================
+# Type d'index: 'flat' (exact), 'ivf' (IVFFlat, approximatif) ou 'hnsw' (graphe)
+FAISS_INDEX_TYPE = "flat"
+FAISS_INDEX_TYPES = ['flat', 'ivf', 'hnsw']
+FAISS_IVF_NPROBE = 16             # Listes inspectées par requête (IVF)
+FAISS_HNSW_M = 32                 # Voisins par noeud (HNSW)
+FAISS_HNSW_EF_SEARCH = 128        # Largeur de recherche (HNSW)
+
+# ============================================================================
+# CV PARSING (pool de processus isolé)
+# ============================================================================
+CV_PARSE_ISOLATED = True          # Parser les PDF/DOCX hors du processus de service
+CV_PARSE_WORKERS = max(1, min(4, (os.cpu_count() or 1) // 2))
+CV_PARSE_TIMEOUT = 20.0           # Secondes par document (toutes pages confondues)
+CV_PARSE_MEMORY_MB = 1536         # Espace d'adressage maximal d'un worker (RLIMIT_AS)
+CV_MAX_BYTES = 10 * 1024 * 1024   # Taille maximale d'un CV uploadé
+CV_MAX_PAGES = 30                 # Pages extraites au-delà desquelles le reste est ignoré
+CV_PARALLEL_PAGES = 8             # À partir de ce nombre de pages, extraction en parallèle
+CV_FAST_PATH_MIN_CHARS = 200      # Caractères par page exigés du chemin rapide PyPDF2
+
+# Matching en masse (CLI bulk_match.py et /api/v1/recommend/cv/bulk)
+BULK_PARSE_THREADS = CV_PARSE_WORKERS * 2   # CV en cours de parsing simultanément
+BULK_ENCODE_BATCH_SIZE = 64                 # CV encodés et recherchés ensemble
+BULK_MAX_FILES = 1000                       # CV maximum par archive
+BULK_MAX_ZIP_BYTES = 200 * 1024 * 1024      # Taille maximale d'une archive uploadée
+
+# ============================================================================
+# CACHES (CV parsés et profils candidats encodés)
+# ============================================================================
+CACHE_DIR = Path(__file__).parent / "data" / "cache"
+# Texte nettoyé des CV, par SHA-256 du fichier uploadé
+CV_CACHE_MEMORY_ITEMS = 256
+CV_CACHE_DISK_MAX_MB = 256
+# Compétences et embedding d'un profil candidat, par SHA-256 (modèle + texte)
+CANDIDATE_CACHE_MEMORY_ITEMS = 1024
+CANDIDATE_CACHE_DISK_MAX_MB = 512
+
 # ============================================================================
 # MOROCCO-SPECIFIC LOCATIONS
 # ============================================================================
-MOROCCO_CITIES = [
-    # Major Cities
-    'casablanca', 'rabat', 'marrakech', 'marrakesh', 'fes', 'fez',
-    'tanger', 'tangier', 'agadir', 'meknes', 'oujda', 'kenitra', 'kénitra',
-    
-    # Secondary Cities
-    'tetouan', 'tétouan', 'salé', 'sale', 'mohammedia', 'el jadida',
-    'beni mellal', 'nador', 'khouribga', 'settat', 'safi', 'taza',
-    'larache', 'khemisset', 'berrechid', 'taourirt', 'berkane',
-    
-    # Tech Hubs
-    'casablanca technopark', 'rabat technopolis', 'tanger free zone',
-    
-    # Country identifiers
-    'morocco', 'maroc', 'ma'
+# Source unique: dbt/seeds/morocco_cities.csv (ville → région, utilisée aussi par dim_location)
+MOROCCO_GENERAL_REGION = 'Morocco (General)'
+# (ville, région, priorité): la plus petite priorité l'emporte quand plusieurs termes correspondent
+MOROCCO_CITY_REGIONS = [
+    (row['city'], row['region'], int(row['priority'])) for row in _read_seed('morocco_cities')
 ]
 
+MOROCCO_CITIES = [city for city, _, _ in MOROCCO_CITY_REGIONS]
+
 MOROCCO_REGIONS = {
-    'Casablanca-Settat': ['casablanca', 'mohammedia', 'el jadida', 'settat', 'berrechid'],
-    'Rabat-Salé-Kénitra': ['rabat', 'salé', 'sale', 'kenitra', 'kénitra', 'khemisset'],
-    'Marrakech-Safi': ['marrakech', 'marrakesh', 'safi'],
-    'Tanger-Tétouan-Al Hoceïma': ['tanger', 'tangier', 'tetouan', 'tétouan', 'larache'],
-    'Fès-Meknès': ['fes', 'fez', 'meknes', 'taza'],
-    'Souss-Massa': ['agadir'],
-    'Oriental': ['oujda', 'nador', 'berkane', 'taourirt'],
-    'Béni Mellal-Khénifra': ['beni mellal', 'khouribga']
+    region: [city for city, city_region, _ in MOROCCO_CITY_REGIONS if city_region == region]
+    for region in dict.fromkeys(region for _, region, _ in MOROCCO_CITY_REGIONS)
+    if region != MOROCCO_GENERAL_REGION
 }
 
+# ============================================================================
+# JOB TITLE CATEGORIES
+# ============================================================================
+# Source unique: dbt/seeds/job_title_patterns.csv (utilisée par int_job_title_normalization)
+# (priorité, catégorie, termes): la catégorie de plus petite priorité trouvée dans le titre l'emporte
+JOB_TITLE_PATTERNS = sorted(
+    (int(row['priority']), row['job_category'], row['pattern'].split('|'))
+    for row in _read_seed('job_title_patterns')
+)
+DEFAULT_JOB_CATEGORY = 'Other Data/AI Role'
+
 # ============================================================================
 # DATA & AI SKILLS (Enhanced for AI Focus)
 # ============================================================================
-DATA_SKILLS = [
-    # ========== AI & Machine Learning (Priority) ==========
-    # Generative AI & LLMs
-    'Large Language Models', 'LLM', 'GPT', 'GPT-4', 'ChatGPT', 'Claude', 'Gemini', 'Llama',
-    'Prompt Engineering', 'LangChain', 'LlamaIndex', 'RAG', 'Retrieval Augmented Generation',
-    'Generative AI', 'GenAI', 'Diffusion Models', 'Stable Diffusion', 'DALL-E', 'Midjourney',
-    'Fine-tuning', 'RLHF', 'Instruction Tuning', 'LoRA', 'QLoRA',
-    
-    # Core ML/DL
-    'Machine Learning', 'Deep Learning', 'Artificial Intelligence', 'Neural Networks',
-    'Reinforcement Learning', 'Transfer Learning', 'Federated Learning',
-    'TensorFlow', 'PyTorch', 'Keras', 'JAX', 'Sklearn', 'Scikit-learn',
-    'XGBoost', 'LightGBM', 'CatBoost', 'Random Forest', 'Gradient Boosting',
-    
-    # NLP
-    'Natural Language Processing', 'NLP', 'BERT', 'Transformers', 'Hugging Face',
-    'Sentiment Analysis', 'Named Entity Recognition', 'Text Classification',
-    'Question Answering', 'Text Generation', 'Summarization', 'spaCy', 'NLTK',
-    
-    # Computer Vision
-    'Computer Vision', 'OpenCV', 'YOLO', 'Object Detection', 'Image Classification',
-    'Image Segmentation', 'Face Recognition', 'OCR', 'Video Analytics',
-    
-    # MLOps & Model Deployment
-    'MLOps', 'ML Pipeline', 'Model Deployment', 'Model Monitoring', 'Model Serving',
-    'MLflow', 'Kubeflow', 'SageMaker', 'Vertex AI', 'Azure ML',
-    'Feature Store', 'Model Registry', 'A/B Testing ML', 'Experiment Tracking',
-    
-    # Vector Databases & Embeddings
-    'Vector Database', 'Pinecone', 'Milvus', 'Weaviate', 'Chroma', 'Qdrant',
-    'FAISS', 'Embeddings', 'Semantic Search', 'Similarity Search',
-    
-    # ========== Programming Languages ==========
-    'Python', 'R', 'Java', 'Scala', 'Julia', 'C++', 'C#', 'JavaScript', 'TypeScript',
-    'Go', 'Rust', 'MATLAB', 'SAS', 'VBA',
-    
-    # ========== Databases & SQL ==========
-    'SQL', 'PostgreSQL', 'MySQL', 'MongoDB', 'Redis', 'Cassandra', 'DynamoDB',
-    'Oracle', 'SQL Server', 'NoSQL', 'Neo4j', 'Elasticsearch', 'SQLite',
-    'Snowflake', 'BigQuery', 'Redshift', 'Databricks', 'Teradata', 'Hive',
-    
-    # ========== Data Engineering & Big Data ==========
-    'ETL', 'ELT', 'Data Pipeline', 'Data Warehouse', 'Data Lake', 'Data Mesh',
-    'Spark', 'PySpark', 'Hadoop', 'Kafka', 'Flink', 'Airflow', 'Prefect', 'Dagster',
-    'dbt', 'Fivetran', 'Talend', 'NiFi', 'Parquet', 'Delta Lake', 'Iceberg',
-    'Dask', 'Polars', 'Ray', 'Beam',
-    
-    # ========== Data Visualization & BI ==========
-    'Tableau', 'Power BI', 'Looker', 'Metabase', 'Superset', 'Grafana',
-    'D3.js', 'Plotly', 'Matplotlib', 'Seaborn', 'Streamlit', 'Dash',
-    
-    # ========== Cloud Platforms ==========
-    'AWS', 'Azure', 'GCP', 'Google Cloud', 'Cloud Computing',
-    'S3', 'EC2', 'Lambda', 'EMR', 'Glue', 'Athena',
-    'Azure Data Factory', 'Azure Synapse', 'Azure Databricks',
-    'Cloud Functions', 'Cloud Run', 'Dataflow', 'Dataproc',
-    
-    # ========== DevOps & Infrastructure ==========
-    'Git', 'GitHub', 'GitLab', 'Docker', 'Kubernetes', 'Helm',
-    'Jenkins', 'CI/CD', 'GitHub Actions', 'Terraform', 'Ansible',
-    'Linux', 'Bash', 'Shell',
-    
-    # ========== Statistics & Analytics ==========
-    'Statistics', 'Data Analysis', 'Data Analytics', 'Time Series',
-    'Forecasting', 'A/B Testing', 'Hypothesis Testing', 'Exploratory Data Analysis',
-    
-    # ========== Soft Skills ==========
-    'Communication', 'Leadership', 'Problem Solving', 'Teamwork', 'Agile', 'Scrum'
+# Source unique: dbt/seeds/skills_patterns.csv (utilisée aussi par int_skills_extraction)
+# (compétence, catégorie, motif regex): alternatives séparées par '|', texte en minuscules
+SKILL_PATTERNS = [
+    (row['skill_name'], row['skill_category'], row['skill_pattern']) for row in _read_seed('skills_patterns')
 ]
 
-# Skill Aliases (Alias: Canonical Name)
-SKILL_ALIASES = {
-    # AI/ML
-    'ai': 'Artificial Intelligence',
-    'artificial intelligence': 'Artificial Intelligence',
-    'machine learning': 'Machine Learning',
-    'ml': 'Machine Learning',
-    'dl': 'Deep Learning',
-    'deep learning': 'Deep Learning',
-    'nlp': 'Natural Language Processing',
-    'natural language processing': 'Natural Language Processing',
-    'genai': 'Generative AI',
-    'generative ai': 'Generative AI',
-    'llm': 'Large Language Models',
-    'llms': 'Large Language Models',
-    'large language models': 'Large Language Models',
-    'rag': 'Retrieval Augmented Generation',
-    'cv': 'Computer Vision',
-    'computer vision': 'Computer Vision',
-    
-    # Cloud
-    'google cloud platform': 'GCP',
-    'google cloud': 'GCP',
-    'gcp': 'GCP',
-    'amazon web services': 'AWS',
-    'aws': 'AWS',
-    'microsoft azure': 'Azure',
-    'azure': 'Azure',
-    
-    # Tools
-    'pyspark': 'Spark',
-    'spark': 'Spark',
-    'scikit-learn': 'Sklearn',
-    'sklearn': 'Sklearn',
-    'k8s': 'Kubernetes',
-    'tf': 'TensorFlow',
-    'tensorflow': 'TensorFlow',
-    'hf': 'Hugging Face',
-    'huggingface': 'Hugging Face',
-    
-    # BI
-    'bi': 'Business Intelligence',
-    'business intelligence': 'Business Intelligence',
-    'pbi': 'Power BI',
-    'power bi': 'Power BI'
-}
+DATA_SKILLS = [skill for skill, _, _ in SKILL_PATTERNS]
+SKILL_CATEGORIES = {skill: category for skill, category, _ in SKILL_PATTERNS}
+
+# Catégories mises en avant dans l'interface (badge 🤖)
+AI_SKILL_CATEGORIES = [
+    'Generative AI', 'AI & Machine Learning', 'ML/DL Library', 'NLP', 'Computer Vision', 'MLOps', 'Vector Search'
+]
 
 # ============================================================================
 # EXPERIENCE LEVELS
@@ -223,6 +236,12 @@ SCORING_WEIGHTS = {
 DEFAULT_TOP_K = 10
 MAX_TOP_K = 50
 
+# Pagination par curseur (au-delà de MAX_TOP_K)
+PAGINATION_MAX_RESULTS = 500      # Résultats scorés conservés par requête paginée
+PAGINATION_CURSOR_TTL = 600       # Secondes de validité d'un curseur
+PAGINATION_MAX_SETS = 200         # Listes conservées simultanément (LRU au-delà)
+PAGINATION_MAX_ENTRIES = 50_000   # Résultats conservés au total, toutes listes confondues (LRU au-delà)
+
 # ============================================================================
 # API CONFIGURATION
 # ============================================================================
@@ -232,6 +251,36 @@ API_RELOAD = True
 API_TITLE = "RecruiterAI API"
 API_DESCRIPTION = "Data & AI Job Recommendation API - Focus Morocco"
 
+# Application Streamlit: 'local' (charge le modèle et l'index) ou 'client' (appelle l'API)
+APP_MODE = os.getenv("RECRUITER_APP_MODE", "local")
+API_BASE_URL = os.getenv("RECRUITER_API_URL", f"http://localhost:{API_PORT}")
+API_CLIENT_POOL_SIZE = 10         # Connexions keep-alive conservées vers l'API
+API_CLIENT_CONNECT_TIMEOUT = 3.05 # Secondes pour établir la connexion
+API_CLIENT_READ_TIMEOUT = 60.0    # Secondes d'attente de la réponse (CV volumineux)
+API_CLIENT_RETRIES = 3            # Nouvelles tentatives (connexion, 502/503/504)
+API_CLIENT_BACKOFF = 0.5          # Attente exponentielle entre tentatives (0.5 s, 1 s, 2 s)
+
+# Tâches asynchrones (/api/v1/tasks): soumission puis consultation ou callback
+TASK_WORKERS = 2                  # Tâches exécutées simultanément
+TASK_MAX_PENDING = 100            # Au-delà, les soumissions sont refusées (429)
+TASK_RESULT_TTL = 3600            # Secondes de conservation d'une tâche terminée
+TASK_MAX_FINISHED = 200           # Tâches terminées conservées (les plus anciennes oubliées au-delà)
+TASK_CALLBACK_TIMEOUT = 10.0      # Secondes pour notifier callback_url
+# Hôtes autorisés pour callback_url (séparés par des virgules); vide: tout hôte
+# public (les adresses privées, loopback et link-local sont toujours refusées)
+TASK_CALLBACK_ALLOWED_HOSTS = {
+    host.strip().lower() for host in os.getenv("RECRUITER_CALLBACK_HOSTS", "").split(",") if host.strip()
+}
+
+# Endpoints d'administration (/admin/*): désactivés tant que le jeton n'est pas défini
+ADMIN_TOKEN = os.getenv("RECRUITER_ADMIN_TOKEN")
+
+# Profilage par échantillonnage du processus en production
+PROFILES_DIR = Path(__file__).parent / "data" / "profiles"
+PROFILER_INTERVAL = 0.005         # Secondes entre deux échantillons de piles
+PROFILER_MAX_SECONDS = 120        # Durée maximale d'une capture
+PROFILER_SIGNAL_SECONDS = 30      # Durée d'une capture déclenchée par SIGUSR2
+
 # ============================================================================
 # LOGGING
 # ============================================================================
@@ -251,3 +300,7 @@ UI_THEME = {
     'text_primary': '#F8FAFC',       # Slate 50
     'text_secondary': '#94A3B8',     # Slate 400
 }
+
+# Caches de l'application Streamlit (évite de relancer la recherche à chaque rerun)
+UI_CACHED_SEARCHES = 8            # Recherches conservées par session (paramètres → résultats)
+UI_STATS_CACHE_TTL = 600          # Secondes de cache des statistiques globales
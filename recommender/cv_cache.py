@@ -0,0 +1,177 @@
+"""
+Cache par empreinte de contenu (SHA-256), en mémoire et sur disque
+
+Sert à ne pas re-parser un CV déjà soumis (clé: octets du fichier) et à ne pas
+ré-encoder un profil candidat déjà vu (clé: modèle + texte du candidat).
+Niveau 1: LRU en mémoire; niveau 2: dossier sur disque borné en taille,
+évincé par date de dernier accès.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import numpy as np
+
+from metrics import CACHE_REQUESTS
+
+# Champ stocké en .npy à côté du .json de l'entrée
+_ARRAY_FIELD = 'embedding'
+
+
+def content_key(data: Union[bytes, str]) -> str:
+    """Clé de cache: SHA-256 hexadécimal du contenu"""
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+
+class ContentCache:
+    """
+    Cache à deux niveaux (mémoire LRU + disque borné) d'entrées dictionnaires
+
+    Les valeurs sont des dictionnaires JSON-sérialisables; le champ optionnel
+    `embedding` (np.ndarray) est stocké à part en .npy.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        directory: Optional[Path] = None,
+        max_items: int = 256,
+        max_disk_mb: float = 256
+    ):
+        """
+        Args:
+            name: Nom du cache (label des métriques)
+            directory: Dossier du niveau disque (None = mémoire seulement)
+            max_items: Nombre d'entrées gardées en mémoire
+            max_disk_mb: Taille maximale du dossier sur disque
+        """
+        self.name = name
+        self.directory = Path(directory) if directory else None
+        self.max_items = max_items
+        self.max_disk_bytes = int(max_disk_mb * 1024 * 1024)
+        self._memory: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._disk_bytes = sum(path.stat().st_size for path in self.directory.iterdir() if path.is_file())
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Retourne l'entrée (copie superficielle) ou None"""
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+        if value is not None:
+            CACHE_REQUESTS.labels(cache=self.name, result='hit').inc()
+            return dict(value)
+
+        value = self._read_disk(key)
+        if value is not None:
+            CACHE_REQUESTS.labels(cache=self.name, result='disk_hit').inc()
+            self._remember(key, value)
+            return dict(value)
+
+        CACHE_REQUESTS.labels(cache=self.name, result='miss').inc()
+        return None
+
+    def put(self, key: str, value: Dict):
+        """Enregistre une entrée dans les deux niveaux"""
+        self._remember(key, value)
+        if self.directory:
+            try:
+                self._write_disk(key, value)
+            except OSError as e:
+                print(f"  → Cache {self.name}: écriture impossible ({e})")
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        if self.directory:
+            for path in self.directory.iterdir():
+                path.unlink(missing_ok=True)
+            self._disk_bytes = 0
+
+    def _remember(self, key: str, value: Dict):
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_items:
+                self._memory.popitem(last=False)
+
+    def _paths(self, key: str):
+        return self.directory / f"{key}.json", self.directory / f"{key}.npy"
+
+    def _read_disk(self, key: str) -> Optional[Dict]:
+        if not self.directory:
+            return None
+        json_path, npy_path = self._paths(key)
+        try:
+            value = json.loads(json_path.read_text(encoding='utf-8'))
+            if value.pop('_has_array', False):
+                value[_ARRAY_FIELD] = np.load(npy_path)
+            # Marque l'accès pour l'éviction par ancienneté
+            os.utime(json_path)
+            return value
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _entry_size(json_path: Path, npy_path: Path) -> int:
+        return sum(path.stat().st_size for path in (json_path, npy_path) if path.exists())
+
+    def _write_disk(self, key: str, value: Dict):
+        json_path, npy_path = self._paths(key)
+        payload = {k: v for k, v in value.items() if k != _ARRAY_FIELD}
+        # Une entrée réécrite remplace l'ancienne: sa taille ne compte qu'une fois
+        previous = self._entry_size(json_path, npy_path)
+        written = 0
+
+        if value.get(_ARRAY_FIELD) is not None:
+            payload['_has_array'] = True
+            tmp_npy = npy_path.with_name(f"{key}.tmp.npy")
+            np.save(tmp_npy, np.asarray(value[_ARRAY_FIELD], dtype=np.float32))
+            os.replace(tmp_npy, npy_path)
+            written += npy_path.stat().st_size
+        else:
+            npy_path.unlink(missing_ok=True)
+
+        tmp_json = json_path.with_suffix('.tmp')
+        tmp_json.write_text(json.dumps(payload, ensure_ascii=False), encoding='utf-8')
+        os.replace(tmp_json, json_path)
+        written += json_path.stat().st_size
+
+        with self._lock:
+            self._disk_bytes += written - previous
+            over_budget = self._disk_bytes > self.max_disk_bytes
+        if over_budget:
+            self._evict_disk()
+
+    def _evict_disk(self):
+        """Supprime les entrées les moins récemment utilisées jusqu'à 90% du budget"""
+        entries = []
+        for json_path in self.directory.glob('*.json'):
+            try:
+                npy_path = json_path.with_suffix('.npy')
+                size = self._entry_size(json_path, npy_path)
+                entries.append((json_path.stat().st_mtime, size, json_path, npy_path))
+            except OSError:
+                continue
+
+        total = sum(entry[1] for entry in entries)
+        target = int(self.max_disk_bytes * 0.9)
+        for _, size, json_path, npy_path in sorted(entries):
+            if total <= target:
+                break
+            json_path.unlink(missing_ok=True)
+            npy_path.unlink(missing_ok=True)
+            total -= size
+
+        with self._lock:
+            self._disk_bytes = total
@@ -1,20 +1,380 @@
 """
 Module pour parser les CVs (PDF, DOCX) et extraire le texte
+
+Les PDF et DOCX sont parsés dans un pool de processus isolé (CVParsePool):
+chaque document a un budget de temps, de mémoire et de pages, si bien qu'un
+fichier malformé ou un scan de 200 pages ne bloque pas le processus de service.
+Chaque worker écoute aussi les demandes de profilage de l'API (/admin/profile).
 """
+import multiprocessing
+import os
+import queue
 import re
+import threading
+import time
+from io import BytesIO
+from multiprocessing import get_context
 from pathlib import Path
-from typing import Optional
+from collections import Counter
+from typing import Callable, List, Optional, Sequence, Tuple
 
 import PyPDF2
 import pdfplumber
 from docx import Document
 
+from config import (
+    CV_PARSE_ISOLATED, CV_PARSE_WORKERS, CV_PARSE_TIMEOUT, CV_PARSE_MEMORY_MB,
+    CV_MAX_BYTES, CV_MAX_PAGES, CV_PARALLEL_PAGES, CV_FAST_PATH_MIN_CHARS
+)
+from metrics import CV_PARSE_FAILURES, POOL_QUEUE_DEPTH
+from profiler import sample, ProfilerBusyError
+
+
+class CVParseError(ValueError):
+    """CV illisible, trop volumineux ou dépassant son budget de temps/mémoire"""
+
+
+class CVParseTimeout(CVParseError):
+    """Budget de temps du document épuisé (inutile de tenter un autre extracteur)"""
+
+
+# ============================================================================
+# Extraction (exécutée dans les workers, ou en processus si le pool est désactivé)
+# ============================================================================
+
+def _init_parse_worker(memory_mb: int, profile_requests=None, profile_results=None):
+    """Initialise un worker: un seul thread BLAS, plafond d'espace d'adressage et écoute du profilage"""
+    for var in ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS'):
+        os.environ[var] = '1'
+    try:
+        import resource
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ImportError, ValueError, OSError):
+        # Plateforme sans RLIMIT_AS (Windows, macOS): seul le timeout s'applique
+        pass
+    if profile_requests is not None:
+        threading.Thread(
+            target=_serve_profile_requests, args=(profile_requests, profile_results),
+            name='profile-listener', daemon=True
+        ).start()
+
+
+def _serve_profile_requests(requests, results):
+    """
+    Thread d'un worker: échantillonne le thread de parsing à la demande de l'API
+
+    Une demande (id, échéance, intervalle, include_idle) est prise par un seul
+    worker, qui n'en reprend pas d'autre avant la fin de sa capture: chaque
+    worker actif répond donc au plus une fois par demande de l'API.
+    """
+    while True:
+        request_id, deadline, interval, include_idle = requests.get()
+        seconds = deadline - time.time()
+        if seconds <= 0:
+            continue  # Demande périmée (worker démarré après la capture)
+        try:
+            stacks = sample(seconds, interval, include_idle)
+        except ProfilerBusyError:
+            stacks = Counter()
+        results.put((request_id, os.getpid(), dict(stacks)))
+
+
+def _is_usable_text(text: str, n_pages: int) -> bool:
+    """Le texte du chemin rapide est-il exploitable (assez de texte, peu de bruit) ?"""
+    stripped = text.strip()
+    if len(stripped) < CV_FAST_PATH_MIN_CHARS * max(1, n_pages):
+        return False
+    letters = sum(ch.isalpha() for ch in stripped)
+    return letters / len(stripped) >= 0.5
+
+
+def _pdf_fast_path(file_bytes: bytes, max_pages: int) -> Tuple[int, str]:
+    """
+    Extraction rapide avec PyPDF2 (sans analyse de mise en page)
+
+    Returns:
+        (nombre de pages du document, texte des max_pages premières pages)
+    """
+    try:
+        reader = PyPDF2.PdfReader(BytesIO(file_bytes))
+        n_pages = len(reader.pages)
+        text = []
+        for page in reader.pages[:max_pages]:
+            page_text = page.extract_text()
+            if page_text:
+                text.append(page_text)
+        return n_pages, '\n'.join(text)
+    except MemoryError:
+        raise CVParseError("Budget mémoire dépassé pendant le parsing du PDF")
+    except Exception as e:
+        raise CVParseError(f"Impossible de parser le PDF: {e}")
+
+
+def _pdf_layout_pages(file_bytes: bytes, start: int, end: int) -> str:
+    """Extraction avec pdfplumber (analyse de mise en page) des pages [start, end)"""
+    try:
+        text = []
+        with pdfplumber.open(BytesIO(file_bytes)) as pdf:
+            for page in pdf.pages[start:end]:
+                page_text = page.extract_text()
+                if page_text:
+                    text.append(page_text)
+        return '\n'.join(text)
+    except MemoryError:
+        raise CVParseError("Budget mémoire dépassé pendant le parsing du PDF")
+    except Exception as e:
+        raise CVParseError(f"Impossible de parser le PDF: {e}")
+
+
+def _docx_text(file_bytes: bytes) -> str:
+    """Texte des paragraphes et des tableaux d'un DOCX"""
+    try:
+        doc = Document(BytesIO(file_bytes))
+        text = []
+        
+        for paragraph in doc.paragraphs:
+            if paragraph.text.strip():
+                text.append(paragraph.text)
+        
+        # Extraire aussi le texte des tableaux
+        for table in doc.tables:
+            for row in table.rows:
+                for cell in row.cells:
+                    if cell.text.strip():
+                        text.append(cell.text)
+        
+        return '\n'.join(text)
+    except MemoryError:
+        raise CVParseError("Budget mémoire dépassé pendant le parsing du DOCX")
+    except Exception as e:
+        raise CVParseError(f"Impossible de parser le DOCX: {e}")
+
+
+def _page_ranges(n_pages: int, parts: int) -> List[Tuple[int, int]]:
+    """Découpe [0, n_pages) en au plus `parts` plages contiguës"""
+    parts = max(1, min(parts, n_pages))
+    bounds = [round(i * n_pages / parts) for i in range(parts + 1)]
+    return [(bounds[i], bounds[i + 1]) for i in range(parts) if bounds[i] < bounds[i + 1]]
+
+
+def extract_pdf_text(file_bytes: bytes, run: Callable, workers: int = 1, max_pages: int = CV_MAX_PAGES) -> str:
+    """
+    Extrait le texte d'un PDF: chemin rapide PyPDF2, puis pdfplumber si besoin
+
+    Args:
+        file_bytes: Contenu du PDF
+        run: Exécuteur de tâches `run([(fonction, args), ...]) -> [résultats]`
+            (pool de processus ou exécution directe)
+        workers: Nombre de tâches pdfplumber parallèles pour un long document
+        max_pages: Nombre maximal de pages extraites
+
+    Returns:
+        Texte extrait
+    """
+    try:
+        n_pages, fast_text = run([(_pdf_fast_path, (file_bytes, max_pages))])[0]
+    except CVParseTimeout:
+        raise
+    except CVParseError:
+        # PyPDF2 est plus strict (marqueur %%EOF, xref): pdfplumber peut encore lire le fichier
+        n_pages, fast_text = None, ''
+    
+    if n_pages is None:
+        # Nombre de pages inconnu: une seule plage, bornée par max_pages
+        ranges = [(0, max_pages)]
+    else:
+        pages = min(n_pages, max_pages)
+        if _is_usable_text(fast_text, pages):
+            return fast_text
+        # Scans, colonnes, tableaux: l'analyse de mise en page de pdfplumber est
+        # nécessaire; les longs documents sont découpés en plages de pages
+        ranges = _page_ranges(pages, workers if pages >= CV_PARALLEL_PAGES else 1)
+    try:
+        parts = run([(_pdf_layout_pages, (file_bytes, start, end)) for start, end in ranges])
+    except CVParseError:
+        if fast_text.strip():
+            return fast_text
+        raise
+    
+    layout_text = '\n'.join(part for part in parts if part)
+    return layout_text if len(layout_text.strip()) >= len(fast_text.strip()) else fast_text
+
+
+# Intervalle de vérification qu'un pool n'a pas été recréé pendant l'attente
+_POOL_POLL_INTERVAL = 0.1
+
+
+def _run_inline(tasks: Sequence[Tuple[Callable, tuple]]) -> list:
+    return [function(*args) for function, args in tasks]
+
+
+# ============================================================================
+# Pool de processus
+# ============================================================================
+
+class CVParsePool:
+    """
+    Pool de processus dédié au parsing des CV
+
+    Chaque document dispose d'un budget de temps global (toutes tâches
+    confondues); en cas de dépassement, les workers sont tués et le pool est
+    recréé. Les tâches des autres documents perdues avec l'ancien pool sont
+    détectées et resoumises au nouveau, dans leur propre budget. La mémoire
+    de chaque worker est plafonnée par RLIMIT_AS.
+    """
+
+    def __init__(
+        self,
+        workers: int = CV_PARSE_WORKERS,
+        timeout: float = CV_PARSE_TIMEOUT,
+        memory_mb: int = CV_PARSE_MEMORY_MB,
+        max_pages: int = CV_MAX_PAGES
+    ):
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.memory_mb = memory_mb
+        self.max_pages = max_pages
+        self._pool = None
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._queue_depth = POOL_QUEUE_DEPTH.labels(pool='cv_parse')
+        self._profile_requests = None
+        self._profile_results = None
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                context = get_context('spawn')
+                if self._profile_requests is None:
+                    self._profile_requests = context.Queue()
+                    self._profile_results = context.Queue()
+                self._pool = context.Pool(
+                    processes=self.workers,
+                    initializer=_init_parse_worker,
+                    initargs=(self.memory_mb, self._profile_requests, self._profile_results),
+                    maxtasksperchild=100
+                )
+                self._generation += 1
+            return self._pool, self._generation
+
+    def _restart(self, generation: int):
+        """Tue les workers (tâche bloquée) si le pool n'a pas déjà été recréé"""
+        with self._lock:
+            if self._pool is not None and self._generation == generation:
+                self._pool.terminate()
+                self._pool = None
+
+    def _is_current(self, generation: int) -> bool:
+        with self._lock:
+            return self._pool is not None and self._generation == generation
+
+    def _runner(self, deadline: float) -> Callable:
+        """Exécuteur de tâches soumis au budget de temps du document"""
+        def run(tasks: Sequence[Tuple[Callable, tuple]]) -> list:
+            self._queue_depth.inc(len(tasks))
+            try:
+                pool, generation = self._get_pool()
+                pending = [pool.apply_async(function, args) for function, args in tasks]
+                results = []
+                while len(results) < len(tasks):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._restart(generation)
+                        raise CVParseTimeout(f"Parsing du CV interrompu après {self.timeout:g}s")
+                    try:
+                        results.append(pending[len(results)].get(timeout=min(remaining, _POOL_POLL_INTERVAL)))
+                    except multiprocessing.TimeoutError:
+                        if not self._is_current(generation):
+                            # Pool tué pour la tâche bloquée d'un autre document: nos tâches
+                            # restantes ne termineront jamais, on les resoumet au nouveau pool
+                            pool, generation = self._get_pool()
+                            pending[len(results):] = [
+                                pool.apply_async(function, args) for function, args in tasks[len(results):]
+                            ]
+                return results
+            finally:
+                self._queue_depth.dec(len(tasks))
+        return run
+
+    def parse_pdf(self, file_bytes: bytes) -> str:
+        deadline = time.monotonic() + self.timeout
+        return extract_pdf_text(file_bytes, self._runner(deadline), self.workers, self.max_pages)
+
+    def parse_docx(self, file_bytes: bytes) -> str:
+        deadline = time.monotonic() + self.timeout
+        return self._runner(deadline)([(_docx_text, (file_bytes,))])[0]
+
+    def profile_workers(self, seconds: float, interval: float, include_idle: bool = False) -> Counter:
+        """
+        Échantillonne les workers pendant `seconds` secondes (voir profiler.sample)
+
+        Returns:
+            Compteur {pile collapsed préfixée par `worker;`: nombre d'échantillons},
+            vide si le pool n'a pas encore été créé. Un worker recyclé ou tué
+            pendant la capture est absent du résultat.
+        """
+        with self._lock:
+            if self._pool is None:
+                return Counter()
+            requests, results = self._profile_requests, self._profile_results
+
+        request_id = os.urandom(8).hex()
+        deadline = time.time() + seconds
+        for _ in range(self.workers):
+            requests.put((request_id, deadline, interval, include_idle))
+
+        stacks = Counter()
+        answered = 0
+        while answered < self.workers:
+            try:
+                answer_id, _, worker_stacks = results.get(timeout=max(deadline - time.time(), 0) + 2.0)
+            except queue.Empty:
+                break
+            if answer_id != request_id:
+                continue  # Réponse tardive d'une capture précédente
+            answered += 1
+            stacks.update({f"worker;{stack}": count for stack, count in worker_stacks.items()})
+        return stacks
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.terminate()
+                self._pool = None
+
+
+_shared_pool: Optional[CVParsePool] = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_parse_pool() -> CVParsePool:
+    """Pool de parsing partagé par le processus (créé au premier usage)"""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = CVParsePool()
+        return _shared_pool
+
+
+def shutdown_parse_pool():
+    """Arrête le pool partagé s'il a été créé (arrêt du service)"""
+    with _shared_pool_lock:
+        if _shared_pool is not None:
+            _shared_pool.shutdown()
+
 
 class CVParser:
     """Extracteur de texte depuis des fichiers CV (PDF, DOCX)"""
     
-    def __init__(self):
+    def __init__(self, isolated: bool = CV_PARSE_ISOLATED):
+        """
+        Args:
+            isolated: Parser les PDF/DOCX dans le pool de processus partagé
+                (sinon dans le processus courant, sans timeout)
+        """
         self.supported_formats = ['.pdf', '.docx', '.doc', '.txt']
+        self.isolated = isolated
     
     def parse_cv(self, file_path: str) -> str:
         """
@@ -27,26 +387,17 @@ class CVParser:
             Texte extrait du CV
             
         Raises:
-            ValueError: Si le format n'est pas supporté
+            ValueError: Si le format n'est pas supporté ou le fichier illisible
         """
         file_path = Path(file_path)
         
         if not file_path.exists():
             raise FileNotFoundError(f"Le fichier {file_path} n'existe pas")
         
-        extension = file_path.suffix.lower()
-        
-        if extension == '.pdf':
-            return self._parse_pdf(file_path)
-        elif extension in ['.docx', '.doc']:
-            return self._parse_docx(file_path)
-        elif extension == '.txt':
+        if file_path.suffix.lower() == '.txt':
             return self._parse_txt(file_path)
-        else:
-            raise ValueError(
-                f"Format non supporté: {extension}. "
-                f"Formats acceptés: {', '.join(self.supported_formats)}"
-            )
+        
+        return self.parse_cv_bytes(file_path.read_bytes(), file_path.name)
     
     def parse_cv_bytes(self, file_bytes: bytes, filename: str) -> str:
         """
@@ -58,121 +409,51 @@ class CVParser:
             
         Returns:
             Texte extrait
+            
+        Raises:
+            CVParseError: Fichier trop volumineux, illisible ou hors budget
+            ValueError: Si le format n'est pas supporté
         """
         extension = Path(filename).suffix.lower()
         
-        if extension == '.pdf':
-            return self._parse_pdf_bytes(file_bytes)
-        elif extension in ['.docx', '.doc']:
-            return self._parse_docx_bytes(file_bytes)
-        elif extension == '.txt':
-            return file_bytes.decode('utf-8', errors='ignore')
-        else:
-            raise ValueError(f"Format non supporté: {extension}")
-    
-    def _parse_pdf(self, file_path: Path) -> str:
-        """Parse un fichier PDF avec pdfplumber (meilleur que PyPDF2)"""
-        text = []
-        
-        try:
-            # Essayer avec pdfplumber (meilleur pour les PDFs complexes)
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text.append(page_text)
-            
-            if text:
-                return '\n'.join(text)
-        except Exception as e:
-            print(f"pdfplumber failed: {e}, trying PyPDF2...")
-        
-        # Fallback vers PyPDF2
-        try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text.append(page_text)
-            
-            return '\n'.join(text)
-        except Exception as e:
-            raise ValueError(f"Impossible de parser le PDF: {e}")
-    
-    def _parse_pdf_bytes(self, file_bytes: bytes) -> str:
-        """Parse un PDF depuis des bytes"""
-        from io import BytesIO
-        
-        text = []
-        
         try:
-            # Essayer avec pdfplumber
-            with pdfplumber.open(BytesIO(file_bytes)) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text.append(page_text)
+            if len(file_bytes) > CV_MAX_BYTES:
+                raise CVParseError(
+                    f"Fichier trop volumineux ({len(file_bytes) / 1e6:.1f} MB, "
+                    f"max {CV_MAX_BYTES / 1e6:.0f} MB)"
+                )
             
-            if text:
-                return '\n'.join(text)
+            if extension == '.pdf':
+                return self._parse_pdf_bytes(file_bytes)
+            elif extension in ['.docx', '.doc']:
+                return self._parse_docx_bytes(file_bytes)
+            elif extension == '.txt':
+                return file_bytes.decode('utf-8', errors='ignore')
+            else:
+                raise ValueError(
+                    f"Format non supporté: {extension}. "
+                    f"Formats acceptés: {', '.join(self.supported_formats)}"
+                )
         except Exception:
-            pass
-        
-        # Fallback vers PyPDF2
-        try:
-            pdf_reader = PyPDF2.PdfReader(BytesIO(file_bytes))
-            for page in pdf_reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text.append(page_text)
-            
-            return '\n'.join(text)
-        except Exception as e:
-            raise ValueError(f"Impossible de parser le PDF: {e}")
+            self._record_failure(extension)
+            raise
     
-    def _parse_docx(self, file_path: Path) -> str:
-        """Parse un fichier DOCX"""
-        try:
-            doc = Document(file_path)
-            text = []
-            
-            for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    text.append(paragraph.text)
-            
-            # Extraire aussi le texte des tableaux
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        if cell.text.strip():
-                            text.append(cell.text)
-            
-            return '\n'.join(text)
-        except Exception as e:
-            raise ValueError(f"Impossible de parser le DOCX: {e}")
+    def _record_failure(self, extension: str):
+        """Compte un échec de parsing (les extensions inconnues sont regroupées)"""
+        label = extension.lstrip('.') if extension in self.supported_formats else 'unsupported'
+        CV_PARSE_FAILURES.labels(format=label).inc()
+    
+    def _parse_pdf_bytes(self, file_bytes: bytes) -> str:
+        """Parse un PDF depuis des bytes (PyPDF2 d'abord, pdfplumber si nécessaire)"""
+        if self.isolated:
+            return get_parse_pool().parse_pdf(file_bytes)
+        return extract_pdf_text(file_bytes, _run_inline)
     
     def _parse_docx_bytes(self, file_bytes: bytes) -> str:
         """Parse un DOCX depuis des bytes"""
-        from io import BytesIO
-        
-        try:
-            doc = Document(BytesIO(file_bytes))
-            text = []
-            
-            for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    text.append(paragraph.text)
-            
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        if cell.text.strip():
-                            text.append(cell.text)
-            
-            return '\n'.join(text)
-        except Exception as e:
-            raise ValueError(f"Impossible de parser le DOCX: {e}")
+        if self.isolated:
+            return get_parse_pool().parse_docx(file_bytes)
+        return _docx_text(file_bytes)
     
     def _parse_txt(self, file_path: Path) -> str:
         """Parse un fichier TXT"""
@@ -2,32 +2,340 @@
 Module de préprocessing des données d'offres d'emploi
 """
 import re
-from typing import List, Dict, Set
+from pathlib import Path
+from typing import List, Dict, Set, Iterable, Iterator, Optional, Tuple
 import pandas as pd
 import numpy as np
-from config import DATA_SKILLS, SKILL_ALIASES, EXPERIENCE_LEVELS, FACT_JOBS_PATH, DIM_COMPANY_PATH, DIM_LOCATION_PATH
+from config import (
+    EXPERIENCE_LEVELS, FACT_JOBS_PATH, DIM_COMPANY_PATH, DIM_LOCATION_PATH, FACT_SKILLS_PATH, DIM_SKILLS_PATH,
+    CATEGORICAL_COLUMNS, DROPPED_RESIDENT_COLUMNS,
+    DUCKDB_PATH, GOLD_PARQUET_TABLES, JOBS_SOURCE, LOADER_BATCH_SIZE, DEDUP_NEAR_DUPLICATES
+)
+from deduplication import drop_exact_duplicates, collapse_near_duplicates
+import taxonomy
+
+
+# Requête de chargement poussée dans DuckDB: projection des seules colonnes
+# utiles, jointures avec les dimensions et dédoublonnage côté moteur
+# (partition sur une empreinte 64 bits du texte normalisé). Les compétences
+# extraites par dbt (fact_job_skills) arrivent pré-agrégées en listes de skill_id.
+JOBS_QUERY = """
+WITH job_skills AS (
+    SELECT
+        job_offer_id,
+        LIST(skill_id ORDER BY skill_id) AS skill_ids
+    FROM {fact_job_skills}
+    GROUP BY job_offer_id
+),
+
+jobs AS (
+    SELECT
+        f.job_offer_id,
+        f.job_title AS title,
+        f.job_description AS description,
+        c.company_name AS companyName,
+        f.company_url AS companyUrl,
+        l.city AS location,
+        l.country AS country,
+        f.contract_type AS contractType,
+        f.work_type AS workType,
+        f.job_category AS jobCategory,
+        f.job_url AS jobUrl,
+        f.posted_time AS postedTime,
+        f.published_date AS publishedAt,
+        s.skill_ids
+    FROM {fact_job_offers} f
+    LEFT JOIN {dim_company} c ON f.company_id = c.company_id
+    LEFT JOIN {dim_location} l ON f.location_id = l.location_id
+    LEFT JOIN job_skills s ON f.job_offer_id = s.job_offer_id
+),
+
+deduped AS (
+    SELECT *
+    FROM jobs
+    QUALIFY ROW_NUMBER() OVER (
+        PARTITION BY hash(
+            lower(trim(title)),
+            lower(trim(companyName)),
+            regexp_replace(lower(trim(description)), '\\s+', ' ', 'g')
+        )
+        ORDER BY publishedAt DESC NULLS LAST, job_offer_id
+    ) = 1
+)
+
+SELECT *
+FROM deduped {sample_clause}
+ORDER BY publishedAt DESC NULLS LAST, job_offer_id
+"""
+
+SKILLS_VOCABULARY_QUERY = "SELECT skill_id, skill_name FROM {dim_skills} ORDER BY skill_id"
+
+
+class SkillMatrix:
+    """
+    Stockage compact des compétences par offre (format CSR)
+    
+    Au lieu d'une liste Python par ligne, les identifiants de compétences de
+    toutes les offres sont concaténés dans un seul tableau d'entiers `ids`;
+    les compétences de l'offre i sont `ids[indptr[i]:indptr[i+1]]`.
+    """
+    
+    def __init__(self, vocabulary: Iterable[str], indptr: np.ndarray, ids: np.ndarray):
+        self.vocabulary = np.asarray(list(vocabulary), dtype=object)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        id_dtype = np.int16 if len(self.vocabulary) <= np.iinfo(np.int16).max else np.int32
+        self.ids = np.asarray(ids, dtype=id_dtype)
+    
+    @classmethod
+    def from_lists(cls, skills_lists: Iterable[List[str]], vocabulary: Optional[Iterable[str]] = None) -> 'SkillMatrix':
+        """
+        Construit la matrice depuis une séquence de listes de compétences
+        
+        Args:
+            skills_lists: Une liste de compétences par offre
+            vocabulary: Vocabulaire imposé (sinon déduit des données, trié)
+            
+        Returns:
+            SkillMatrix
+        """
+        skills_lists = list(skills_lists)
+        if vocabulary is None:
+            vocabulary = sorted({skill for skills in skills_lists for skill in skills})
+        vocabulary = list(vocabulary)
+        position = {skill: i for i, skill in enumerate(vocabulary)}
+        
+        indptr = np.zeros(len(skills_lists) + 1, dtype=np.int64)
+        ids = []
+        for i, skills in enumerate(skills_lists):
+            row = [position[skill] for skill in skills if skill in position]
+            ids.extend(row)
+            indptr[i + 1] = indptr[i] + len(row)
+        
+        return cls(vocabulary, indptr, np.asarray(ids, dtype=np.int64))
+    
+    @classmethod
+    def from_id_arrays(cls, id_arrays: Iterable, skill_ids: Iterable[int], skill_names: Iterable[str]) -> 'SkillMatrix':
+        """
+        Construit la matrice depuis les listes de skill_id du warehouse (dim_skills)
+        
+        Args:
+            id_arrays: Un tableau de skill_id par offre (None ou vide: aucune compétence)
+            skill_ids: Identifiants de dim_skills
+            skill_names: Noms correspondants (le vocabulaire, dans cet ordre)
+            
+        Returns:
+            SkillMatrix
+        """
+        skill_ids = np.asarray(list(skill_ids), dtype=np.int64)
+        arrays = [np.empty(0, dtype=np.int64) if a is None else np.asarray(a, dtype=np.int64) for a in id_arrays]
+        lengths = np.fromiter((len(a) for a in arrays), dtype=np.int64, count=len(arrays))
+        ids = np.concatenate(arrays) if arrays else np.empty(0, dtype=np.int64)
+        
+        # skill_id → position dans le vocabulaire (-1: identifiant inconnu, ignoré)
+        lookup = np.full(int(max(skill_ids.max(initial=0), ids.max(initial=0))) + 1, -1, dtype=np.int64)
+        lookup[skill_ids] = np.arange(len(skill_ids))
+        positions = lookup[ids]
+        known = positions >= 0
+        
+        rows = np.repeat(np.arange(len(arrays)), lengths)
+        indptr = np.zeros(len(arrays) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows[known], minlength=len(arrays)), out=indptr[1:])
+        return cls(list(skill_names), indptr, positions[known])
+    
+    def __len__(self) -> int:
+        return len(self.indptr) - 1
+    
+    def __getitem__(self, row: int) -> List[str]:
+        return self.vocabulary[self.get_ids(row)].tolist()
+    
+    def get_ids(self, row: int) -> np.ndarray:
+        """Identifiants de compétences de l'offre `row`"""
+        return self.ids[self.indptr[row]:self.indptr[row + 1]]
+    
+    def counts(self) -> np.ndarray:
+        """Nombre de compétences par offre"""
+        return np.diff(self.indptr)
+    
+    def most_common(self, top_n: int = 10) -> List[tuple]:
+        """Retourne les N compétences les plus fréquentes (nom, nombre d'offres)"""
+        counts = np.bincount(self.ids, minlength=len(self.vocabulary))
+        order = np.argsort(-counts, kind='stable')[:top_n]
+        return [(self.vocabulary[i], int(counts[i])) for i in order if counts[i] > 0]
+    
+    def take(self, rows: Iterable[int]) -> 'SkillMatrix':
+        """Sous-matrice restreinte aux lignes données (dans l'ordre donné)"""
+        rows = np.asarray(list(rows), dtype=np.int64)
+        lengths = self.indptr[rows + 1] - self.indptr[rows]
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+        ids = np.concatenate([self.get_ids(r) for r in rows]) if len(rows) else np.empty(0, dtype=self.ids.dtype)
+        return SkillMatrix(self.vocabulary, indptr, ids)
+    
+    def memory_usage(self) -> int:
+        """Taille en octets (tableaux + vocabulaire)"""
+        vocabulary_bytes = sum(len(skill.encode('utf-8')) + 49 for skill in self.vocabulary)
+        return int(self.indptr.nbytes + self.ids.nbytes + self.vocabulary.nbytes + vocabulary_bytes)
+    
+    def save(self, path) -> None:
+        """Sauvegarde la matrice au format .npz"""
+        np.savez(path, vocabulary=self.vocabulary.astype(str), indptr=self.indptr, ids=self.ids)
+    
+    @classmethod
+    def load(cls, path) -> 'SkillMatrix':
+        """Charge une matrice sauvegardée avec save()"""
+        data = np.load(path, allow_pickle=False)
+        return cls(data['vocabulary'].tolist(), data['indptr'], data['ids'])
 
 
 class JobDataPreprocessor:
     """Préprocesseur pour les offres d'emploi"""
     
     def __init__(self):
-        self.data_skills = set([skill.lower() for skill in DATA_SKILLS])
         self.experience_keywords = EXPERIENCE_LEVELS
+        # Vocabulaire dim_skills (skill_id, skill_name) de la dernière source chargée
+        self.skill_vocabulary: Tuple[List[int], List[str]] = ([], [])
     
-    def load_jobs(self) -> pd.DataFrame:
+    def load_jobs(self, source: str = JOBS_SOURCE, gold_dir: Optional[Path] = None) -> pd.DataFrame:
         """
         Charge et joint les offres d'emploi depuis la couche Gold dbt
         
+        Args:
+            source: 'auto', 'duckdb', 'parquet' ou 'csv'
+            gold_dir: Dossier d'exports Gold alternatif (défaut: config.GOLD_DIR)
+            
         Returns:
             DataFrame avec les offres jointes et nettoyées
         """
+        batches = list(self.iter_job_batches(source=source, gold_dir=gold_dir))
+        if len(batches) == 1:
+            return batches[0]
+        return pd.concat(batches, ignore_index=True)
+    
+    def resolve_source(self, source: str = JOBS_SOURCE, gold_dir: Optional[Path] = None) -> str:
+        """
+        Détermine la source effective des offres
+        
+        En mode 'auto': base DuckDB de dbt si présente, sinon exports Parquet,
+        sinon exports CSV. Avec un dossier Gold explicite, la base DuckDB est ignorée.
+        """
+        if source != 'auto':
+            return source
+        if gold_dir is None and DUCKDB_PATH.exists():
+            return 'duckdb'
+        if all(self._parquet_exists(path) for path in self._gold_paths(gold_dir, '.parquet').values()):
+            return 'parquet'
+        return 'csv'
+    
+    @staticmethod
+    def _gold_paths(gold_dir: Optional[Path], suffix: str) -> Dict[str, Path]:
+        """Chemins des exports Gold (fact + dimensions) pour une extension donnée"""
+        if gold_dir is None:
+            if suffix == '.parquet':
+                return dict(GOLD_PARQUET_TABLES)
+            return {
+                'fact_job_offers': FACT_JOBS_PATH,
+                'dim_company': DIM_COMPANY_PATH,
+                'dim_location': DIM_LOCATION_PATH,
+                'fact_job_skills': FACT_SKILLS_PATH,
+                'dim_skills': DIM_SKILLS_PATH,
+            }
+        return {name: Path(gold_dir) / f"{name}{suffix}" for name in GOLD_PARQUET_TABLES}
+    
+    def iter_job_batches(
+        self,
+        source: str = JOBS_SOURCE,
+        batch_size: int = LOADER_BATCH_SIZE,
+        sample_size: Optional[int] = None,
+        gold_dir: Optional[Path] = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Charge les offres par lots depuis la couche Gold
+        
+        Avec DuckDB ou Parquet, la jointure, la projection et le dédoublonnage
+        sont exécutés par DuckDB et le résultat est lu en record batches Arrow:
+        la mémoire de pointe ne dépend plus du parsing des CSV complets.
+        
+        Args:
+            source: 'auto', 'duckdb', 'parquet' ou 'csv'
+            batch_size: Nombre de lignes par lot
+            sample_size: Si spécifié, échantillon aléatoire reproductible
+            gold_dir: Dossier d'exports Gold alternatif (défaut: config.GOLD_DIR)
+            
+        Yields:
+            DataFrames d'offres (mêmes colonnes que load_jobs)
+        """
+        source = self.resolve_source(source, gold_dir)
+        
+        if source == 'csv':
+            df = self._load_jobs_csv(gold_dir)
+            if sample_size and sample_size < len(df):
+                df = df.sample(n=sample_size, random_state=42).reset_index(drop=True)
+            yield df
+            return
+        
+        import duckdb
+        
+        if source == 'duckdb':
+            print(f"Chargement de la couche Gold depuis DuckDB ({DUCKDB_PATH.name})...")
+            conn = duckdb.connect(str(DUCKDB_PATH), read_only=True)
+            tables = {name: f"gold.{name}" for name in GOLD_PARQUET_TABLES}
+        elif source == 'parquet':
+            print("Chargement de la couche Gold depuis les exports Parquet...")
+            conn = duckdb.connect()
+            tables = {
+                name: self._parquet_relation(path)
+                for name, path in self._gold_paths(gold_dir, '.parquet').items()
+            }
+        else:
+            raise ValueError(f"Source non supportée: {source}")
+        
+        sample_clause = ''
+        if sample_size:
+            sample_clause = f"USING SAMPLE reservoir({int(sample_size)} ROWS) REPEATABLE (42)"
+        
+        query = JOBS_QUERY.format(sample_clause=sample_clause, **tables)
+        
+        try:
+            self._set_skill_vocabulary(conn.execute(SKILLS_VOCABULARY_QUERY.format(**tables)).fetchall())
+            reader = conn.execute(query).fetch_record_batch(batch_size)
+            total = 0
+            for batch in reader:
+                total += batch.num_rows
+                yield batch.to_pandas()
+            print(f"Chargé {total:,} offres d'emploi uniques depuis la couche Gold")
+        finally:
+            conn.close()
+    
+    def _set_skill_vocabulary(self, rows: Iterable[Tuple[int, str]]):
+        rows = list(rows)
+        self.skill_vocabulary = ([int(skill_id) for skill_id, _ in rows], [name for _, name in rows])
+    
+    @staticmethod
+    def _parquet_exists(path: Path) -> bool:
+        """Un export Parquet est un fichier unique ou un dossier partitionné"""
+        return path.exists() or path.with_suffix('').is_dir()
+    
+    @staticmethod
+    def _parquet_relation(path: Path) -> str:
+        """Expression DuckDB lisant un export Parquet (fichier ou dossier partitionné)"""
+        partitioned_dir = path.with_suffix('')
+        if not path.exists() and partitioned_dir.is_dir():
+            glob = (partitioned_dir / '**' / '*.parquet').as_posix()
+            return f"read_parquet('{glob}', hive_partitioning = true)"
+        return f"read_parquet('{path.as_posix()}')"
+    
+    def _load_jobs_csv(self, gold_dir: Optional[Path] = None) -> pd.DataFrame:
+        """Chargement historique depuis les exports CSV (jointures en pandas)"""
         print(f"Chargement de la couche Gold...")
         
         # Charger les tables
-        fact_jobs = pd.read_csv(FACT_JOBS_PATH)
-        dim_company = pd.read_csv(DIM_COMPANY_PATH)
-        dim_location = pd.read_csv(DIM_LOCATION_PATH)
+        paths = self._gold_paths(gold_dir, '.csv')
+        fact_jobs = pd.read_csv(paths['fact_job_offers'])
+        dim_company = pd.read_csv(paths['dim_company'])
+        dim_location = pd.read_csv(paths['dim_location'])
+        fact_skills = pd.read_csv(paths['fact_job_skills'], usecols=['job_offer_id', 'skill_id'])
+        dim_skills = pd.read_csv(paths['dim_skills'], usecols=['skill_id', 'skill_name']).sort_values('skill_id')
+        self._set_skill_vocabulary(dim_skills.itertuples(index=False))
         
         # Jointures avec suffixes pour éviter les collisions de colonnes
         print("Fusion des tables (Facts + Dimensions)...")
@@ -35,6 +343,9 @@ class JobDataPreprocessor:
         df = fact_jobs.merge(dim_company[['company_id', 'company_name']], on='company_id', how='left', suffixes=('', '_company'))
         # On prend city et country de dim_location si besoin
         df = df.merge(dim_location[['location_id', 'city', 'country']], on='location_id', how='left', suffixes=('', '_location'))
+        # Compétences extraites par dbt, une liste de skill_id par offre
+        skill_ids = fact_skills.sort_values('skill_id').groupby('job_offer_id')['skill_id'].agg(list)
+        df['skill_ids'] = [skill_ids.get(job_offer_id) for job_offer_id in df['job_offer_id']]
         
         # Nettoyage des noms de colonnes
         df.columns = [c.strip() for c in df.columns]
@@ -71,8 +382,9 @@ class JobDataPreprocessor:
                 df[new_col] = df[old_col]
         
         # Supprimer les doublons de contenu (même titre, entreprise et description)
+        # en comparant des empreintes 64 bits plutôt que les descriptions complètes
         initial_count = len(df)
-        df = df.drop_duplicates(subset=['title', 'companyName', 'description'])
+        df = drop_exact_duplicates(df, ['title', 'companyName', 'description'])
         dupes_removed = initial_count - len(df)
         
         if dupes_removed > 0:
@@ -119,35 +431,20 @@ class JobDataPreprocessor:
     
     def extract_skills(self, text: str) -> List[str]:
         """
-        Extrait les compétences techniques d'un texte
+        Extrait les compétences techniques d'un texte (CV, profil candidat)
+        
+        Même taxonomie et même regex que int_skills_extraction (seed
+        skills_patterns): les offres, elles, portent déjà leurs compétences.
         
         Args:
-            text: Texte (description de poste ou CV)
+            text: Texte libre
             
         Returns:
             Liste des compétences trouvées
         """
         if pd.isna(text):
             return []
-        
-        text_lower = text.lower()
-        found_skills = set()
-        
-        # 1. Recherche des compétences canoniques du dictionnaire
-        for skill in DATA_SKILLS:
-            # Utiliser word boundaries pour éviter les faux positifs
-            # On cherche de manière insensible à la casse
-            pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-            if re.search(pattern, text_lower):
-                found_skills.add(skill)
-        
-        # 2. Gestion des alias (ex: T-SQL -> SQL, M365 -> Office 365)
-        for alias, canonical in SKILL_ALIASES.items():
-            pattern = r'\b' + re.escape(alias.lower()) + r'\b'
-            if re.search(pattern, text_lower):
-                found_skills.add(canonical)
-        
-        return sorted(list(found_skills))
+        return taxonomy.extract_skills(str(text))
     
     def extract_experience_level(self, text: str) -> str:
         """
@@ -219,23 +516,25 @@ class JobDataPreprocessor:
         
         return combined
     
-    def preprocess_jobs_df(self, df: pd.DataFrame, sample_size: int = None) -> pd.DataFrame:
+    def preprocess_jobs_df(self, df: pd.DataFrame, sample_size: int = None, verbose: bool = True) -> pd.DataFrame:
         """
         Préprocesse tout le DataFrame d'offres
         
         Args:
             df: DataFrame brut
             sample_size: Si spécifié, prendre seulement un échantillon (pour tests)
+            verbose: Afficher la progression
             
         Returns:
             DataFrame préprocessé avec colonnes additionnelles
         """
-        print("🔄 Préprocessing des offres d'emploi...")
+        log = print if verbose else (lambda *args, **kwargs: None)
+        log("🔄 Préprocessing des offres d'emploi...")
         
         # Prendre un échantillon si demandé
         if sample_size and sample_size < len(df):
             df = df.sample(n=sample_size, random_state=42).reset_index(drop=True)
-            print(f"  → Échantillon de {sample_size} offres")
+            log(f"  → Échantillon de {sample_size} offres")
         
         # Créer une copie
         df_processed = df.copy()
@@ -245,16 +544,14 @@ class JobDataPreprocessor:
         df_processed['description_clean'] = df_processed['description'].apply(self.clean_text)
         
         # Créer le texte combiné pour l'embedding
-        print("  → Création des textes combinés...")
+        log("  → Création des textes combinés...")
         df_processed['combined_text'] = df_processed.apply(self.create_job_text, axis=1)
         
-        # Extraire les compétences
-        print("  → Extraction des compétences...")
-        df_processed['skills'] = df_processed['description_clean'].apply(self.extract_skills)
-        df_processed['num_skills'] = df_processed['skills'].apply(len)
+        # Compétences: déjà extraites par dbt (fact_job_skills), listes de skill_id
+        df_processed['num_skills'] = df_processed['skill_ids'].apply(lambda ids: 0 if ids is None else len(ids))
         
         # Extraire le niveau d'expérience
-        print("  → Extraction du niveau d'expérience...")
+        log("  → Extraction du niveau d'expérience...")
         df_processed['experience_level'] = df_processed['description_clean'].apply(
             self.extract_experience_level
         )
@@ -275,17 +572,99 @@ class JobDataPreprocessor:
         # Supprimer les lignes avec texte vide
         df_processed = df_processed[df_processed['combined_text'].str.len() > 50].reset_index(drop=True)
         
-        print(f"Préprocessing terminé: {len(df_processed):,} offres valides")
-        print(f"DEBUG FINAL: Colonnes finales: {df_processed.columns.tolist()}")
+        log(f"Préprocessing terminé: {len(df_processed):,} offres valides")
+        log(f"DEBUG FINAL: Colonnes finales: {df_processed.columns.tolist()}")
         
         return df_processed
     
-    def get_statistics(self, df: pd.DataFrame) -> Dict:
+    def preprocess_batches(self, batches: Iterable[pd.DataFrame]) -> pd.DataFrame:
+        """
+        Préprocesse un flux de lots (voir iter_job_batches) au fil de l'eau
+        
+        Args:
+            batches: Itérable de DataFrames bruts
+            
+        Returns:
+            DataFrame préprocessé concaténé
+        """
+        print("🔄 Préprocessing des offres d'emploi (par lots)...")
+        processed = []
+        total = 0
+        for i, batch in enumerate(batches, 1):
+            processed.append(self.preprocess_jobs_df(batch, verbose=False))
+            total += len(batch)
+            print(f"  → Lot {i}: {total:,} offres traitées")
+        
+        if not processed:
+            raise ValueError("Aucune offre chargée depuis la couche Gold")
+        
+        df_processed = pd.concat(processed, ignore_index=True)
+        print(f"Préprocessing terminé: {len(df_processed):,} offres valides")
+        return df_processed
+    
+    def collapse_near_duplicates(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Regroupe les offres quasi identiques (republications) avant l'embedding
+
+        Seules les offres d'une même entreprise et localisation sont regroupées.
+        
+        Args:
+            df: DataFrame préprocessé
+            
+        Returns:
+            DataFrame avec une offre par groupe et la colonne `duplicate_count`
+        """
+        if not DEDUP_NEAR_DUPLICATES:
+            return df.assign(duplicate_count=1)
+        
+        print("  → Détection des quasi-doublons (MinHash/LSH)...")
+        initial_count = len(df)
+        df = collapse_near_duplicates(
+            df, ['title_clean', 'description_clean'], group_columns=['companyName', 'location_clean']
+        )
+        print(f"  → {initial_count - len(df):,} quasi-doublons regroupés")
+        return df
+    
+    def compact_jobs_df(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, SkillMatrix]:
+        """
+        Réduit l'empreinte mémoire du DataFrame préprocessé
+        
+        À appeler une fois les embeddings calculés: les textes dupliqués
+        (description brute, texte combiné) sont supprimés, les colonnes à
+        faible cardinalité passent en dtype 'category' et les listes de
+        compétences sont remplacées par une SkillMatrix (CSR).
+        
+        Args:
+            df: DataFrame issu de preprocess_jobs_df
+            
+        Returns:
+            Tuple (DataFrame compact, SkillMatrix alignée sur ses lignes)
+        """
+        job_skills = self.skill_matrix(df)
+        
+        df_compact = df.drop(columns=DROPPED_RESIDENT_COLUMNS, errors='ignore')
+        
+        for col in CATEGORICAL_COLUMNS:
+            if col in df_compact.columns:
+                df_compact[col] = df_compact[col].astype('category')
+        
+        for col in ['num_skills', 'years_experience', 'duplicate_count']:
+            if col in df_compact.columns:
+                df_compact[col] = pd.to_numeric(df_compact[col], downcast='integer')
+        
+        return df_compact.reset_index(drop=True), job_skills
+    
+    def skill_matrix(self, df: pd.DataFrame) -> SkillMatrix:
+        """SkillMatrix des offres de df (colonne skill_ids, vocabulaire dim_skills)"""
+        return SkillMatrix.from_id_arrays(df['skill_ids'], *self.skill_vocabulary)
+    
+    def get_statistics(self, df: pd.DataFrame, job_skills: Optional[SkillMatrix] = None) -> Dict:
         """
         Calcule des statistiques sur les offres
         
         Args:
             df: DataFrame préprocessé
+            job_skills: Compétences au format CSR (si le DataFrame est compacté)
             
         Returns:
             Dictionnaire de statistiques
@@ -295,23 +674,19 @@ class JobDataPreprocessor:
             'unique_companies': df['companyName'].nunique(),
             'unique_locations': df['location_clean'].nunique(),
             'unique_contract_types': df['contractType_clean'].nunique(),
-            'avg_skills_per_job': df['num_skills'].mean(),
-            'top_10_skills': self._get_top_skills(df, 10),
+            'avg_skills_per_job': float(df['num_skills'].mean()),
+            'top_10_skills': self._get_top_skills(df, 10, job_skills),
             'experience_level_distribution': df['experience_level'].value_counts().to_dict(),
         }
         
         return stats
     
-    def _get_top_skills(self, df: pd.DataFrame, top_n: int = 10) -> List[tuple]:
+    def _get_top_skills(self, df: pd.DataFrame, top_n: int = 10,
+                        job_skills: Optional[SkillMatrix] = None) -> List[tuple]:
         """Retourne les N compétences les plus demandées"""
-        all_skills = []
-        for skills_list in df['skills']:
-            all_skills.extend(skills_list)
-        
-        from collections import Counter
-        skill_counts = Counter(all_skills)
-        
-        return skill_counts.most_common(top_n)
+        if job_skills is None:
+            job_skills = self.skill_matrix(df)
+        return job_skills.most_common(top_n)
 
 
 def normalize_location(location: str) -> str:
@@ -0,0 +1,241 @@
+"""
+Module de dédoublonnage des offres d'emploi
+
+- Doublons exacts: empreinte 64 bits du texte normalisé (titre, entreprise, description),
+  avec la même normalisation que la couche Silver dbt (minuscules, trim, espaces)
+- Quasi-doublons (offres republiées avec un texte légèrement modifié): MinHash + LSH,
+  au sein d'une même entreprise et localisation (un modèle d'annonce partagé par
+  plusieurs entreprises ou villes reste autant d'offres distinctes)
+"""
+import hashlib
+import re
+import zlib
+from typing import Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from config import NEAR_DUPLICATE_THRESHOLD, MINHASH_NUM_PERM, MINHASH_BANDS, SHINGLE_SIZE
+
+# Plus grand nombre premier < 2^32 - utilisé pour les permutations universelles de MinHash
+# (a * x + b reste inférieur à 2^64 pour a, b, x < 2^32: pas de dépassement en uint64)
+_MERSENNE_PRIME = np.uint64((1 << 32) - 5)
+
+
+def normalize_text(text) -> str:
+    """
+    Normalise un texte pour le calcul d'empreintes
+
+    Args:
+        text: Texte brut
+
+    Returns:
+        Texte en minuscules, sans ponctuation ni espaces multiples
+    """
+    if text is None or (isinstance(text, float) and np.isnan(text)):
+        return ""
+    text = re.sub(r'[^\w\s]', ' ', str(text).lower())
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def normalize_key(text) -> str:
+    """
+    Normalise un champ pour la détection des doublons exacts
+
+    Même règle que la couche Silver dbt (LOWER/TRIM, espaces multiples réduits):
+    la ponctuation est conservée, "C++" et "C" restent distincts.
+
+    Args:
+        text: Texte brut
+
+    Returns:
+        Texte en minuscules, sans espaces multiples ni en bordure
+    """
+    if text is None or (isinstance(text, float) and np.isnan(text)):
+        return ""
+    return re.sub(r'\s+', ' ', str(text).lower()).strip()
+
+
+def fingerprint64(text: str) -> int:
+    """Empreinte 64 bits (BLAKE2b) d'un texte déjà normalisé (normalize_key)"""
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def exact_fingerprints(df: pd.DataFrame, columns: Sequence[str]) -> np.ndarray:
+    """
+    Calcule une empreinte 64 bits par ligne sur les colonnes données
+
+    Args:
+        df: DataFrame d'offres
+        columns: Colonnes entrant dans l'empreinte
+
+    Returns:
+        Tableau uint64 (une empreinte par ligne)
+    """
+    values = zip(*(df[col].tolist() for col in columns))
+    return np.fromiter(
+        (fingerprint64('\x1f'.join(normalize_key(v) for v in row)) for row in values),
+        dtype=np.uint64,
+        count=len(df)
+    )
+
+
+def drop_exact_duplicates(df: pd.DataFrame, columns: Sequence[str]) -> pd.DataFrame:
+    """
+    Supprime les doublons exacts en comparant des empreintes 64 bits
+    plutôt que les chaînes complètes (première occurrence conservée)
+    """
+    fingerprints = exact_fingerprints(df, columns)
+    _, first_idx = np.unique(fingerprints, return_index=True)
+    keep = np.zeros(len(df), dtype=bool)
+    keep[first_idx] = True
+    return df[keep]
+
+
+class MinHashLSH:
+    """
+    Détection de quasi-doublons par MinHash et Locality Sensitive Hashing
+
+    Chaque texte est découpé en shingles de mots, résumé par une signature
+    MinHash de `num_perm` valeurs, puis découpé en `bands` bandes: deux textes
+    du même groupe partageant une bande sont candidats. Un candidat rejoint un
+    groupe si sa similarité de Jaccard estimée avec le représentant du groupe
+    dépasse le seuil (pas de chaînage transitif A~B~C sans A~C).
+    """
+
+    def __init__(
+        self,
+        num_perm: int = MINHASH_NUM_PERM,
+        bands: int = MINHASH_BANDS,
+        shingle_size: int = SHINGLE_SIZE,
+        seed: int = 42
+    ):
+        if num_perm % bands != 0:
+            raise ValueError(f"num_perm ({num_perm}) doit être un multiple de bands ({bands})")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        self.shingle_size = shingle_size
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+    def _shingles(self, text: str) -> np.ndarray:
+        """Hash 32 bits des shingles de mots d'un texte normalisé"""
+        words = text.split()
+        if len(words) <= self.shingle_size:
+            grams = [' '.join(words)]
+        else:
+            grams = [' '.join(words[i:i + self.shingle_size]) for i in range(len(words) - self.shingle_size + 1)]
+        return np.fromiter((zlib.crc32(g.encode('utf-8')) for g in set(grams)), dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        """
+        Signature MinHash d'un texte
+
+        Args:
+            text: Texte (normalisé ou non)
+
+        Returns:
+            Tableau uint32 de taille num_perm
+        """
+        shingles = self._shingles(normalize_text(text))
+        hashed = (self._a[:, None] * shingles[None, :] + self._b[:, None]) % _MERSENNE_PRIME
+        return hashed.min(axis=1).astype(np.uint32)
+
+    def signatures(self, texts: Iterable[str]) -> np.ndarray:
+        """Signatures MinHash d'une séquence de textes (matrice n x num_perm)"""
+        texts = list(texts)
+        sigs = np.empty((len(texts), self.num_perm), dtype=np.uint32)
+        for i, text in enumerate(texts):
+            sigs[i] = self.signature(text)
+        return sigs
+
+    def cluster(
+        self,
+        signatures: np.ndarray,
+        threshold: float = NEAR_DUPLICATE_THRESHOLD,
+        groups: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Regroupe les quasi-doublons
+
+        Args:
+            signatures: Matrice de signatures (n x num_perm)
+            threshold: Similarité de Jaccard estimée minimale avec le représentant
+            groups: Identifiant entier de groupe par ligne (entreprise, localisation);
+                seules les lignes d'un même groupe peuvent être regroupées
+
+        Returns:
+            Tableau d'étiquettes: pour chaque ligne, l'indice du représentant
+            de son groupe (la plus petite ligne du groupe)
+        """
+        n = len(signatures)
+        labels = np.arange(n)
+        members = np.ones(n, dtype=np.int64)
+        groups = np.zeros(n, dtype=np.uint32) if groups is None else np.asarray(groups, dtype=np.uint32)
+
+        for band in range(self.bands):
+            start = band * self.rows_per_band
+            # Le groupe fait partie de la clé du bucket: pas de candidat entre groupes
+            band_rows = np.ascontiguousarray(
+                np.column_stack([groups, signatures[:, start:start + self.rows_per_band]])
+            )
+            keys = band_rows.view(np.dtype((np.void, band_rows.dtype.itemsize * band_rows.shape[1]))).ravel()
+            _, first_idx, inverse = np.unique(keys, return_index=True, return_inverse=True)
+            bucket_head = first_idx[inverse.ravel()]
+
+            # Une ligne déjà placée ou représentante d'autres lignes ne bouge plus
+            candidates = np.nonzero((bucket_head != np.arange(n)) & (labels == np.arange(n)) & (members == 1))[0]
+            if len(candidates) == 0:
+                continue
+
+            representatives = labels[bucket_head[candidates]]
+            agreement = (signatures[candidates] == signatures[representatives]).mean(axis=1)
+            for i, representative in zip(candidates[agreement >= threshold], representatives[agreement >= threshold]):
+                labels[i] = representative
+                members[representative] += 1
+
+        return labels
+
+
+def collapse_near_duplicates(
+    df: pd.DataFrame,
+    text_columns: List[str],
+    group_columns: Sequence[str] = (),
+    threshold: float = NEAR_DUPLICATE_THRESHOLD
+) -> pd.DataFrame:
+    """
+    Ne conserve qu'une offre par groupe de quasi-doublons
+
+    Le représentant conservé est la première ligne du groupe; la colonne
+    `duplicate_count` indique combien d'offres il représente.
+
+    Args:
+        df: DataFrame d'offres
+        text_columns: Colonnes concaténées pour le calcul des signatures
+        group_columns: Colonnes qui doivent être identiques (après normalize_key)
+            pour que deux offres soient regroupées, ex. entreprise et localisation
+        threshold: Similarité de Jaccard estimée minimale
+
+    Returns:
+        DataFrame dédoublonné (index réinitialisé)
+    """
+    if df.empty:
+        return df.assign(duplicate_count=np.ones(0, dtype=np.int32))
+
+    texts = df[text_columns].fillna('').astype(str).agg(' '.join, axis=1)
+    groups = None
+    if group_columns:
+        group_keys = ['\x1f'.join(normalize_key(v) for v in row)
+                      for row in zip(*(df[col].tolist() for col in group_columns))]
+        groups = pd.factorize(pd.Series(group_keys))[0]
+    lsh = MinHashLSH()
+    labels = lsh.cluster(lsh.signatures(texts), threshold, groups)
+
+    representatives, counts = np.unique(labels, return_counts=True)
+    df_unique = df.iloc[representatives].copy()
+    df_unique['duplicate_count'] = counts.astype(np.int32)
+    return df_unique.reset_index(drop=True)
@@ -0,0 +1,200 @@
+"""
+Construction parallèle et reprenable des embeddings des offres
+
+Le corpus est découpé en shards encodés par plusieurs processus; chaque shard
+est écrit sur disque dès qu'il est terminé, si bien qu'une construction
+interrompue reprend au dernier shard complété au lieu de repartir de zéro.
+"""
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+from config import (
+    EMBEDDING_MODEL_NAME, EMBEDDING_SHARDS_DIR, EMBEDDING_SHARD_SIZE,
+    EMBEDDING_BATCH_SIZE, EMBEDDING_WORKERS
+)
+
+# Modèle chargé une seule fois par processus worker
+_worker_model = None
+_worker_batch_size = EMBEDDING_BATCH_SIZE
+
+
+def _init_worker(model_name: str, num_threads: int, batch_size: int):
+    """Initialise un worker: limite les threads BLAS/torch puis charge le modèle"""
+    global _worker_model, _worker_batch_size
+
+    for var in ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS'):
+        os.environ[var] = str(num_threads)
+
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    torch.set_num_threads(num_threads)
+    _worker_model = SentenceTransformer(model_name)
+    _worker_batch_size = batch_size
+
+
+def encode_texts(model, texts: List[str], batch_size: int) -> np.ndarray:
+    """
+    Encode des textes en float32
+
+    SentenceTransformer.encode trie déjà les textes par longueur (moins de
+    padding) et restitue l'ordre d'origine: aucun tri n'est fait ici.
+
+    Args:
+        model: Modèle exposant encode() (SentenceTransformer)
+        texts: Textes à encoder
+        batch_size: Taille de batch
+
+    Returns:
+        Embeddings (float32) dans l'ordre des textes
+    """
+    encoded = model.encode(
+        texts,
+        batch_size=batch_size,
+        show_progress_bar=False,
+        convert_to_numpy=True
+    )
+    return np.asarray(encoded, dtype=np.float32)
+
+
+def _save_atomic(path: Path, array: np.ndarray):
+    """Écrit un .npy via un fichier temporaire pour ne jamais laisser de shard partiel"""
+    tmp_path = path.with_name(path.stem + '.tmp.npy')
+    np.save(tmp_path, array)
+    os.replace(tmp_path, path)
+
+
+def _encode_shard(shard_id: int, texts: List[str], out_path: str) -> int:
+    """Tâche worker: encode un shard et l'écrit sur disque"""
+    _save_atomic(Path(out_path), encode_texts(_worker_model, texts, _worker_batch_size))
+    return shard_id
+
+
+class ShardedEmbeddingBuilder:
+    """
+    Encodeur de corpus par shards, multi-processus et reprenable
+
+    Les shards sont rangés dans un dossier identifié par l'empreinte du corpus
+    (modèle, taille de shard, textes): relancer la construction sur le même
+    corpus réutilise les shards déjà écrits.
+    """
+
+    def __init__(
+        self,
+        model_name: str = EMBEDDING_MODEL_NAME,
+        shards_dir: Path = EMBEDDING_SHARDS_DIR,
+        shard_size: int = EMBEDDING_SHARD_SIZE,
+        workers: int = EMBEDDING_WORKERS,
+        batch_size: int = EMBEDDING_BATCH_SIZE,
+        threads_per_worker: Optional[int] = None,
+        model=None
+    ):
+        """
+        Args:
+            model_name: Nom du modèle SentenceTransformer (chargé par chaque worker)
+            shards_dir: Dossier racine des shards
+            shard_size: Nombre de textes par shard
+            workers: Nombre de processus d'encodage (1 = dans le processus courant)
+            batch_size: Taille de batch d'encodage
+            threads_per_worker: Threads torch par worker (défaut: CPUs / workers)
+            model: Modèle déjà chargé, utilisé quand workers == 1
+        """
+        self.model_name = model_name
+        self.shards_dir = Path(shards_dir)
+        self.shard_size = shard_size
+        self.workers = max(1, workers)
+        self.batch_size = batch_size
+        self.threads_per_worker = threads_per_worker or max(1, (os.cpu_count() or 1) // self.workers)
+        self.model = model
+
+    def _corpus_fingerprint(self, texts: List[str]) -> str:
+        """Empreinte identifiant le corpus et les paramètres d'encodage"""
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(f"{self.model_name}|{self.shard_size}|{len(texts)}".encode('utf-8'))
+        for text in texts:
+            hasher.update(text.encode('utf-8'))
+            hasher.update(b'\x1f')
+        return hasher.hexdigest()
+
+    def build(self, texts: List[str], keep_shards: bool = False) -> np.ndarray:
+        """
+        Encode tout le corpus, en reprenant les shards déjà calculés
+
+        Args:
+            texts: Textes à encoder
+            keep_shards: Conserver les shards une fois la matrice assemblée
+
+        Returns:
+            Matrice d'embeddings (len(texts) x dimension), float32
+        """
+        fingerprint = self._corpus_fingerprint(texts)
+        run_dir = self.shards_dir / fingerprint
+        run_dir.mkdir(parents=True, exist_ok=True)
+
+        n_shards = (len(texts) + self.shard_size - 1) // self.shard_size
+        shard_paths = [run_dir / f"shard_{i:05d}.npy" for i in range(n_shards)]
+        pending = [i for i, path in enumerate(shard_paths) if not path.exists()]
+
+        manifest_path = run_dir / "manifest.json"
+        manifest = {
+            'model_name': self.model_name,
+            'num_texts': len(texts),
+            'shard_size': self.shard_size,
+            'num_shards': n_shards,
+        }
+        manifest_path.write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+
+        done = n_shards - len(pending)
+        if done:
+            print(f"  → Reprise: {done}/{n_shards} shards déjà encodés")
+
+        def shard_texts(i: int) -> List[str]:
+            return texts[i * self.shard_size:(i + 1) * self.shard_size]
+
+        if pending and self.workers == 1:
+            if self.model is None:
+                from sentence_transformers import SentenceTransformer
+                self.model = SentenceTransformer(self.model_name)
+            for i in pending:
+                _save_atomic(shard_paths[i], encode_texts(self.model, shard_texts(i), self.batch_size))
+                done += 1
+                print(f"  → Shard {i + 1}/{n_shards} encodé ({done}/{n_shards})")
+
+        elif pending:
+            print(f"  → Encodage sur {self.workers} processus "
+                  f"({self.threads_per_worker} threads chacun, {len(pending)} shards)")
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(self.model_name, self.threads_per_worker, self.batch_size)
+            ) as executor:
+                futures = [
+                    executor.submit(_encode_shard, i, shard_texts(i), str(shard_paths[i]))
+                    for i in pending
+                ]
+                for future in as_completed(futures):
+                    i = future.result()
+                    done += 1
+                    print(f"  → Shard {i + 1}/{n_shards} encodé ({done}/{n_shards})")
+
+        embeddings = np.concatenate([np.load(path) for path in shard_paths]) if shard_paths else np.empty((0, 0), np.float32)
+
+        if not keep_shards:
+            for path in shard_paths:
+                path.unlink(missing_ok=True)
+            manifest_path.unlink(missing_ok=True)
+            try:
+                run_dir.rmdir()
+            except OSError:
+                pass
+
+        return embeddings
+
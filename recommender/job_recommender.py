@@ -2,9 +2,13 @@
 Système de recommandation d'offres d'emploi basé sur Sentence-BERT et FAISS
 """
 import os
+import json
 import pickle
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Optional, Union
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple, Union
 import numpy as np
 import pandas as pd
 from sentence_transformers import SentenceTransformer
@@ -13,12 +17,60 @@ import faiss
 from tqdm import tqdm
 
 from config import (
-    EMBEDDING_MODEL_NAME, EMBEDDING_DIMENSION,
-    EMBEDDINGS_PATH, JOBS_PROCESSED_PATH, FAISS_INDEX_PATH,
-    SCORING_WEIGHTS, DEFAULT_TOP_K, MAX_TOP_K
+    EMBEDDING_MODEL_NAME,
+    EMBEDDINGS_PATH, JOBS_PROCESSED_PATH, FAISS_INDEX_PATH, JOB_SKILLS_PATH, INDEX_META_PATH,
+    SCORING_WEIGHTS, DEFAULT_TOP_K, MAX_TOP_K, EMBEDDING_WORKERS,
+    FAISS_INDEX_TYPE, FAISS_IVF_NPROBE, FAISS_HNSW_M, FAISS_HNSW_EF_SEARCH,
+    CACHE_DIR, CV_CACHE_MEMORY_ITEMS, CV_CACHE_DISK_MAX_MB,
+    CANDIDATE_CACHE_MEMORY_ITEMS, CANDIDATE_CACHE_DISK_MAX_MB,
+    EMBEDDING_BATCH_SIZE, BULK_PARSE_THREADS, BULK_ENCODE_BATCH_SIZE
 )
-from data_preprocessing import JobDataPreprocessor, normalize_location
+from embedding_builder import ShardedEmbeddingBuilder
+from data_preprocessing import JobDataPreprocessor, SkillMatrix, normalize_location
+from taxonomy import SKILLS_VERSION
 from cv_parser import CVParser
+from cv_cache import ContentCache, content_key
+from timing import StageTimer, timing_stats
+from metrics import ENCODE_BATCH_SIZE, FAISS_SEARCH_LATENCY
+
+
+def build_faiss_index(embeddings: np.ndarray, index_type: str = FAISS_INDEX_TYPE) -> faiss.Index:
+    """
+    Construit un index FAISS (produit scalaire) sur des embeddings normalisés
+    
+    Args:
+        embeddings: Matrice float32 normalisée L2
+        index_type: 'flat' (exact), 'ivf' (IVFFlat) ou 'hnsw'
+        
+    Returns:
+        Index FAISS rempli et configuré pour la recherche
+    """
+    n_vectors, dimension = embeddings.shape
+    
+    if index_type == 'flat':
+        index = faiss.IndexFlatIP(dimension)
+    elif index_type == 'ivf':
+        # ~4*sqrt(N) listes, au moins 39 points d'entraînement par liste
+        nlist = max(1, min(int(4 * np.sqrt(n_vectors)), n_vectors // 39))
+        quantizer = faiss.IndexFlatIP(dimension)
+        index = faiss.IndexIVFFlat(quantizer, dimension, nlist, faiss.METRIC_INNER_PRODUCT)
+        index.train(embeddings)
+    elif index_type == 'hnsw':
+        index = faiss.IndexHNSWFlat(dimension, FAISS_HNSW_M, faiss.METRIC_INNER_PRODUCT)
+    else:
+        raise ValueError(f"Type d'index FAISS inconnu: {index_type}")
+    
+    index.add(embeddings)
+    configure_faiss_index(index)
+    return index
+
+
+def configure_faiss_index(index: faiss.Index):
+    """Applique les paramètres de recherche (non persistés par write_index)"""
+    if hasattr(index, 'nprobe'):
+        index.nprobe = FAISS_IVF_NPROBE
+    if hasattr(index, 'hnsw'):
+        index.hnsw.efSearch = FAISS_HNSW_EF_SEARCH
 
 
 class JobRecommender:
@@ -29,66 +81,148 @@ class JobRecommender:
     et FAISS pour la recherche vectorielle rapide
     """
     
-    def __init__(self, force_reload: bool = False):
+    def __init__(
+        self,
+        force_reload: bool = False,
+        allow_build: bool = True,
+        sample_size: Optional[int] = None,
+        index_type: str = FAISS_INDEX_TYPE,
+        embedding_workers: int = EMBEDDING_WORKERS
+    ):
         """
         Initialise le recommender
         
         Args:
             force_reload: Si True, recharge les embeddings même s'ils existent
+            allow_build: Si False, refuse de construire les artefacts manquants
+                (processus de service: API, Streamlit)
+            sample_size: Nombre d'offres à indexer lors d'une construction (toutes par défaut)
+            index_type: Type d'index FAISS lors d'une construction ('flat', 'ivf', 'hnsw')
+            embedding_workers: Nombre de processus pour construire les embeddings
         """
         self.preprocessor = JobDataPreprocessor()
         self.cv_parser = CVParser()
         
+        # CV déjà parsés et profils déjà encodés (mémoire + disque)
+        self.cv_cache = ContentCache(
+            'cv_text', CACHE_DIR / 'cv', CV_CACHE_MEMORY_ITEMS, CV_CACHE_DISK_MAX_MB
+        )
+        self.candidate_cache = ContentCache(
+            'candidate', CACHE_DIR / 'candidates', CANDIDATE_CACHE_MEMORY_ITEMS, CANDIDATE_CACHE_DISK_MAX_MB
+        )
+        
         print("Initialisation du système de recommandation...")
         
+        # Vérifier les artefacts avant de charger le modèle (démarrage rapide en cas d'échec)
+        must_build = force_reload or not self._embeddings_exist()
+        if must_build and not allow_build:
+            raise FileNotFoundError(
+                f"Index de recommandation introuvable dans {EMBEDDINGS_PATH.parent}. "
+                f"Construisez-le hors ligne avec: python build_index.py"
+            )
+        
         # Charger le modèle d'embeddings
         print(f"  → Chargement du modèle: {EMBEDDING_MODEL_NAME}")
         self.model = SentenceTransformer(EMBEDDING_MODEL_NAME)
         
         # Variables pour stocker les données
         self.jobs_df = None
+        self.job_skills = None
         self.embeddings = None
         self.faiss_index = None
+        self.index_meta = {}
         
         # Charger ou créer les embeddings
-        if not force_reload and self._embeddings_exist():
-            self._load_embeddings()
+        if must_build:
+            self._create_embeddings(sample_size=sample_size, index_type=index_type, workers=embedding_workers)
         else:
-            self._create_embeddings()
+            self._load_embeddings()
         
         print("Système de recommandation prêt.")
     
+    @classmethod
+    def from_components(
+        cls,
+        jobs_df: pd.DataFrame,
+        job_skills: SkillMatrix,
+        embeddings: np.ndarray,
+        faiss_index: faiss.Index,
+        model,
+        index_meta: Optional[Dict] = None
+    ) -> 'JobRecommender':
+        """
+        Assemble un recommender à partir d'artefacts déjà en mémoire
+        (benchmarks, outils hors ligne) sans lecture disque ni chargement de modèle;
+        les caches y sont en mémoire seulement
+        
+        Args:
+            jobs_df: Table des offres compactée
+            job_skills: Compétences (CSR) alignées sur jobs_df
+            embeddings: Embeddings normalisés alignés sur jobs_df
+            faiss_index: Index FAISS construit sur ces embeddings
+            model: Objet exposant encode() (SentenceTransformer ou équivalent)
+            index_meta: Métadonnées de l'index (optionnel)
+        """
+        recommender = cls.__new__(cls)
+        recommender.preprocessor = JobDataPreprocessor()
+        recommender.cv_parser = CVParser()
+        recommender.cv_cache = ContentCache('cv_text', max_items=CV_CACHE_MEMORY_ITEMS)
+        recommender.candidate_cache = ContentCache('candidate', max_items=CANDIDATE_CACHE_MEMORY_ITEMS)
+        recommender.model = model
+        recommender.jobs_df = jobs_df
+        recommender.job_skills = job_skills
+        recommender.embeddings = embeddings
+        recommender.faiss_index = faiss_index
+        recommender.index_meta = index_meta or {}
+        return recommender
+    
     def _embeddings_exist(self) -> bool:
         """Vérifie si les embeddings existent déjà"""
         return (
             EMBEDDINGS_PATH.exists() and
             JOBS_PROCESSED_PATH.exists() and
-            FAISS_INDEX_PATH.exists()
+            FAISS_INDEX_PATH.exists() and
+            JOB_SKILLS_PATH.exists()
         )
     
-    def _create_embeddings(self):
-        """Crée les embeddings pour toutes les offres"""
+    def _create_embeddings(
+        self,
+        sample_size: Optional[int] = None,
+        index_type: str = FAISS_INDEX_TYPE,
+        workers: int = EMBEDDING_WORKERS
+    ):
+        """Crée les embeddings pour toutes les offres (par shards, reprenable)"""
         print("\nCréation des embeddings (cette opération peut prendre quelques minutes)...")
         
-        # Charger et préprocesser les données
-        df_raw = self.preprocessor.load_jobs()
-        self.jobs_df = self.preprocessor.preprocess_jobs_df(df_raw)
+        # Charger (en streaming) et préprocesser les données
+        batches = self.preprocessor.iter_job_batches(sample_size=sample_size)
+        self.jobs_df = self.preprocessor.preprocess_batches(batches)
+        self.jobs_df = self.preprocessor.collapse_near_duplicates(self.jobs_df)
         
         # Générer les embeddings
         print(f"  → Vectorisation de {len(self.jobs_df):,} offres...")
         job_texts = self.jobs_df['combined_text'].tolist()
         
-        # Encoder par batch pour éviter les problèmes de mémoire
-        self.embeddings = self.model.encode(
-            job_texts,
-            batch_size=32,
-            show_progress_bar=True,
-            convert_to_numpy=True
-        )
+        # Encoder par shards sur plusieurs processus; chaque shard terminé est
+        # écrit sur disque pour pouvoir reprendre une construction interrompue
+        builder = ShardedEmbeddingBuilder(workers=workers, model=self.model)
+        self.embeddings = builder.build(job_texts)
         
         # Créer l'index FAISS
-        print("  → Construction de l'index FAISS...")
-        self._build_faiss_index()
+        print(f"  → Construction de l'index FAISS ({index_type})...")
+        self._build_faiss_index(index_type)
+        
+        # Compacter la table résidente (le texte combiné n'est plus utile)
+        print("  → Compaction de la table des offres...")
+        self.jobs_df, self.job_skills = self.preprocessor.compact_jobs_df(self.jobs_df)
+        
+        self.index_meta = {
+            'index_type': index_type,
+            'model_name': EMBEDDING_MODEL_NAME,
+            'num_jobs': len(self.jobs_df),
+            'sample_size': sample_size,
+            'built_at': datetime.now().isoformat(timespec='seconds'),
+        }
         
         # Sauvegarder
         print("  → Sauvegarde des embeddings...")
@@ -96,14 +230,30 @@ class JobRecommender:
         
         print("Embeddings créés et sauvegardés.")
     
-    def _build_faiss_index(self):
+    def _build_faiss_index(self, index_type: str = FAISS_INDEX_TYPE):
         """Construit l'index FAISS pour la recherche rapide"""
         # Normaliser les embeddings pour utiliser la similarité cosinus
+        self.embeddings = np.ascontiguousarray(self.embeddings, dtype='float32')
         faiss.normalize_L2(self.embeddings)
         
-        # Créer un index Flat (exact search) avec similarité cosinus
-        self.faiss_index = faiss.IndexFlatIP(EMBEDDING_DIMENSION)
-        self.faiss_index.add(self.embeddings.astype('float32'))
+        self.faiss_index = build_faiss_index(self.embeddings, index_type)
+    
+    def rebuild_index(self, index_type: str):
+        """
+        Reconstruit uniquement l'index FAISS à partir des embeddings existants
+        
+        Args:
+            index_type: Nouveau type d'index ('flat', 'ivf', 'hnsw')
+        """
+        self._build_faiss_index(index_type)
+        self.index_meta['index_type'] = index_type
+        faiss.write_index(self.faiss_index, str(FAISS_INDEX_PATH))
+        self._save_index_meta()
+    
+    def _save_index_meta(self):
+        """Sauvegarde les métadonnées de construction de l'index"""
+        with open(INDEX_META_PATH, 'w', encoding='utf-8') as f:
+            json.dump(self.index_meta, f, indent=2)
     
     def _save_embeddings(self):
         """Sauvegarde les embeddings et les données"""
@@ -114,8 +264,12 @@ class JobRecommender:
         with open(JOBS_PROCESSED_PATH, 'wb') as f:
             pickle.dump(self.jobs_df, f)
         
+        # Sauvegarder les compétences (CSR)
+        self.job_skills.save(JOB_SKILLS_PATH)
+        
         # Sauvegarder l'index FAISS
         faiss.write_index(self.faiss_index, str(FAISS_INDEX_PATH))
+        self._save_index_meta()
     
     def _load_embeddings(self):
         """Charge les embeddings sauvegardés"""
@@ -126,7 +280,14 @@ class JobRecommender:
         with open(JOBS_PROCESSED_PATH, 'rb') as f:
             self.jobs_df = pickle.load(f)
         
+        self.job_skills = SkillMatrix.load(JOB_SKILLS_PATH)
+        
+        if INDEX_META_PATH.exists():
+            with open(INDEX_META_PATH, 'r', encoding='utf-8') as f:
+                self.index_meta = json.load(f)
+        
         self.faiss_index = faiss.read_index(str(FAISS_INDEX_PATH))
+        configure_faiss_index(self.faiss_index)
         
         print(f"  → {len(self.jobs_df):,} offres chargées")
     
@@ -139,7 +300,8 @@ class JobRecommender:
         contract_type_preference: Optional[str] = None,
         experience_level: Optional[str] = None,
         top_k: int = DEFAULT_TOP_K,
-        min_score: float = 0.0
+        min_score: float = 0.0,
+        timer: Optional[StageTimer] = None
     ) -> List[Dict]:
         """
         Recommande des offres d'emploi pour un profil candidat
@@ -153,39 +315,199 @@ class JobRecommender:
             experience_level: Niveau d'expérience ('junior', 'mid', 'senior', etc.)
             top_k: Nombre de recommandations à retourner
             min_score: Score minimum pour filtrer les résultats
+            timer: Chronomètre des étapes (fourni par l'appelant pour exposer
+                les durées; sinon créé ici et agrégé dans timing_stats)
             
         Returns:
             Liste de dictionnaires avec les offres recommandées et leurs scores
         """
+        owns_timer = timer is None
+        timer = timer or StageTimer()
+        
         # Construire le texte complet du candidat
-        candidate_text = self._build_candidate_text(
-            candidate_profile, cv_text, keywords
-        )
+        with timer.stage('build_text'):
+            candidate_text = self._build_candidate_text(
+                candidate_profile, cv_text, keywords
+            )
         
-        # Vectoriser le profil candidat
-        candidate_embedding = self.model.encode([candidate_text], convert_to_numpy=True)
-        faiss.normalize_L2(candidate_embedding)
+        # Vectoriser le profil et extraire ses compétences (ou les relire du cache)
+        candidate_embedding, candidate_skills = self._encode_candidates([candidate_text], timer)
+        candidate_skills = candidate_skills[0]
         
         # Rechercher les K*2 plus proches voisins (on filtrera après)
-        search_k = min(top_k * 2, len(self.jobs_df))
-        distances, indices = self.faiss_index.search(
-            candidate_embedding.astype('float32'),
-            search_k
-        )
+        with timer.stage('search'):
+            search_k = min(top_k * 2, len(self.jobs_df))
+            distances, indices = self._search(candidate_embedding, search_k)
+        
+        with timer.stage('score'):
+            recommendations = self._score_candidates(
+                indices[0], distances[0], candidate_skills,
+                location_preference, contract_type_preference, experience_level,
+                min_score, top_k
+            )
         
-        # Extraire les compétences du candidat
-        candidate_skills = set(self.preprocessor.extract_skills(candidate_text))
+        if owns_timer:
+            timing_stats.record('recommend', timer)
         
+        return recommendations
+    
+    def recommend_stream(
+        self,
+        candidate_profile: str,
+        cv_text: Optional[str] = None,
+        keywords: Optional[List[str]] = None,
+        location_preference: Optional[str] = None,
+        contract_type_preference: Optional[str] = None,
+        experience_level: Optional[str] = None,
+        top_k: int = DEFAULT_TOP_K,
+        min_score: float = 0.0
+    ) -> Iterator[Dict]:
+        """
+        Variante progressive de recommend(): les résultats sont émis au fil du calcul
+        
+        Événements produits, dans l'ordre:
+        - {'event': 'partial', 'recommendations': [...]}: voisins FAISS dans l'ordre
+          sémantique, sans scoring multi-critères (disponible dès la recherche)
+        - {'event': 'result', 'rank': i, 'recommendation': {...}}: résultats finaux
+          rerankés, un par un
+        - {'event': 'done', 'total_found': n, 'timings': {...}}
+        
+        Args:
+            Voir recommend()
+        """
+        timer = StageTimer()
+        
+        with timer.stage('build_text'):
+            candidate_text = self._build_candidate_text(candidate_profile, cv_text, keywords)
+        
+        candidate_embedding, candidate_skills = self._encode_candidates([candidate_text], timer)
+        
+        with timer.stage('search'):
+            search_k = min(top_k * 2, len(self.jobs_df))
+            distances, indices = self._search(candidate_embedding, search_k)
+        
+        with timer.stage('partial'):
+            preview = [self._semantic_preview(idx, score) for idx, score in zip(indices[0][:top_k], distances[0][:top_k])]
+        yield {'event': 'partial', 'recommendations': preview}
+        
+        with timer.stage('score'):
+            recommendations = self._score_candidates(
+                indices[0], distances[0], candidate_skills[0],
+                location_preference, contract_type_preference, experience_level,
+                min_score, top_k
+            )
+        
+        for rank, recommendation in enumerate(recommendations, start=1):
+            yield {'event': 'result', 'rank': rank, 'recommendation': recommendation}
+        
+        timing_stats.record('recommend_stream', timer)
+        yield {'event': 'done', 'total_found': len(recommendations), 'timings': timer.as_dict()}
+    
+    def _semantic_preview(self, idx: int, base_score: float) -> Dict:
+        """Aperçu d'une offre avant scoring (champs d'affichage et similarité seule)"""
+        job = self.jobs_df.iloc[idx]
+        return {
+            'job_id': int(idx),
+            'title': job['title'],
+            'company': job['companyName'],
+            'location': job['location'],
+            'contract_type': job['contractType'],
+            'job_url': job.get('jobUrl', ''),
+            'semantic_similarity': round(float(base_score), 4),
+        }
+    
+    def _encode_candidates(self, candidate_texts: List[str], timer: StageTimer) -> Tuple[np.ndarray, List[set]]:
+        """
+        Embeddings normalisés et compétences de plusieurs profils candidats
+        
+        Un profil déjà vu (même texte, même modèle) n'est ni ré-encodé ni
+        ré-analysé; les autres sont encodés en un seul appel à model.encode.
+        
+        Returns:
+            (matrice d'embeddings n x d, liste des ensembles de compétences)
+        """
+        with timer.stage('cache'):
+            keys = [self._candidate_key(text) for text in candidate_texts]
+            cached = [self.candidate_cache.get(key) for key in keys]
+        
+        embeddings = np.empty((len(candidate_texts), self.faiss_index.d), dtype='float32')
+        skills: List[set] = [set() for _ in candidate_texts]
+        missing = []
+        for i, entry in enumerate(cached):
+            if entry is None:
+                missing.append(i)
+            else:
+                embeddings[i] = entry['embedding']
+                skills[i] = set(entry['skills'])
+        
+        if missing:
+            with timer.stage('encode'):
+                ENCODE_BATCH_SIZE.observe(len(missing))
+                encoded = self.model.encode(
+                    [candidate_texts[i] for i in missing],
+                    batch_size=EMBEDDING_BATCH_SIZE,
+                    convert_to_numpy=True
+                )
+                encoded = np.ascontiguousarray(encoded, dtype='float32')
+                faiss.normalize_L2(encoded)
+            
+            with timer.stage('extract_skills'):
+                for row, i in enumerate(missing):
+                    extracted = self.preprocessor.extract_skills(candidate_texts[i])
+                    embeddings[i] = encoded[row]
+                    skills[i] = set(extracted)
+                    self.candidate_cache.put(keys[i], {'skills': extracted, 'embedding': encoded[row]})
+        
+        return embeddings, skills
+    
+    def _candidate_key(self, candidate_text: str) -> str:
+        """Clé du cache candidat: l'embedding dépend du modèle, les compétences de la taxonomie"""
+        model_name = self.index_meta.get('model_name', EMBEDDING_MODEL_NAME)
+        return content_key(f"{model_name}\x1f{SKILLS_VERSION}\x1f{candidate_text}")
+    
+    def _search(self, query_embeddings: np.ndarray, k: int) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+        """
+        Recherche FAISS des k plus proches voisins (latence exportée en métrique)
+        
+        IVF et HNSW complètent par des identifiants -1 quand ils trouvent moins
+        de k voisins (listes sondées trop petites): ils sont retirés, si bien que
+        chaque requête peut avoir moins de k résultats.
+        
+        Returns:
+            (distances, indices): une liste d'arrays par requête
+        """
+        start = time.perf_counter()
+        distances, indices = self.faiss_index.search(query_embeddings.astype('float32'), k)
+        FAISS_SEARCH_LATENCY.labels(
+            index_type=self.index_meta.get('index_type', 'flat')
+        ).observe(time.perf_counter() - start)
+        valid = indices >= 0
+        return [row[mask] for row, mask in zip(distances, valid)], [row[mask] for row, mask in zip(indices, valid)]
+    
+    def _score_candidates(
+        self,
+        indices: np.ndarray,
+        distances: np.ndarray,
+        candidate_skills: set,
+        location_preference: Optional[str],
+        contract_type_preference: Optional[str],
+        experience_level: Optional[str],
+        min_score: float,
+        top_k: int
+    ) -> List[Dict]:
+        """Score multi-critères des voisins FAISS, filtre par score minimum et garde le top K"""
         # Calculer les scores finaux pour chaque offre
         recommendations = []
         
-        for idx, base_score in zip(indices[0], distances[0]):
+        for idx, base_score in zip(indices, distances):
             job = self.jobs_df.iloc[idx]
+            job_skills = self.job_skills[idx]
             
             # Calcul du score multi-critères
             final_score = self._calculate_final_score(
                 base_score=float(base_score),
                 job=job,
+                job_skills=set(job_skills),
                 candidate_skills=candidate_skills,
                 location_preference=location_preference,
                 contract_type_preference=contract_type_preference,
@@ -197,25 +519,13 @@ class JobRecommender:
                 continue
             
             # Créer l'objet recommandation
-            recommendation = {
-                'job_id': int(idx),
-                'title': job['title'],
-                'company': job['companyName'],
-                'location': job['location'],
-                'contract_type': job['contractType'],
-                'work_type': job.get('workType', 'Unknown'),
-                'posted_time': job.get('postedTime', 'Unknown'),
-                'job_url': job.get('jobUrl', ''),
-                'description_preview': job['description_clean'][:300] + '...',
-                'skills': job['skills'],
-                'experience_level': job['experience_level'],
-                'score': round(final_score, 4),
-                'semantic_similarity': round(float(base_score), 4),
-                'skills_match_count': len(candidate_skills & set(job['skills'])),
-                'skills_match_ratio': self._calculate_skills_match_ratio(
-                    candidate_skills, set(job['skills'])
-                )
-            }
+            recommendation = self.build_recommendation(
+                idx,
+                score=round(final_score, 4),
+                semantic_similarity=round(float(base_score), 4),
+                skills_match_count=len(candidate_skills & set(job_skills)),
+                skills_match_ratio=self._calculate_skills_match_ratio(candidate_skills, set(job_skills))
+            )
             
             recommendations.append(recommendation)
         
@@ -225,6 +535,39 @@ class JobRecommender:
         # Retourner top K
         return recommendations[:top_k]
     
+    def build_recommendation(
+        self,
+        idx: int,
+        score: float,
+        semantic_similarity: float,
+        skills_match_count: int,
+        skills_match_ratio: float
+    ) -> Dict:
+        """
+        Recommandation complète d'une offre à partir de ses scores
+        
+        Permet de ne conserver que les scores (pagination) et de reconstruire
+        les champs d'affichage à la demande.
+        """
+        job = self.jobs_df.iloc[idx]
+        return {
+            'job_id': int(idx),
+            'title': job['title'],
+            'company': job['companyName'],
+            'location': job['location'],
+            'contract_type': job['contractType'],
+            'work_type': job.get('workType', 'Unknown'),
+            'posted_time': job.get('postedTime', 'Unknown'),
+            'job_url': job.get('jobUrl', ''),
+            'description_preview': job['description_clean'][:300] + '...',
+            'skills': self.job_skills[idx],
+            'experience_level': job['experience_level'],
+            'score': score,
+            'semantic_similarity': semantic_similarity,
+            'skills_match_count': skills_match_count,
+            'skills_match_ratio': skills_match_ratio
+        }
+    
     def _build_candidate_text(
         self,
         profile: str,
@@ -248,6 +591,7 @@ class JobRecommender:
         self,
         base_score: float,
         job: pd.Series,
+        job_skills: set,
         candidate_skills: set,
         location_preference: Optional[str],
         contract_type_preference: Optional[str],
@@ -260,7 +604,7 @@ class JobRecommender:
         
         # Score de matching des compétences
         skills_score = self._calculate_skills_match_ratio(
-            candidate_skills, set(job['skills'])
+            candidate_skills, job_skills
         )
         
         # Score de localisation
@@ -335,6 +679,7 @@ class JobRecommender:
         self,
         cv_path: str,
         additional_keywords: Optional[List[str]] = None,
+        timer: Optional[StageTimer] = None,
         **kwargs
     ) -> List[Dict]:
         """
@@ -343,30 +688,43 @@ class JobRecommender:
         Args:
             cv_path: Chemin vers le fichier CV
             additional_keywords: Mots-clés additionnels
+            timer: Chronomètre des étapes (voir recommend())
             **kwargs: Autres arguments pour recommend()
             
         Returns:
             Liste de recommandations
         """
+        owns_timer = timer is None
+        timer = timer or StageTimer()
+        
         # Parser le CV
-        cv_text = self.cv_parser.parse_cv(cv_path)
-        cv_text = self.cv_parser.clean_text(cv_text)
+        with timer.stage('parse'):
+            cv_text = self.cv_parser.parse_cv(cv_path)
+        with timer.stage('clean'):
+            cv_text = self.cv_parser.clean_text(cv_text)
         
         # Combiner avec les keywords
         all_keywords = additional_keywords or []
         
-        return self.recommend(
+        recommendations = self.recommend(
             candidate_profile="",
             cv_text=cv_text,
             keywords=all_keywords,
+            timer=timer,
             **kwargs
         )
+        
+        if owns_timer:
+            timing_stats.record('recommend_cv', timer)
+        
+        return recommendations
     
     def recommend_from_cv_bytes(
         self,
         cv_bytes: bytes,
         cv_filename: str,
         additional_keywords: Optional[List[str]] = None,
+        timer: Optional[StageTimer] = None,
         **kwargs
     ) -> List[Dict]:
         """
@@ -376,23 +734,152 @@ class JobRecommender:
             cv_bytes: Contenu du CV en bytes
             cv_filename: Nom du fichier
             additional_keywords: Mots-clés additionnels
+            timer: Chronomètre des étapes (voir recommend())
             **kwargs: Autres arguments pour recommend()
             
         Returns:
             Liste de recommandations
         """
-        # Parser le CV
-        cv_text = self.cv_parser.parse_cv_bytes(cv_bytes, cv_filename)
-        cv_text = self.cv_parser.clean_text(cv_text)
+        owns_timer = timer is None
+        timer = timer or StageTimer()
+        
+        cv_text = self._parse_cv_cached(cv_bytes, cv_filename, timer)
         
         all_keywords = additional_keywords or []
         
-        return self.recommend(
+        recommendations = self.recommend(
             candidate_profile="",
             cv_text=cv_text,
             keywords=all_keywords,
+            timer=timer,
             **kwargs
         )
+        
+        if owns_timer:
+            timing_stats.record('recommend_cv', timer)
+        
+        return recommendations
+    
+    def _parse_cv_cached(self, cv_bytes: bytes, cv_filename: str, timer: StageTimer) -> str:
+        """Texte nettoyé d'un CV; un CV déjà soumis (mêmes octets, même extension) n'est pas re-parsé"""
+        with timer.stage('cache'):
+            # L'extension choisit l'extracteur: les mêmes octets en .txt et en .pdf donnent deux textes
+            extension = Path(cv_filename).suffix.lower()
+            cv_key = content_key(extension.encode('utf-8') + b'\x1f' + cv_bytes)
+            cached = self.cv_cache.get(cv_key)
+        
+        if cached is not None:
+            return cached['text']
+        
+        # Parser le CV
+        with timer.stage('parse'):
+            cv_text = self.cv_parser.parse_cv_bytes(cv_bytes, cv_filename)
+        with timer.stage('clean'):
+            cv_text = self.cv_parser.clean_text(cv_text)
+        self.cv_cache.put(cv_key, {'text': cv_text})
+        return cv_text
+    
+    def recommend_bulk(
+        self,
+        cv_files: Iterable[Tuple[str, bytes]],
+        additional_keywords: Optional[List[str]] = None,
+        location_preference: Optional[str] = None,
+        contract_type_preference: Optional[str] = None,
+        experience_level: Optional[str] = None,
+        top_k: int = DEFAULT_TOP_K,
+        min_score: float = 0.0,
+        batch_size: int = BULK_ENCODE_BATCH_SIZE,
+        parse_threads: int = BULK_PARSE_THREADS
+    ) -> Iterator[Dict]:
+        """
+        Recommande des offres pour un lot de CV, résultat par résultat
+        
+        Les CV sont parsés en parallèle; dès qu'un lot de `batch_size` CV est
+        prêt (ou que le parsing est terminé), il est encodé en un appel et
+        recherché en une seule requête FAISS multi-vecteurs.
+        
+        Args:
+            cv_files: Itérable de (nom de fichier, contenu)
+            additional_keywords: Mots-clés ajoutés à chaque CV
+            location_preference, contract_type_preference, experience_level,
+            top_k, min_score: Voir recommend()
+            batch_size: Nombre de CV encodés et recherchés ensemble
+            parse_threads: Nombre de CV en cours de parsing simultanément
+            
+        Yields:
+            {'cv_filename', 'recommendations'} ou {'cv_filename', 'error'},
+            dans l'ordre de fin de traitement
+        """
+        keywords = additional_keywords or []
+        files = iter(cv_files)
+        pending: Dict = {}
+        batch: List[Tuple[str, str]] = []
+        
+        def flush():
+            timer = StageTimer()
+            results = list(self._recommend_parsed_batch(
+                batch, keywords, location_preference, contract_type_preference,
+                experience_level, top_k, min_score, timer
+            ))
+            timing_stats.record('recommend_bulk', timer)
+            batch.clear()
+            return results
+        
+        with ThreadPoolExecutor(max_workers=parse_threads, thread_name_prefix='bulk-parse') as executor:
+            def submit_next() -> bool:
+                for filename, data in files:
+                    future = executor.submit(self._parse_cv_cached, data, filename, StageTimer())
+                    pending[future] = filename
+                    return True
+                return False
+            
+            # Fenêtre bornée: on ne lit pas toute l'archive en mémoire d'avance
+            for _ in range(parse_threads * 2):
+                if not submit_next():
+                    break
+            
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    filename = pending.pop(future)
+                    submit_next()
+                    try:
+                        batch.append((filename, future.result()))
+                    except Exception as e:
+                        yield {'cv_filename': filename, 'error': str(e)}
+                
+                if len(batch) >= batch_size or (batch and not pending):
+                    yield from flush()
+    
+    def _recommend_parsed_batch(
+        self,
+        batch: List[Tuple[str, str]],
+        keywords: List[str],
+        location_preference: Optional[str],
+        contract_type_preference: Optional[str],
+        experience_level: Optional[str],
+        top_k: int,
+        min_score: float,
+        timer: StageTimer
+    ) -> Iterator[Dict]:
+        """Encode un lot de CV parsés, recherche en un appel FAISS et score chaque CV"""
+        with timer.stage('build_text'):
+            texts = [self._build_candidate_text("", cv_text, keywords) for _, cv_text in batch]
+        
+        embeddings, skills = self._encode_candidates(texts, timer)
+        
+        with timer.stage('search'):
+            search_k = min(top_k * 2, len(self.jobs_df))
+            distances, indices = self._search(embeddings, search_k)
+        
+        for i, (filename, _) in enumerate(batch):
+            with timer.stage('score'):
+                recommendations = self._score_candidates(
+                    indices[i], distances[i], skills[i],
+                    location_preference, contract_type_preference, experience_level,
+                    min_score, top_k
+                )
+            yield {'cv_filename': filename, 'recommendations': recommendations}
     
     def get_similar_jobs(self, job_id: int, top_k: int = 10) -> List[Dict]:
         """
@@ -412,14 +899,12 @@ class JobRecommender:
         job_embedding = self.embeddings[job_id:job_id+1]
         
         # Rechercher les similaires (top_k + 1 car le premier sera l'offre elle-même)
-        distances, indices = self.faiss_index.search(
-            job_embedding.astype('float32'),
-            top_k + 1
-        )
+        distances, indices = self._search(job_embedding, top_k + 1)
         
-        # Exclure l'offre elle-même et créer les résultats
+        # Exclure l'offre elle-même (pas forcément en tête avec IVF/HNSW) et créer les résultats
         similar_jobs = []
-        for idx, score in zip(indices[0][1:], distances[0][1:]):
+        neighbours = [(idx, score) for idx, score in zip(indices[0], distances[0]) if idx != job_id]
+        for idx, score in neighbours[:top_k]:
             job = self.jobs_df.iloc[idx]
             similar_jobs.append({
                 'job_id': int(idx),
@@ -427,7 +912,7 @@ class JobRecommender:
                 'company': job['companyName'],
                 'location': job['location'],
                 'similarity_score': round(float(score), 4),
-                'skills': job['skills']
+                'skills': self.job_skills[idx]
             })
         
         return similar_jobs
@@ -458,16 +943,16 @@ class JobRecommender:
             'posted_time': job.get('postedTime', ''),
             'published_at': job.get('publishedAt', ''),
             'job_url': job.get('jobUrl', ''),
-            'description': job['description'],
-            'skills': job['skills'],
-            'num_skills': job['num_skills'],
+            'description': job['description_clean'],
+            'skills': self.job_skills[job_id],
+            'num_skills': int(job['num_skills']),
             'experience_level': job['experience_level'],
-            'years_experience': job['years_experience']
+            'years_experience': int(job['years_experience'])
         }
     
     def get_statistics(self) -> Dict:
         """Retourne des statistiques sur les offres"""
-        return self.preprocessor.get_statistics(self.jobs_df)
+        return self.preprocessor.get_statistics(self.jobs_df, self.job_skills)
 
 
 if __name__ == "__main__":
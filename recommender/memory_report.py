@@ -0,0 +1,159 @@
+"""
+Rapport mémoire de la table des offres résidente (avant / après compaction)
+
+Génère un DataFrame synthétique ayant la forme de la sortie de
+`preprocess_jobs_df`, puis compare son empreinte mémoire avec celle de
+`compact_jobs_df` (colonnes catégorielles, compétences CSR, textes dédupliqués).
+
+Usage:
+    python memory_report.py
+    python memory_report.py --sizes 131000 1000000 --output memory_report.json
+"""
+import argparse
+import json
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from config import DATA_SKILLS, EXPERIENCE_LEVELS, MOROCCO_CITIES
+from data_preprocessing import JobDataPreprocessor
+
+DEFAULT_SIZES = [131_000, 1_000_000]
+
+WORDS = (
+    "data engineer pipeline cloud analytics model team python sql spark experience "
+    "business platform build design deliver stakeholders production quality senior "
+    "machine learning reporting warehouse dashboards customers product growth agile"
+).split()
+
+CONTRACT_TYPES = ['Full-time', 'Part-time', 'Contract', 'Internship', 'Freelance', 'Unknown']
+WORK_TYPES = ['Remote', 'Hybrid', 'On-site', 'Not Specified']
+JOB_CATEGORIES = ['Data Engineer', 'Data Scientist', 'Data Analyst', 'ML Engineer', 'AI Engineer', 'Other Data/AI Role']
+
+
+def generate_processed_jobs(n_jobs: int, description_words: int = 80, seed: int = 42) -> pd.DataFrame:
+    """
+    Crée un DataFrame synthétique au format de preprocess_jobs_df
+
+    Args:
+        n_jobs: Nombre d'offres
+        description_words: Longueur des descriptions (en mots)
+        seed: Graine aléatoire
+
+    Returns:
+        DataFrame avec les mêmes colonnes que la sortie du préprocessing
+    """
+    rng = np.random.default_rng(seed)
+
+    cities = [city.title() for city in MOROCCO_CITIES] + ['Paris', 'London', 'Remote', 'Dubai']
+    companies = np.array([f"Company {i}" for i in range(max(n_jobs // 20, 1))], dtype=object)
+    levels = list(EXPERIENCE_LEVELS) + ['unknown']
+
+    words = np.array(WORDS, dtype=object)
+    word_idx = rng.integers(0, len(words), size=(n_jobs, description_words))
+    titles = [f"{JOB_CATEGORIES[i % len(JOB_CATEGORIES)]} {i}" for i in range(n_jobs)]
+    descriptions_clean = [' '.join(words[row]) for row in word_idx]
+
+    num_skills = rng.integers(0, 12, size=n_jobs)
+    # Listes de skill_id (dim_skills: 1..len(DATA_SKILLS)), comme fact_job_skills agrégée par DuckDB
+    skill_ids = [np.sort(rng.choice(len(DATA_SKILLS), size=k, replace=False) + 1) for k in num_skills]
+
+    locations = rng.choice(np.array(cities, dtype=object), size=n_jobs)
+    contracts = rng.choice(np.array(CONTRACT_TYPES, dtype=object), size=n_jobs)
+
+    return pd.DataFrame({
+        'title': titles,
+        'description': [f"<p>{text}</p>" for text in descriptions_clean],
+        'companyName': rng.choice(companies, size=n_jobs),
+        'location': locations,
+        'country': rng.choice(np.array(['Morocco', 'France', 'United Kingdom'], dtype=object), size=n_jobs),
+        'contractType': contracts,
+        'workType': rng.choice(np.array(WORK_TYPES, dtype=object), size=n_jobs),
+        'jobCategory': rng.choice(np.array(JOB_CATEGORIES, dtype=object), size=n_jobs),
+        'jobUrl': [f"https://www.linkedin.com/jobs/view/{i}" for i in range(n_jobs)],
+        'title_clean': [str(title) for title in titles],
+        'description_clean': descriptions_clean,
+        'combined_text': [f"{t}. {t}. {d}" for t, d in zip(titles, descriptions_clean)],
+        'skill_ids': skill_ids,
+        'num_skills': num_skills,
+        'experience_level': rng.choice(np.array(levels, dtype=object), size=n_jobs),
+        'years_experience': rng.integers(0, 10, size=n_jobs),
+        'location_clean': [str(loc).strip() for loc in locations],
+        'contractType_clean': [str(c).strip() for c in contracts],
+    })
+
+
+def _mb(n_bytes: int) -> float:
+    return round(n_bytes / (1024 * 1024), 1)
+
+
+def measure(n_jobs: int, description_words: int = 80) -> Dict:
+    """
+    Mesure l'empreinte mémoire avant/après compaction pour N offres
+
+    Args:
+        n_jobs: Nombre d'offres synthétiques
+        description_words: Longueur des descriptions (en mots)
+
+    Returns:
+        Dictionnaire avec le détail par colonne et les totaux
+    """
+    preprocessor = JobDataPreprocessor()
+    preprocessor.skill_vocabulary = (list(range(1, len(DATA_SKILLS) + 1)), list(DATA_SKILLS))
+    df = generate_processed_jobs(n_jobs, description_words)
+
+    before = df.memory_usage(deep=True, index=False)
+    df_compact, job_skills = preprocessor.compact_jobs_df(df)
+    after = df_compact.memory_usage(deep=True, index=False)
+    skills_bytes = job_skills.memory_usage()
+
+    total_before = int(before.sum())
+    total_after = int(after.sum()) + skills_bytes
+
+    columns = {}
+    for col in before.index:
+        columns[col] = {
+            'before_mb': _mb(int(before[col])),
+            'after_mb': _mb(int(after[col])) if col in after.index else 0.0,
+        }
+    columns['skill_ids']['after_mb'] = _mb(skills_bytes)
+
+    return {
+        'n_jobs': n_jobs,
+        'description_words': description_words,
+        'before_mb': _mb(total_before),
+        'after_mb': _mb(total_after),
+        'reduction_pct': round(100.0 * (1 - total_after / total_before), 1),
+        'columns': columns,
+    }
+
+
+def print_report(results: List[Dict]):
+    """Affiche le rapport sous forme de tableau"""
+    print("\n" + "=" * 80)
+    print("EMPREINTE MÉMOIRE DE LA TABLE DES OFFRES")
+    print("=" * 80)
+    for result in results:
+        print(f"\n{result['n_jobs']:,} offres ({result['description_words']} mots/description)")
+        print(f"  {'Colonne':<22}{'Avant (MB)':>14}{'Après (MB)':>14}")
+        for col, sizes in result['columns'].items():
+            print(f"  {col:<22}{sizes['before_mb']:>14,.1f}{sizes['after_mb']:>14,.1f}")
+        print(f"  {'TOTAL':<22}{result['before_mb']:>14,.1f}{result['after_mb']:>14,.1f}"
+              f"   (-{result['reduction_pct']}%)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rapport mémoire avant/après compaction de jobs_df")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Nombres d'offres à mesurer")
+    parser.add_argument('--description-words', type=int, default=80, help="Longueur des descriptions synthétiques")
+    parser.add_argument('--output', type=str, default=None, help="Fichier JSON de sortie (optionnel)")
+    args = parser.parse_args()
+
+    results = [measure(n, args.description_words) for n in args.sizes]
+    print_report(results)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nRapport écrit dans {args.output}")
@@ -0,0 +1,256 @@
+"""
+Métriques au format texte Prometheus, sans dépendance ni collecteur externe
+
+Compteurs, jauges et histogrammes (avec labels) tenus en mémoire par le
+processus; l'API les expose sur /metrics (un simple curl suffit).
+"""
+import os
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Bornes par défaut (secondes) des histogrammes de latence
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+
+def _format_labels(names: Sequence[str], values: Tuple[str, ...], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    """Base commune: nom, aide, labels et une série par combinaison de labels"""
+
+    type_name = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, ...], object] = {}
+
+    def labels(self, *values, **kwargs) -> '_Metric':
+        """Retourne la série correspondant aux valeurs de labels données"""
+        if kwargs:
+            values = tuple(str(kwargs[name]) for name in self.labelnames)
+        else:
+            values = tuple(str(v) for v in values)
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name}: labels attendus {self.labelnames}, reçus {values}")
+        with self._lock:
+            child = self._series.get(values)
+            if child is None:
+                child = self._series[values] = self._new_child()
+            return child
+
+    def _default(self):
+        """Série sans label (métriques déclarées sans labelnames)"""
+        if self.labelnames:
+            raise ValueError(f"{self.name}: labels requis {self.labelnames}")
+        return self.labels()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        with self._lock:
+            series = list(self._series.items())
+        for values, child in series:
+            lines.extend(child.render(self.name, self.labelnames, values))
+        return lines
+
+
+class _CounterChild:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        if amount < 0:
+            raise ValueError("Un compteur ne peut que croître")
+        with self._lock:
+            self.value += amount
+
+    def render(self, name, labelnames, values):
+        return [f"{name}{_format_labels(labelnames, values)} {_format_value(self.value)}"]
+
+
+class Counter(_Metric):
+    """Compteur monotone (nom conventionnellement suffixé par _total)"""
+
+    type_name = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self._default().inc(amount)
+
+
+class _GaugeChild:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float):
+        with self._lock:
+            self.value = float(value)
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        with self._lock:
+            self.value -= amount
+
+    def set_function(self, function: Callable[[], float]):
+        """Valeur calculée au moment de l'exposition (ex: RSS du processus)"""
+        self._function = function
+
+    def render(self, name, labelnames, values):
+        value = self._function() if self._function else self.value
+        return [f"{name}{_format_labels(labelnames, values)} {_format_value(value)}"]
+
+
+class Gauge(_Metric):
+    """Valeur instantanée pouvant monter ou descendre"""
+
+    type_name = 'gauge'
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float):
+        self._default().set(value)
+
+    def inc(self, amount: float = 1.0):
+        self._default().inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self._default().dec(amount)
+
+    def set_function(self, function: Callable[[], float]):
+        self._default().set_function(function)
+
+
+class _HistogramChild:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self._lock = threading.Lock()
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        with self._lock:
+            self.counts[bisect_left(self.buckets, value)] += 1
+            self.sum += value
+
+    def render(self, name, labelnames, values):
+        with self._lock:
+            counts, total_sum = list(self.counts), self.sum
+        lines, cumulative = [], 0
+        for bound, count in zip(self.buckets + (float('inf'),), counts):
+            cumulative += count
+            le = f'le="{_format_value(bound)}"'
+            lines.append(f"{name}_bucket{_format_labels(labelnames, values, le)} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(labelnames, values)} {_format_value(total_sum)}")
+        lines.append(f"{name}_count{_format_labels(labelnames, values)} {cumulative}")
+        return lines
+
+
+class Histogram(_Metric):
+    """Distribution d'observations par seaux cumulés (le = borne supérieure)"""
+
+    type_name = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self._default().observe(value)
+
+
+class Registry:
+    """Ensemble des métriques exposées par le processus"""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Exposition au format texte Prometheus (version 0.0.4)"""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.collect())
+        return '\n'.join(lines) + '\n'
+
+
+def process_rss_bytes() -> float:
+    """Mémoire résidente du processus (octets), 0 si /proc est indisponible"""
+    try:
+        with open('/proc/self/statm') as f:
+            return float(int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE'))
+    except (OSError, ValueError):
+        return 0.0
+
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    'recruiter_http_requests_total', "Requêtes HTTP par route et statut", ('method', 'route', 'status')
+))
+HTTP_LATENCY = REGISTRY.register(Histogram(
+    'recruiter_http_request_duration_seconds', "Latence des requêtes HTTP par route", ('method', 'route')
+))
+HTTP_IN_FLIGHT = REGISTRY.register(Gauge(
+    'recruiter_http_requests_in_flight', "Requêtes HTTP en cours de traitement"
+))
+ENCODE_BATCH_SIZE = REGISTRY.register(Histogram(
+    'recruiter_encode_batch_size', "Nombre de textes par appel à model.encode", buckets=BATCH_SIZE_BUCKETS
+))
+FAISS_SEARCH_LATENCY = REGISTRY.register(Histogram(
+    'recruiter_faiss_search_seconds', "Latence des recherches FAISS", ('index_type',)
+))
+CACHE_REQUESTS = REGISTRY.register(Counter(
+    'recruiter_cache_requests_total', "Accès aux caches (result=hit|disk_hit|miss)", ('cache', 'result')
+))
+CV_PARSE_FAILURES = REGISTRY.register(Counter(
+    'recruiter_cv_parse_failures_total', "Échecs de parsing de CV par format", ('format',)
+))
+POOL_QUEUE_DEPTH = REGISTRY.register(Gauge(
+    'recruiter_pool_queue_depth', "Tâches en attente par pool de workers", ('pool',)
+))
+JOBS_INDEXED = REGISTRY.register(Gauge(
+    'recruiter_jobs_indexed', "Nombre d'offres dans l'index chargé"
+))
+PROCESS_RSS = REGISTRY.register(Gauge(
+    'recruiter_process_resident_memory_bytes', "Mémoire résidente du processus"
+))
+PROCESS_RSS.set_function(process_rss_bytes)
@@ -0,0 +1,141 @@
+"""
+Pagination par curseur des recommandations
+
+La liste scorée complète d'une requête (jusqu'à PAGINATION_MAX_RESULTS offres)
+est calculée une seule fois puis conservée côté serveur pendant
+PAGINATION_CURSOR_TTL secondes; les pages suivantes sont servies depuis cette
+liste, sans ré-encoder le profil ni relancer la recherche FAISS.
+
+Seuls les scores de chaque offre sont conservés (tuples compacts, voir
+SCORE_FIELDS); les champs d'affichage d'une page sont reconstruits à la demande.
+Le nombre de listes et le nombre total de résultats conservés sont bornés.
+
+Le curseur est opaque pour le client: identifiant aléatoire de la liste et
+position de la page suivante, encodés en base64 (URL-safe).
+"""
+import base64
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config import PAGINATION_CURSOR_TTL, PAGINATION_MAX_SETS, PAGINATION_MAX_ENTRIES
+
+# Champs conservés par résultat, dans l'ordre des tuples (arguments de `build`)
+SCORE_FIELDS = ('job_id', 'score', 'semantic_similarity', 'skills_match_count', 'skills_match_ratio')
+
+
+class InvalidCursorError(ValueError):
+    """Curseur illisible (tronqué, modifié...)"""
+
+
+class CursorExpiredError(LookupError):
+    """Liste de résultats expirée ou évincée: la recherche doit être relancée"""
+
+
+def encode_cursor(result_set_id: str, offset: int) -> str:
+    payload = json.dumps({'s': result_set_id, 'o': offset}, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(payload).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """Retourne (identifiant de liste, position)"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        result_set_id, offset = str(payload['s']), int(payload['o'])
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError(f"Curseur invalide: {cursor!r}") from e
+    if offset < 0:
+        raise InvalidCursorError(f"Curseur invalide: {cursor!r}")
+    return result_set_id, offset
+
+
+class ResultPageStore:
+    """Listes de résultats scorés en mémoire, avec expiration et éviction LRU"""
+
+    def __init__(
+        self,
+        ttl: float = PAGINATION_CURSOR_TTL,
+        max_sets: int = PAGINATION_MAX_SETS,
+        max_entries: int = PAGINATION_MAX_ENTRIES
+    ):
+        self.ttl = ttl
+        self.max_sets = max_sets
+        self.max_entries = max_entries
+        self._sets: OrderedDict = OrderedDict()
+        self._entries = 0
+        self._lock = threading.Lock()
+
+    def create(
+        self,
+        results: List[Dict],
+        page_size: int,
+        build: Callable[..., Dict],
+        search_params: Optional[Dict] = None
+    ) -> Dict:
+        """
+        Conserve une liste de résultats et retourne sa première page
+
+        Args:
+            results: Liste scorée complète, déjà triée
+            page_size: Taille des pages (reprise par les curseurs suivants)
+            build: Reconstruit un résultat complet à partir des SCORE_FIELDS
+                (JobRecommender.build_recommendation)
+            search_params: Paramètres de la recherche, renvoyés avec chaque page
+        """
+        result_set_id = uuid.uuid4().hex
+        entry = {
+            'results': [tuple(result[field] for field in SCORE_FIELDS) for result in results],
+            'build': build,
+            'page_size': page_size,
+            'search_params': search_params or {},
+            'expires_at': time.time() + self.ttl,
+        }
+        with self._lock:
+            self._purge_expired()
+            self._sets[result_set_id] = entry
+            self._entries += len(entry['results'])
+            # La liste venant d'être créée n'est jamais évincée
+            while len(self._sets) > 1 and (len(self._sets) > self.max_sets or self._entries > self.max_entries):
+                _, evicted = self._sets.popitem(last=False)
+                self._entries -= len(evicted['results'])
+        return self._page(result_set_id, entry, 0)
+
+    def page(self, cursor: str) -> Dict:
+        """
+        Page désignée par un curseur
+
+        Raises:
+            InvalidCursorError: Si le curseur est illisible
+            CursorExpiredError: Si la liste a expiré ou a été évincée
+        """
+        result_set_id, offset = decode_cursor(cursor)
+        with self._lock:
+            entry = self._sets.get(result_set_id)
+            if entry is None or entry['expires_at'] < time.time():
+                if self._sets.pop(result_set_id, None) is not None:
+                    self._entries -= len(entry['results'])
+                raise CursorExpiredError("Curseur expiré, relancez la recherche")
+            self._sets.move_to_end(result_set_id)
+        return self._page(result_set_id, entry, offset)
+
+    def _page(self, result_set_id: str, entry: Dict, offset: int) -> Dict:
+        results, page_size = entry['results'], entry['page_size']
+        end = offset + page_size
+        return {
+            'recommendations': [entry['build'](*row) for row in results[offset:end]],
+            'offset': offset,
+            'page_size': page_size,
+            'total_found': len(results),
+            'next_cursor': encode_cursor(result_set_id, end) if end < len(results) else None,
+            'expires_at': entry['expires_at'],
+            'search_params': entry['search_params'],
+        }
+
+    def _purge_expired(self):
+        now = time.time()
+        for result_set_id in [key for key, entry in self._sets.items() if entry['expires_at'] < now]:
+            self._entries -= len(self._sets.pop(result_set_id)['results'])
@@ -0,0 +1,148 @@
+"""
+Profilage par échantillonnage d'un processus en cours d'exécution
+
+Un thread relève périodiquement les piles Python de tous les autres threads
+(sys._current_frames) et les agrège au format "collapsed stacks"
+(une ligne `thread;fichier:fonction;... nombre` par pile), directement
+exploitable par flamegraph.pl, speedscope ou inferno.
+
+Aucun redémarrage ni instrumentation n'est nécessaire: la capture se lance
+depuis l'endpoint /admin/profile de l'API ou par le signal SIGUSR2.
+
+sample() n'observe que le processus courant: les workers du pool de parsing
+des CV (PyPDF2, pdfplumber) l'exécutent eux-mêmes à la demande de l'API
+(CVParsePool.profile_workers), qui fusionne leurs piles sous le préfixe `worker;`.
+"""
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from config import PROFILER_INTERVAL, PROFILER_MAX_SECONDS, PROFILER_SIGNAL_SECONDS, PROFILES_DIR
+
+# Feuilles de pile correspondant à un thread inactif (attente de verrou, d'I/O...)
+IDLE_FRAMES = {
+    ('threading.py', 'wait'),
+    ('threading.py', '_wait_for_tstate_lock'),
+    ('selectors.py', 'select'),
+    ('queue.py', 'get'),
+    ('thread.py', '_worker'),
+    ('socket.py', 'accept'),
+    ('connection.py', '_recv'),
+    ('queues.py', 'get'),
+}
+
+# Une seule capture à la fois par processus
+_capture_lock = threading.Lock()
+
+
+class ProfilerBusyError(RuntimeError):
+    """Une capture est déjà en cours dans ce processus"""
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+def _collapse(frame, thread_name: str, include_idle: bool = False) -> Optional[str]:
+    """Pile d'un thread, de la racine à la feuille, au format collapsed (None si inactif)"""
+    leaf = (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name)
+    if leaf in IDLE_FRAMES and not include_idle:
+        return None
+
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.append(thread_name.replace(' ', '_'))
+    return ';'.join(reversed(labels))
+
+
+def sample(seconds: float, interval: float = PROFILER_INTERVAL, include_idle: bool = False) -> Counter:
+    """
+    Échantillonne les piles de tous les threads pendant `seconds` secondes
+
+    Args:
+        seconds: Durée de la capture (bornée par PROFILER_MAX_SECONDS)
+        interval: Intervalle entre deux échantillons (secondes)
+        include_idle: Conserver les piles des threads en attente
+
+    Returns:
+        Compteur {pile collapsed: nombre d'échantillons}
+
+    Raises:
+        ProfilerBusyError: Si une autre capture est en cours
+    """
+    if not _capture_lock.acquire(blocking=False):
+        raise ProfilerBusyError("Un profilage est déjà en cours")
+
+    try:
+        seconds = min(max(seconds, interval), PROFILER_MAX_SECONDS)
+        own_id = threading.get_ident()
+        stacks = Counter()
+        deadline = time.monotonic() + seconds
+
+        while time.monotonic() < deadline:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = _collapse(frame, names.get(thread_id, str(thread_id)), include_idle)
+                if stack:
+                    stacks[stack] += 1
+            time.sleep(interval)
+
+        return stacks
+    finally:
+        _capture_lock.release()
+
+
+def to_collapsed(stacks: Counter) -> str:
+    """Sérialise les piles au format collapsed (les plus fréquentes d'abord)"""
+    return ''.join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+def profile_to_file(seconds: float, output_dir: Path = PROFILES_DIR) -> Path:
+    """Capture un profil et l'écrit dans output_dir (fichier .folded)"""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    path = output_dir / f"profile_{os.getpid()}_{datetime.now():%Y%m%d_%H%M%S}.folded"
+    path.write_text(to_collapsed(sample(seconds)), encoding='utf-8')
+    return path
+
+
+def install_signal_handler(seconds: float = PROFILER_SIGNAL_SECONDS, output_dir: Path = PROFILES_DIR) -> bool:
+    """
+    Déclenche une capture de `seconds` secondes à la réception de SIGUSR2
+
+    La capture tourne dans un thread dédié; le profil est écrit dans output_dir.
+    Usage: kill -USR2 <pid>
+
+    Returns:
+        True si le gestionnaire a été installé (indisponible hors Unix
+        ou hors du thread principal)
+    """
+    if not hasattr(signal, 'SIGUSR2'):
+        return False
+
+    def _run():
+        try:
+            path = profile_to_file(seconds, output_dir)
+            print(f"  → Profil écrit dans {path}")
+        except ProfilerBusyError as e:
+            print(f"  → SIGUSR2 ignoré: {e}")
+
+    def _handler(signum, frame):
+        threading.Thread(target=_run, name='sampling-profiler', daemon=True).start()
+
+    try:
+        signal.signal(signal.SIGUSR2, _handler)
+    except ValueError:
+        return False
+    return True
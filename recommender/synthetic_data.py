@@ -0,0 +1,181 @@
+"""
+Générateur de couche Gold synthétique (benchmarks)
+
+Produit `fact_job_offers.csv`, `dim_company.csv`, `dim_location.csv`,
+`dim_skills.csv` et `fact_job_skills.csv` avec les mêmes colonnes que les
+exports dbt, à n'importe quelle échelle (10k, 131k, 1M).
+Une fraction des offres est republiée avec un texte légèrement modifié pour
+exercer le dédoublonnage.
+
+Usage:
+    python synthetic_data.py --n-jobs 131000 --output-dir data/synthetic/131k
+"""
+import argparse
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from config import SKILL_PATTERNS, MOROCCO_REGIONS
+
+ROLES = {
+    'Data Engineer': ['Data Engineer', 'Senior Data Engineer', 'Big Data Engineer', 'Ingénieur Data'],
+    'Data Scientist': ['Data Scientist', 'Senior Data Scientist', 'Lead Data Scientist'],
+    'Data Analyst': ['Data Analyst', 'BI Analyst', 'Business Data Analyst'],
+    'ML Engineer': ['Machine Learning Engineer', 'ML Engineer', 'MLOps Engineer'],
+    'GenAI/LLM Engineer': ['LLM Engineer', 'Generative AI Engineer', 'GenAI Developer'],
+    'AI Engineer': ['AI Engineer', 'Artificial Intelligence Engineer'],
+}
+
+SENTENCES = [
+    "You will design and operate {skill} workflows used by teams across the company.",
+    "Strong experience with {skill} is required, {skill2} is a plus.",
+    "Join our {city} office to build data products with {skill} and {skill2}.",
+    "We are looking for a {level} profile with {years}+ years of experience.",
+    "You will collaborate with product, engineering and business stakeholders.",
+    "Our platform processes millions of events per day on {skill}.",
+    "Nous recherchons un profil {level} maîtrisant {skill} et {skill2}.",
+    "You will mentor junior engineers and review code.",
+    "Experience deploying models to production with {skill} is appreciated.",
+    "Hybrid work, health insurance and training budget included.",
+]
+
+LEVELS = ['junior', 'mid-level', 'senior', 'lead', 'manager']
+CONTRACT_TYPES = ['Full-time', 'Contract', 'Internship', 'Part-time', 'Freelance']
+WORK_TYPES = ['Remote', 'Hybrid', 'On-site', 'Not Specified']
+FOREIGN_LOCATIONS = [('paris', 'france'), ('london', 'united kingdom'), ('dubai', 'united arab emirates'),
+                     ('berlin', 'germany'), ('montreal', 'canada'), ('remote', 'Not Specified')]
+
+
+def _locations() -> pd.DataFrame:
+    rows = []
+    for region, cities in MOROCCO_REGIONS.items():
+        for city in cities:
+            rows.append((f"{city}, morocco", city, 'morocco', region, True))
+    for city, country in FOREIGN_LOCATIONS:
+        rows.append((f"{city}, {country}", city, country, None, False))
+    df = pd.DataFrame(rows, columns=['location_raw', 'city', 'country', 'morocco_region', 'is_morocco'])
+    df.insert(0, 'location_id', np.arange(1, len(df) + 1))
+    df['work_location_type'] = np.where(df['city'] == 'remote', 'Remote', 'On-site')
+    return df
+
+
+def generate_gold_layer(n_jobs: int, seed: int = 42, repost_rate: float = 0.05) -> Dict[str, pd.DataFrame]:
+    """
+    Génère les tables Gold synthétiques
+
+    Args:
+        n_jobs: Nombre d'offres dans fact_job_offers
+        seed: Graine aléatoire
+        repost_rate: Part des offres republiées avec une légère variation
+
+    Returns:
+        Dictionnaire {nom_de_table: DataFrame}
+    """
+    rng = np.random.default_rng(seed)
+
+    n_companies = max(10, n_jobs // 25)
+    dim_company = pd.DataFrame({
+        'company_id': np.arange(1, n_companies + 1),
+        'company_name': [f"company {i}" for i in range(n_companies)],
+        'company_url': [f"https://www.linkedin.com/company/company-{i}" for i in range(n_companies)],
+    })
+    dim_location = _locations()
+
+    categories = list(ROLES)
+    category_idx = rng.integers(0, len(categories), size=n_jobs)
+    location_ids = rng.choice(dim_location['location_id'].to_numpy(), size=n_jobs)
+    city_by_id = dict(zip(dim_location['location_id'], dim_location['city']))
+    dim_skills = pd.DataFrame({
+        'skill_id': np.arange(1, len(SKILL_PATTERNS) + 1),
+        'skill_name': [skill for skill, _, _ in SKILL_PATTERNS],
+        'skill_category': [category for _, category, _ in SKILL_PATTERNS],
+    })
+    skills = dim_skills['skill_name'].to_numpy()
+    skill_id_by_name = dict(zip(dim_skills['skill_name'], dim_skills['skill_id']))
+    start = date(2023, 1, 1)
+
+    titles, descriptions, cited_skills = [], [], []
+    for i in range(n_jobs):
+        category = categories[category_idx[i]]
+        titles.append(rng.choice(ROLES[category]).lower())
+        job_skills = rng.choice(skills, size=int(rng.integers(3, 9)), replace=False)
+        parts, cited = [], set()
+        for template in rng.choice(SENTENCES, size=int(rng.integers(5, 10))):
+            pair = rng.choice(job_skills, size=2, replace=False)
+            cited.update(pair[:template.count('{skill')])
+            parts.append(template.format(
+                skill=pair[0], skill2=pair[1], city=city_by_id[location_ids[i]],
+                level=rng.choice(LEVELS), years=int(rng.integers(1, 8))
+            ))
+        descriptions.append(' '.join(parts).lower())
+        cited_skills.append(cited)
+
+    # Republications: même offre, une phrase ajoutée (quasi-doublon)
+    reposts = rng.choice(n_jobs, size=int(n_jobs * repost_rate), replace=False)
+    reposts = reposts[reposts > 0]
+    for i in reposts:
+        source = int(rng.integers(0, i))
+        titles[i] = titles[source]
+        descriptions[i] = descriptions[source] + ' apply before the end of the month.'
+        cited_skills[i] = cited_skills[source]
+        category_idx[i] = category_idx[source]
+        location_ids[i] = location_ids[source]
+
+    published = [start + timedelta(days=int(d)) for d in rng.integers(0, 730, size=n_jobs)]
+    company_ids = rng.integers(1, n_companies + 1, size=n_jobs)
+
+    fact_job_offers = pd.DataFrame({
+        'job_offer_id': np.arange(1, n_jobs + 1),
+        'company_id': company_ids,
+        'location_id': location_ids,
+        'job_title': titles,
+        'job_category': [categories[c] for c in category_idx],
+        'contract_type': rng.choice(CONTRACT_TYPES, size=n_jobs),
+        'work_type': rng.choice(WORK_TYPES, size=n_jobs),
+        'job_url': [f"https://www.linkedin.com/jobs/view/{i}" for i in range(n_jobs)],
+        'company_url': dim_company['company_url'].to_numpy()[company_ids - 1],
+        'job_description': descriptions,
+        'published_date': published,
+        'posted_time': [f"{int(d)} days ago" for d in rng.integers(1, 60, size=n_jobs)],
+    })
+
+    # Compétences citées par chaque offre (ce qu'extrairait int_skills_extraction)
+    skill_rows = [(i + 1, skill_id_by_name[skill], skill) for i, cited in enumerate(cited_skills) for skill in sorted(cited)]
+    fact_job_skills = pd.DataFrame(skill_rows, columns=['job_offer_id', 'skill_id', 'skill_name'])
+    fact_job_skills.insert(0, 'job_skill_id', np.arange(1, len(fact_job_skills) + 1))
+
+    return {
+        'fact_job_offers': fact_job_offers,
+        'dim_company': dim_company,
+        'dim_location': dim_location,
+        'dim_skills': dim_skills,
+        'fact_job_skills': fact_job_skills,
+    }
+
+
+def write_gold_layer(output_dir: Path, n_jobs: int, seed: int = 42) -> Path:
+    """
+    Écrit les tables Gold synthétiques en CSV dans output_dir
+
+    Returns:
+        Le dossier de sortie
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for name, df in generate_gold_layer(n_jobs, seed).items():
+        df.to_csv(output_dir / f"{name}.csv", index=False)
+    return output_dir
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Génère une couche Gold synthétique")
+    parser.add_argument('--n-jobs', type=int, default=10_000, help="Nombre d'offres")
+    parser.add_argument('--output-dir', type=str, required=True, help="Dossier de sortie")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    out = write_gold_layer(Path(args.output_dir), args.n_jobs, args.seed)
+    print(f"Couche Gold synthétique ({args.n_jobs:,} offres) écrite dans {out}")
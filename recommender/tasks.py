@@ -0,0 +1,254 @@
+"""
+File de tâches asynchrones en mémoire pour les requêtes longues
+
+Une tâche est soumise, exécutée par un pool borné de threads, puis consultée
+(GET /api/v1/tasks/{id}) ou notifiée par callback (hôtes publics ou
+autorisés uniquement, sans suivi des redirections). États:
+queued → running → succeeded | failed, ou cancelled (avant exécution).
+Les tâches terminées sont conservées TASK_RESULT_TTL secondes, dans la limite
+de TASK_MAX_FINISHED (les plus anciennes sont oubliées en premier); une clé
+d'idempotence permet à un client de re-soumettre sans dupliquer le travail.
+"""
+import ipaddress
+import json
+import socket
+import threading
+import time
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from config import (
+    TASK_WORKERS, TASK_MAX_PENDING, TASK_RESULT_TTL, TASK_MAX_FINISHED, TASK_CALLBACK_TIMEOUT,
+    TASK_CALLBACK_ALLOWED_HOSTS
+)
+from metrics import POOL_QUEUE_DEPTH
+
+QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED = 'queued', 'running', 'succeeded', 'failed', 'cancelled'
+
+
+class QueueFullError(RuntimeError):
+    """Trop de tâches en attente: le client doit réessayer plus tard"""
+
+
+class InvalidCallbackError(ValueError):
+    """callback_url refusée (schéma, hôte non autorisé ou adresse interne)"""
+
+
+def validate_callback_url(url: str):
+    """
+    Vérifie qu'une callback_url peut être notifiée sans atteindre le réseau interne
+
+    L'hôte doit figurer dans TASK_CALLBACK_ALLOWED_HOSTS (si la liste est
+    définie) et toutes ses adresses résolues doivent être publiques.
+
+    Raises:
+        InvalidCallbackError: URL non http(s), hôte non autorisé, non résolu ou
+            résolu vers une adresse privée, loopback, link-local ou réservée
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https') or not parts.hostname:
+        raise InvalidCallbackError("callback_url doit être une URL http(s)")
+    host = parts.hostname.lower()
+    if TASK_CALLBACK_ALLOWED_HOSTS and host not in TASK_CALLBACK_ALLOWED_HOSTS:
+        raise InvalidCallbackError(f"Hôte de callback non autorisé: {host}")
+
+    try:
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, port, proto=socket.IPPROTO_TCP)}
+    except (socket.gaierror, ValueError) as e:
+        raise InvalidCallbackError(f"Hôte de callback introuvable: {host} ({e})") from e
+    for address in addresses:
+        ip = ipaddress.ip_address(address.split('%')[0])
+        if not ip.is_global or ip.is_multicast:
+            raise InvalidCallbackError(f"Adresse de callback interne refusée: {host} ({ip})")
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    """Une redirection pourrait renvoyer le callback vers une adresse interne"""
+
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+_callback_opener = urllib.request.build_opener(_NoRedirect)
+
+
+class Task:
+    """Tâche soumise: état, progression, résultat ou erreur"""
+
+    def __init__(self, kind: str, idempotency_key: Optional[str] = None, callback_url: Optional[str] = None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = QUEUED
+        self.progress = 0.0
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.idempotency_key = idempotency_key
+        self.callback_url = callback_url
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._future = None
+
+    def set_progress(self, progress: float):
+        """Progression entre 0 et 1 (appelée par la fonction exécutée)"""
+        self.progress = round(min(max(progress, 0.0), 1.0), 4)
+
+    def to_dict(self, include_result: bool = True) -> Dict:
+        data = {
+            'task_id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'progress': self.progress,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+        }
+        if self.finished_at:
+            data['expires_at'] = self.finished_at + TASK_RESULT_TTL
+        if self.error:
+            data['error'] = self.error
+        if include_result and self.status == SUCCEEDED:
+            data['result'] = self.result
+        return data
+
+
+class TaskQueue:
+    """File de tâches bornée, exécutée par un pool de threads du processus"""
+
+    def __init__(
+        self,
+        workers: int = TASK_WORKERS,
+        max_pending: int = TASK_MAX_PENDING,
+        ttl: float = TASK_RESULT_TTL,
+        max_finished: int = TASK_MAX_FINISHED
+    ):
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self.max_finished = max_finished
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='task-worker')
+        self._tasks: Dict[str, Task] = {}
+        self._by_key: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._queue_depth = POOL_QUEUE_DEPTH.labels(pool='tasks')
+
+    def submit(
+        self,
+        kind: str,
+        function: Callable[[Task], Any],
+        idempotency_key: Optional[str] = None,
+        callback_url: Optional[str] = None
+    ) -> Tuple[Task, bool]:
+        """
+        Soumet une tâche
+
+        Args:
+            kind: Type de tâche (recommend, recommend_cv, recommend_cv_bulk)
+            function: Fonction exécutée avec la tâche en argument (pour set_progress);
+                sa valeur de retour (JSON-sérialisable) devient le résultat
+            idempotency_key: Clé client; une re-soumission renvoie la tâche existante
+            callback_url: URL notifiée (POST JSON) à la fin de la tâche,
+                déjà vérifiée par validate_callback_url
+
+        Returns:
+            (tâche, créée) - créée vaut False si la clé d'idempotence était connue
+
+        Raises:
+            QueueFullError: Si TASK_MAX_PENDING tâches sont déjà en attente
+        """
+        self._purge_expired()
+        scoped_key = f"{kind}:{idempotency_key}" if idempotency_key else None
+
+        with self._lock:
+            if scoped_key and scoped_key in self._by_key:
+                existing = self._tasks.get(self._by_key[scoped_key])
+                if existing is not None:
+                    return existing, False
+
+            pending = sum(task.status in (QUEUED, RUNNING) for task in self._tasks.values())
+            if pending >= self.max_pending:
+                raise QueueFullError(f"{pending} tâches en attente, réessayez plus tard")
+
+            task = Task(kind, idempotency_key, callback_url)
+            self._tasks[task.id] = task
+            if scoped_key:
+                self._by_key[scoped_key] = task.id
+            self._queue_depth.inc()
+            task._future = self._executor.submit(self._run, task, function)
+
+        return task, True
+
+    def _run(self, task: Task, function: Callable[[Task], Any]):
+        self._queue_depth.dec()
+        with self._lock:
+            if task.status == CANCELLED:
+                return
+            task.status = RUNNING
+            task.started_at = time.time()
+
+        try:
+            task.result = function(task)
+            task.progress = 1.0
+            task.status = SUCCEEDED
+        except Exception as e:
+            task.error = str(e)
+            task.status = FAILED
+        finally:
+            task.finished_at = time.time()
+        self._purge_expired()
+
+        if task.callback_url:
+            self._notify(task)
+
+    def _notify(self, task: Task):
+        """Notifie callback_url (meilleur effort: un échec n'affecte pas la tâche)"""
+        body = json.dumps(task.to_dict(), ensure_ascii=False, default=str).encode('utf-8')
+        request = urllib.request.Request(
+            task.callback_url, data=body, method='POST',
+            headers={'Content-Type': 'application/json'}
+        )
+        try:
+            # Nouvelle résolution: le DNS a pu changer depuis la soumission
+            validate_callback_url(task.callback_url)
+            with _callback_opener.open(request, timeout=TASK_CALLBACK_TIMEOUT):
+                pass
+        except Exception as e:
+            print(f"  → Callback de la tâche {task.id} en échec: {e}")
+
+    def get(self, task_id: str) -> Optional[Task]:
+        self._purge_expired()
+        with self._lock:
+            return self._tasks.get(task_id)
+
+    def cancel(self, task_id: str) -> bool:
+        """Annule une tâche encore en file (une tâche démarrée va à son terme)"""
+        with self._lock:
+            task = self._tasks.get(task_id)
+            if task is None or task.status != QUEUED:
+                return False
+            task.status = CANCELLED
+            task.finished_at = time.time()
+            if task._future.cancel():
+                self._queue_depth.dec()
+            return True
+
+    def _purge_expired(self):
+        """Oublie les tâches terminées depuis plus de `ttl` secondes, puis les plus anciennes au-delà de `max_finished`"""
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            finished = sorted(
+                (task for task in self._tasks.values() if task.finished_at),
+                key=lambda task: task.finished_at
+            )
+            excess = max(len(finished) - self.max_finished, 0)
+            expired = [task.id for i, task in enumerate(finished) if i < excess or task.finished_at < cutoff]
+            for task_id in expired:
+                task = self._tasks.pop(task_id)
+                if task.idempotency_key:
+                    self._by_key.pop(f"{task.kind}:{task.idempotency_key}", None)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,95 @@
+"""
+Classification partagée avec le warehouse dbt
+
+Compétences, catégories de titres et régions marocaines, compilées depuis les
+mêmes seeds que int_skills_extraction, int_job_title_normalization et
+dim_location (dbt/seeds/*.csv) et avec la même alternance regex: une seule
+passe par texte, les termes les plus longs d'abord, la plus petite priorité
+l'emporte. Le recommender et le warehouse classent ainsi un texte de façon
+identique.
+
+Un terme composé reconnu par la passe unique ("azure machine learning") est
+rattaché à toutes les compétences dont un motif y figure en mots entiers
+(Azure, Azure ML et Machine Learning), comme une recherche \\b par compétence.
+"""
+import hashlib
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import JOB_TITLE_PATTERNS, DEFAULT_JOB_CATEGORY, MOROCCO_CITY_REGIONS, SKILL_PATTERNS
+
+
+def _alternation(terms: Iterable[str]) -> str:
+    """Même ordre que la macro seed_alternation: longueur décroissante, puis alphabétique"""
+    ordered = sorted(set(terms), key=lambda term: (-len(term), term))
+    return '|'.join(f'(?:{term})' for term in ordered)
+
+
+def _first_by_priority(matches: Iterable[str], lookup: Dict[str, Tuple[int, str]]) -> Optional[str]:
+    best = min((lookup[match] for match in matches if match in lookup), default=None)
+    return best[1] if best else None
+
+
+# Terme → (priorité, catégorie); un terme présent dans deux motifs garde la plus petite priorité
+_TITLE_TERMS: Dict[str, Tuple[int, str]] = {}
+for priority, category, terms in JOB_TITLE_PATTERNS:
+    for term in terms:
+        _TITLE_TERMS[term] = min(_TITLE_TERMS.get(term, (priority, category)), (priority, category))
+
+_CITY_REGIONS: Dict[str, Tuple[int, str]] = {}
+for city, region, priority in MOROCCO_CITY_REGIONS:
+    _CITY_REGIONS[city] = min(_CITY_REGIONS.get(city, (priority, region)), (priority, region))
+
+# Sous-chaînes comme les anciens LIKE '%...%'; villes en mots entiers (bornes explicites,
+# identiques à city_alternation côté SQL)
+# \b ASCII comme RE2 (skills_alternation)
+SKILL_REGEX = re.compile(
+    rf"\b({_alternation(term for _, _, pattern in SKILL_PATTERNS for term in pattern.split('|'))})\b",
+    re.ASCII
+)
+# Motif d'une compétence cherché dans un terme trouvé (REGEXP_MATCHES côté SQL)
+_TERM_SKILL_TEMPLATE = r'\b(?:{})\b'
+# Change quand le seed ou le rattachement change: invalide les compétences de profils mises en cache
+SKILLS_VERSION = hashlib.sha256(repr((SKILL_PATTERNS, _TERM_SKILL_TEMPLATE)).encode('utf-8')).hexdigest()[:12]
+_SKILL_MATCHERS = [
+    (skill, re.compile(_TERM_SKILL_TEMPLATE.format(pattern), re.ASCII)) for skill, _, pattern in SKILL_PATTERNS
+]
+TITLE_REGEX = re.compile(f'({_alternation(_TITLE_TERMS)})')
+CITY_REGEX = re.compile(f'(?:^|[^a-zà-ÿ])({_alternation(_CITY_REGIONS)})(?:[^a-zà-ÿ]|$)')
+
+
+@lru_cache(maxsize=4096)
+def _term_skills(term: str) -> Tuple[str, ...]:
+    """Compétences dont le motif reconnaît le terme ou l'un de ses sous-termes en mots entiers"""
+    return tuple(skill for skill, matcher in _SKILL_MATCHERS if matcher.search(term))
+
+
+def extract_skills(text: Optional[str]) -> List[str]:
+    """Compétences citées dans un texte (CV, profil), triées par nom"""
+    if not text:
+        return []
+    found = set()
+    for term in set(SKILL_REGEX.findall(text.lower())):
+        found.update(_term_skills(term))
+    return sorted(found)
+
+
+def classify_job_title(title: Optional[str]) -> str:
+    """Catégorie d'un titre d'offre (DEFAULT_JOB_CATEGORY si aucun motif)"""
+    if not title:
+        return DEFAULT_JOB_CATEGORY
+    category = _first_by_priority(TITLE_REGEX.findall(title.lower()), _TITLE_TERMS)
+    return category or DEFAULT_JOB_CATEGORY
+
+
+def morocco_region(location: Optional[str]) -> Optional[str]:
+    """Région marocaine d'une localisation ('Morocco (General)' si seul le pays est cité)"""
+    if not location:
+        return None
+    return _first_by_priority(CITY_REGEX.findall(location.lower()), _CITY_REGIONS)
+
+
+def is_morocco_location(location: Optional[str]) -> bool:
+    """Vrai si la localisation cite une ville du Maroc ou le pays"""
+    return morocco_region(location) is not None
@@ -116,10 +116,10 @@ print()
 print("🎉 Votre système est prêt à fonctionner!")
 print()
 print("Prochaines étapes:")
-print("  1. Tester le recommender: python job_recommender.py")
+print("  1. Construire l'index: python build_index.py")
 print("  2. Lancer l'API: python api.py")
 print("  3. Lancer l'interface Streamlit: streamlit run app.py")
 print()
-print("Note: Le premier lancement de job_recommender.py prendra 5-10 minutes")
+print("Note: La première construction de l'index prendra 5-10 minutes")
 print("pour créer les embeddings de 200K offres. Les fois suivantes seront rapides!")
 print()
@@ -0,0 +1,111 @@
+"""
+Chronométrage par étape des requêtes de recommandation
+
+- StageTimer: mesure les étapes d'une requête (encode, search, score...)
+- TimingStats: agrégation en mémoire (compte, moyenne, p50/p95/p99, max)
+  des dernières requêtes, par opération et par étape
+"""
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Dict
+
+import numpy as np
+
+# Nombre de mesures conservées par étape pour le calcul des percentiles
+TIMING_WINDOW = 1024
+
+
+class StageTimer:
+    """
+    Chronomètre des étapes d'une requête
+
+    Usage:
+        timer = StageTimer()
+        with timer.stage('encode'):
+            ...
+        timer.server_timing()  # "encode;dur=12.31, total;dur=12.40"
+    """
+
+    def __init__(self):
+        self._start = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        """Mesure la durée d'un bloc (cumulée si l'étape se répète)"""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + (time.perf_counter() - t0) * 1000
+
+    @property
+    def total_ms(self) -> float:
+        """Durée écoulée depuis la création du chronomètre (ms)"""
+        return (time.perf_counter() - self._start) * 1000
+
+    def as_dict(self) -> Dict[str, float]:
+        """Durées par étape en millisecondes, plus le total"""
+        timings = {name: round(ms, 3) for name, ms in self.stages.items()}
+        timings['total'] = round(self.total_ms, 3)
+        return timings
+
+    def server_timing(self) -> str:
+        """Valeur de l'en-tête HTTP Server-Timing"""
+        return ', '.join(f"{name};dur={ms:.2f}" for name, ms in self.as_dict().items())
+
+
+class TimingStats:
+    """Agrégation en mémoire (thread-safe) des durées par opération et par étape"""
+
+    def __init__(self, window: int = TIMING_WINDOW):
+        self._lock = threading.Lock()
+        self._samples = defaultdict(lambda: defaultdict(lambda: deque(maxlen=window)))
+        self._counts = defaultdict(lambda: defaultdict(int))
+
+    def record(self, operation: str, timer: StageTimer):
+        """Enregistre les durées d'une requête terminée"""
+        timings = timer.as_dict()
+        with self._lock:
+            for name, ms in timings.items():
+                self._samples[operation][name].append(ms)
+                self._counts[operation][name] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Résumé des durées agrégées
+
+        Returns:
+            {operation: {étape: {count, mean_ms, p50_ms, p95_ms, p99_ms, max_ms}}}
+            (percentiles calculés sur les TIMING_WINDOW dernières requêtes)
+        """
+        with self._lock:
+            samples = {op: {name: list(values) for name, values in stages.items()}
+                       for op, stages in self._samples.items()}
+            counts = {op: dict(stages) for op, stages in self._counts.items()}
+
+        summary = {}
+        for operation, stages in samples.items():
+            summary[operation] = {}
+            for name, values in stages.items():
+                values = np.asarray(values)
+                summary[operation][name] = {
+                    'count': counts[operation][name],
+                    'mean_ms': round(float(values.mean()), 3),
+                    'p50_ms': round(float(np.percentile(values, 50)), 3),
+                    'p95_ms': round(float(np.percentile(values, 95)), 3),
+                    'p99_ms': round(float(np.percentile(values, 99)), 3),
+                    'max_ms': round(float(values.max()), 3),
+                }
+        return summary
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+
+
+# Agrégateur partagé par le processus (API, Streamlit)
+timing_stats = TimingStats()
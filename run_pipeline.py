@@ -8,10 +8,17 @@ Purpose: Orchestrate DBT runs and export data to CSV/Parquet
 
 import os
 import sys
+import json
+import argparse
+import time
+import threading
+import hashlib
 import subprocess
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
+from importlib import metadata
 
 # Project paths
 PROJECT_ROOT = Path(__file__).parent
@@ -21,6 +28,38 @@ GOLD_PATH = DATA_PATH / "gold"
 BRONZE_PATH = DATA_PATH / "bronze"
 SILVER_PATH = DATA_PATH / "silver"
 
+# Bronze ingestion: scraped drops land in data/landing/, each file is converted
+# once to Parquet under data/bronze/jobs/ingestion_date=YYYY-MM-DD/
+LANDING_PATH = DATA_PATH / "landing"
+LEGACY_SOURCE_FILE = PROJECT_ROOT / "recruiter_ai_jobs_data.csv"
+BRONZE_JOBS_PATH = BRONZE_PATH / "jobs"
+BRONZE_MANIFEST = BRONZE_PATH / "_manifest.json"
+SOURCE_READERS = {'.csv': 'read_csv_auto', '.json': 'read_json_auto', '.parquet': 'read_parquet'}
+
+# Gold exports: Parquet (zstd) for the recommender, CSV for Power BI
+GOLD_TABLES = [
+    'dim_time',
+    'dim_company',
+    'dim_location',
+    'dim_skills',
+    'fact_job_offers',
+    'fact_job_skills',
+    'agg_job_offers_by_category_time',
+    'agg_skills_demand',
+    'agg_location_analysis',
+    'agg_job_offers_cube',
+    'agg_skills_cube',
+]
+EXPORT_FORMATS = ['csv', 'parquet', 'both']
+# Hive partitioning of Parquet exports (with --partition)
+PARQUET_PARTITIONS = {'fact_job_offers': ['published_year']}
+
+# Step fingerprints of the last successful run: a step whose inputs did not
+# change since is skipped (unless --force)
+PIPELINE_STATE = DATA_PATH / ".pipeline_state.json"
+DBT_SOURCE_DIRS = ['models', 'macros', 'seeds', 'tests', 'analyses']
+PIPELINE_PACKAGES = ['dbt-core', 'dbt-duckdb', 'duckdb', 'pandas']
+
 # Project branding
 PROJECT_NAME = "RecruiterAI"
 PROJECT_VERSION = "2.0"
@@ -145,35 +184,125 @@ def initialize_dbt():
         print(result.stdout)
         return True
 
-def copy_source_data():
-    """Copy source data to bronze layer"""
-    print_section("Preparing Data Layers")
+def file_sha256(path):
+    """SHA-256 of a file (read in 1 MB chunks)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def load_manifest():
+    """Bronze manifest: one entry per source file already converted to Parquet"""
+    if BRONZE_MANIFEST.exists():
+        return json.loads(BRONZE_MANIFEST.read_text(encoding='utf-8'))
+    return {'files': []}
+
+def save_manifest(manifest):
+    tmp_path = BRONZE_MANIFEST.with_suffix('.tmp')
+    tmp_path.write_text(json.dumps(manifest, indent=2, ensure_ascii=False), encoding='utf-8')
+    os.replace(tmp_path, BRONZE_MANIFEST)
+
+def find_source_drops():
+    """Scraped drops waiting in data/landing/ (plus the legacy root CSV)"""
+    drops = []
+    if LANDING_PATH.exists():
+        drops = sorted(p for p in LANDING_PATH.rglob('*') if p.is_file() and p.suffix.lower() in SOURCE_READERS)
+    if LEGACY_SOURCE_FILE.exists():
+        drops.insert(0, LEGACY_SOURCE_FILE)
+    return drops
+
+def _sql_path(path):
+    return str(path).replace("'", "''")
+
+def ingest_bronze():
+    """Convert new source drops to partitioned Parquet (bronze layer)"""
+    print_section("Ingesting Bronze Layer")
     
     # Create directories
-    for path in [BRONZE_PATH, SILVER_PATH, GOLD_PATH]:
+    for path in [LANDING_PATH, BRONZE_JOBS_PATH, SILVER_PATH, GOLD_PATH]:
         path.mkdir(parents=True, exist_ok=True)
-        print_success(f"Directory ready: {path.name}/")
+        print_success(f"Directory ready: {path.relative_to(DATA_PATH)}/")
     
-    # Copy source data to bronze
-    source_file = PROJECT_ROOT / "recruiter_ai_jobs_data.csv"
-    bronze_file = BRONZE_PATH / "recruiter_ai_jobs_data.csv"
+    try:
+        import duckdb
+    except ImportError:
+        print_error("duckdb not installed. Run: pip install duckdb")
+        return False
     
-    if source_file.exists():
-        shutil.copy2(source_file, bronze_file)
-        print_success(f"Source data copied to bronze layer")
+    manifest = load_manifest()
+    known_hashes = {entry['sha256'] for entry in manifest['files']}
+    drops = find_source_drops()
+    new_files = 0
+    conn = duckdb.connect()
+    
+    for source in drops:
+        digest = file_sha256(source)
+        if digest in known_hashes:
+            continue
         
-        # Get file size
-        size_mb = source_file.stat().st_size / (1024 * 1024)
-        print_info(f"File size: {size_mb:.2f} MB")
-        return True
-    else:
-        print_error(f"Source file not found: {source_file}")
+        ingested_at = datetime.now().replace(microsecond=0)
+        partition = BRONZE_JOBS_PATH / f"ingestion_date={ingested_at:%Y-%m-%d}"
+        partition.mkdir(parents=True, exist_ok=True)
+        target = partition / f"{source.stem}_{digest[:12]}.parquet"
+        tmp_target = target.with_suffix('.parquet.tmp')
+        reader = SOURCE_READERS[source.suffix.lower()]
+        
+        try:
+            conn.execute(f"""
+                COPY (
+                    SELECT
+                        *,
+                        TIMESTAMP '{ingested_at:%Y-%m-%d %H:%M:%S}' as _ingested_at,
+                        '{_sql_path(source.name)}' as _source_file
+                    FROM {reader}('{_sql_path(source)}')
+                ) TO '{_sql_path(tmp_target)}' (FORMAT PARQUET, COMPRESSION ZSTD)
+            """)
+            rows = conn.execute(f"SELECT COUNT(*) FROM read_parquet('{_sql_path(tmp_target)}')").fetchone()[0]
+        except Exception as e:
+            tmp_target.unlink(missing_ok=True)
+            print_error(f"Could not ingest {source.name}: {e}")
+            return False
+        
+        os.replace(tmp_target, target)
+        manifest['files'].append({
+            'source': str(source),
+            'sha256': digest,
+            'bronze_file': str(target.relative_to(BRONZE_PATH)),
+            'rows': rows,
+            'ingested_at': ingested_at.isoformat(),
+        })
+        # Manifest saved after each file: an interrupted run resumes where it stopped
+        save_manifest(manifest)
+        known_hashes.add(digest)
+        new_files += 1
+        print_success(f"Ingested {source.name} → {target.relative_to(BRONZE_PATH)} ({rows:,} rows)")
+    
+    conn.close()
+    
+    if not manifest['files']:
+        print_error(f"No source data found (expected files in {LANDING_PATH} or {LEGACY_SOURCE_FILE.name})")
         return False
+    
+    print_info(f"{new_files} new file(s), {len(manifest['files'])} file(s) in bronze")
+    return True
 
 def run_dbt_transformation():
     """Run DBT transformation"""
     print_section("Running DBT Transformations")
     
+    # Les seeds (dictionnaire des compétences...) doivent exister avant dbt run
+    print_info("Loading dbt seeds...")
+    result = subprocess.run(
+        ['dbt', 'seed', '--profiles-dir', '.'],
+        cwd=DBT_PROJECT_PATH,
+        capture_output=False
+    )
+    
+    if result.returncode != 0:
+        print_error("DBT seed failed")
+        return False
+    
     print_info("Executing dbt run...")
     print_info("This may take a few minutes...")
     
@@ -191,7 +320,7 @@ def run_dbt_transformation():
         return False
 
 def run_dbt_tests():
-    """Run DBT tests (optional)"""
+    """Run DBT tests (optional: main() does not stop on failure, but the step is not recorded as done)"""
     print_section("Running DBT Tests")
     
     result = subprocess.run(
@@ -207,15 +336,67 @@ def run_dbt_tests():
         print_warning("Some DBT tests failed (non-critical)")
         print(result.stdout)
     
-    return True
+    return result.returncode == 0
+
+def _remove_path(path):
+    if path.is_dir():
+        shutil.rmtree(path)
+    elif path.exists():
+        path.unlink()
 
-def export_to_csv():
-    """Export Gold tables to CSV"""
-    print_section("Exporting Gold Layer to CSV")
+def _export_table(conn, table, formats, partition):
+    """Export one gold table with DuckDB COPY (runs in a worker thread)"""
+    cursor = conn.cursor()
+    try:
+        rows = cursor.execute(f"SELECT COUNT(*) FROM gold.{table}").fetchone()[0]
+        outputs = []
+        
+        if 'parquet' in formats:
+            partition_by = PARQUET_PARTITIONS.get(table) if partition else None
+            single_file = GOLD_PATH / f"{table}.parquet"
+            partitioned_dir = GOLD_PATH / table
+            if partition_by:
+                # Written next to the current export, then swapped in: readers keep
+                # the previous export while the COPY runs or if it fails
+                tmp_dir = GOLD_PATH / f"{table}.tmp"
+                old_dir = GOLD_PATH / f"{table}.old"
+                _remove_path(tmp_dir)
+                _remove_path(old_dir)
+                cursor.execute(
+                    f"COPY gold.{table} TO '{_sql_path(tmp_dir)}' "
+                    f"(FORMAT PARQUET, COMPRESSION ZSTD, PARTITION_BY ({', '.join(partition_by)}))"
+                )
+                if partitioned_dir.exists():
+                    os.replace(partitioned_dir, old_dir)
+                os.replace(tmp_dir, partitioned_dir)
+                # A single file would take precedence over the directory for readers
+                _remove_path(single_file)
+                _remove_path(old_dir)
+                outputs.append(f"{table}/")
+            else:
+                tmp_path = single_file.with_suffix('.parquet.tmp')
+                cursor.execute(f"COPY gold.{table} TO '{_sql_path(tmp_path)}' (FORMAT PARQUET, COMPRESSION ZSTD)")
+                os.replace(tmp_path, single_file)
+                _remove_path(partitioned_dir)
+                outputs.append(single_file.name)
+        
+        if 'csv' in formats:
+            csv_path = GOLD_PATH / f"{table}.csv"
+            tmp_path = csv_path.with_suffix('.csv.tmp')
+            cursor.execute(f"COPY gold.{table} TO '{_sql_path(tmp_path)}' (FORMAT CSV, HEADER)")
+            os.replace(tmp_path, csv_path)
+            outputs.append(csv_path.name)
+        
+        return rows, outputs
+    finally:
+        cursor.close()
+
+def export_gold_tables(export_format='both', partition=False):
+    """Export Gold tables concurrently (Parquet and/or CSV)"""
+    print_section(f"Exporting Gold Layer ({export_format})")
     
     try:
         import duckdb
-        import pandas as pd
         
         db_path = DBT_PROJECT_PATH / "recruiter_ai.db"
         
@@ -227,36 +408,28 @@ def export_to_csv():
             print_error(f"Database not found: {db_path}")
             return False
         
+        GOLD_PATH.mkdir(parents=True, exist_ok=True)
+        formats = ['csv', 'parquet'] if export_format == 'both' else [export_format]
         conn = duckdb.connect(str(db_path), read_only=True)
         
-        # List of Gold tables to export
-        gold_tables = [
-            ('gold', 'dim_time'),
-            ('gold', 'dim_company'),
-            ('gold', 'dim_location'),
-            ('gold', 'dim_skills'),
-            ('gold', 'fact_job_offers'),
-            ('gold', 'fact_job_skills'),
-            ('gold', 'agg_job_offers_by_category_time'),
-            ('gold', 'agg_skills_demand'),
-            ('gold', 'agg_location_analysis'),
-        ]
-        
         exported_count = 0
-        for schema, table in gold_tables:
-            try:
-                df = conn.execute(f"SELECT * FROM {schema}.{table}").fetchdf()
-                output_file = GOLD_PATH / f"{table}.csv"
-                df.to_csv(output_file, index=False)
-                print_success(f"Exported {table}.csv ({len(df):,} rows)")
-                exported_count += 1
-            except Exception as e:
-                print_warning(f"Could not export {table}: {e}")
+        with ThreadPoolExecutor(max_workers=len(GOLD_TABLES)) as executor:
+            futures = {
+                table: executor.submit(_export_table, conn, table, formats, partition)
+                for table in GOLD_TABLES
+            }
+            for table, future in futures.items():
+                try:
+                    rows, outputs = future.result()
+                    print_success(f"Exported {', '.join(outputs)} ({rows:,} rows)")
+                    exported_count += 1
+                except Exception as e:
+                    print_warning(f"Could not export {table}: {e}")
         
         conn.close()
         
-        print_info(f"Exported {exported_count}/{len(gold_tables)} tables to {GOLD_PATH}")
-        return True
+        print_info(f"Exported {exported_count}/{len(GOLD_TABLES)} tables to {GOLD_PATH}")
+        return exported_count == len(GOLD_TABLES)
         
     except ImportError:
         print_error("duckdb not installed. Run: pip install duckdb")
@@ -269,21 +442,25 @@ def generate_summary():
     """Generate summary of transformation"""
     print_section("Pipeline Summary")
     
-    # Check exported files
-    csv_files = list(GOLD_PATH.glob("*.csv"))
+    # Check exported files (partitioned Parquet exports are directories)
+    exported = sorted(
+        p for p in GOLD_PATH.iterdir()
+        if p.suffix in ('.csv', '.parquet') or (p.is_dir() and p.name in GOLD_TABLES)
+    ) if GOLD_PATH.exists() else []
     
     print(f"{Colors.OKCYAN}📊 RecruiterAI Pipeline Results:{Colors.ENDC}")
-    print(f"   • Exported CSV files: {len(csv_files)}")
+    print(f"   • Exported files: {len(exported)}")
     print(f"   • Output directory: {GOLD_PATH}")
     print()
     
-    if csv_files:
+    if exported:
         print(f"{Colors.OKCYAN}📁 Exported Files:{Colors.ENDC}")
         total_size = 0
-        for f in sorted(csv_files):
-            size_kb = f.stat().st_size / 1024
+        for f in exported:
+            files = list(f.rglob('*.parquet')) if f.is_dir() else [f]
+            size_kb = sum(p.stat().st_size for p in files) / 1024
             total_size += size_kb
-            print(f"   • {f.name}: {size_kb:.1f} KB")
+            print(f"   • {f.name}{'/' if f.is_dir() else ''}: {size_kb:.1f} KB")
         print(f"   • Total: {total_size/1024:.2f} MB")
     
     print()
@@ -298,8 +475,161 @@ def generate_summary():
     print()
     print(f"{Colors.OKCYAN}🇲🇦 Focus Morocco - Happy Job Hunting! 🚀{Colors.ENDC}")
 
+# ============================================================================
+# Change-aware orchestration
+# ============================================================================
+
+def _digest(*parts):
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+def hash_tree(root, patterns=('*',)):
+    """Hash of the names and contents of the files under root"""
+    digest = hashlib.sha256()
+    root = Path(root)
+    if root.exists():
+        files = sorted({p for pattern in patterns for p in root.rglob(pattern) if p.is_file()})
+        for path in files:
+            digest.update(str(path.relative_to(root)).encode('utf-8'))
+            digest.update(file_sha256(path).encode('ascii'))
+    return digest.hexdigest()
+
+def package_versions():
+    versions = {}
+    for package in PIPELINE_PACKAGES:
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = None
+    return versions
+
+def fingerprint_dependencies():
+    return _digest(sys.executable, package_versions())
+
+def fingerprint_dbt_config():
+    return _digest(
+        package_versions(),
+        *(file_sha256(DBT_PROJECT_PATH / name) for name in ('dbt_project.yml', 'profiles.yml')
+          if (DBT_PROJECT_PATH / name).exists())
+    )
+
+def fingerprint_sources():
+    """Cheap source check: path, size and mtime of each drop (content hashed at ingestion)"""
+    return _digest([(str(p), p.stat().st_size, p.stat().st_mtime_ns) for p in find_source_drops()])
+
+def fingerprint_transformations():
+    """Bronze manifest + every dbt input (models, macros, seeds, tests, config)"""
+    return _digest(
+        BRONZE_MANIFEST.read_text(encoding='utf-8') if BRONZE_MANIFEST.exists() else None,
+        {name: hash_tree(DBT_PROJECT_PATH / name) for name in DBT_SOURCE_DIRS},
+        file_sha256(DBT_PROJECT_PATH / "dbt_project.yml"),
+    )
+
+def warehouse_path():
+    db_path = DBT_PROJECT_PATH / "recruiter_ai.db"
+    return db_path if db_path.exists() else DBT_PROJECT_PATH / "duckdb.db"
+
+def gold_row_counts():
+    """Row count of each gold table (None if the warehouse is unreadable)"""
+    try:
+        import duckdb
+        conn = duckdb.connect(str(warehouse_path()), read_only=True)
+    except Exception:
+        return None
+    try:
+        counts = {}
+        for table in GOLD_TABLES:
+            try:
+                counts[table] = conn.execute(f"SELECT COUNT(*) FROM gold.{table}").fetchone()[0]
+            except Exception:
+                counts[table] = None
+        return counts
+    finally:
+        conn.close()
+
+def gold_exports_exist(export_format):
+    formats = ['csv', 'parquet'] if export_format == 'both' else [export_format]
+    for table in GOLD_TABLES:
+        if 'csv' in formats and not (GOLD_PATH / f"{table}.csv").exists():
+            return False
+        if 'parquet' in formats and not ((GOLD_PATH / f"{table}.parquet").exists() or (GOLD_PATH / table).is_dir()):
+            return False
+    return True
+
+def load_state():
+    if PIPELINE_STATE.exists():
+        try:
+            return json.loads(PIPELINE_STATE.read_text(encoding='utf-8'))
+        except ValueError:
+            print_warning(f"Unreadable pipeline state, ignoring: {PIPELINE_STATE}")
+    return {}
+
+def save_state(state):
+    PIPELINE_STATE.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = PIPELINE_STATE.with_suffix('.tmp')
+    tmp_path.write_text(json.dumps(state, indent=2), encoding='utf-8')
+    os.replace(tmp_path, PIPELINE_STATE)
+
+class PipelineRun:
+    """Runs steps, skips those whose fingerprint is unchanged, times each one"""
+    
+    def __init__(self, force=False):
+        self.force = force
+        self.state = load_state()
+        self.report = []
+        self._lock = threading.Lock()
+    
+    def step(self, name, function, fingerprint=None, outputs_exist=None):
+        """
+        Run a step unless its inputs are unchanged since its last success
+        
+        fingerprint: callable returning the hash of the step inputs (None: always run)
+        outputs_exist: callable; the step is never skipped if it returns False
+        """
+        start = time.perf_counter()
+        current = fingerprint() if fingerprint else None
+        
+        if (not self.force and current is not None
+                and self.state.get(name) == current
+                and (outputs_exist is None or outputs_exist())):
+            self.report.append((name, 'skipped', time.perf_counter() - start))
+            print_info(f"{name}: unchanged since last run, skipped")
+            return True
+        
+        ok = function()
+        with self._lock:
+            if ok and current is not None:
+                self.state[name] = current
+            else:
+                self.state.pop(name, None)
+            save_state(self.state)
+            self.report.append((name, 'ok' if ok else 'failed', time.perf_counter() - start))
+        return ok
+    
+    def concurrent(self, steps):
+        """Run independent steps in parallel; returns {name: ok}"""
+        with ThreadPoolExecutor(max_workers=len(steps)) as executor:
+            futures = {step[0]: executor.submit(self.step, *step) for step in steps}
+            return {name: future.result() for name, future in futures.items()}
+    
+    def print_report(self):
+        print_section("Step Timings")
+        for name, status, seconds in self.report:
+            color = {'ok': Colors.OKGREEN, 'skipped': Colors.OKCYAN}.get(status, Colors.FAIL)
+            print(f"   {name:<22} {color}{status:<8}{Colors.ENDC} {seconds:8.2f}s")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=f"{PROJECT_NAME} data pipeline")
+    parser.add_argument('--export-format', choices=EXPORT_FORMATS, default='both',
+                        help="Gold export format: csv (Power BI), parquet (recommender) or both")
+    parser.add_argument('--partition', action='store_true',
+                        help="Hive-partition large Parquet exports (fact_job_offers by published_year)")
+    parser.add_argument('--force', action='store_true',
+                        help="Run every step even if its inputs did not change")
+    return parser.parse_args(argv)
+
 def main():
     """Main orchestration function"""
+    args = parse_args()
     start_time = datetime.now()
     
     # Print banner
@@ -307,35 +637,49 @@ def main():
     
     print(f"{Colors.OKBLUE}Pipeline started at: {start_time.strftime('%Y-%m-%d %H:%M:%S')}{Colors.ENDC}")
     
-    # Step 1: Check dependencies
-    if not check_dependencies():
+    run = PipelineRun(force=args.force)
+    
+    # Steps 1-3 are independent: dependencies, dbt configuration, bronze ingestion
+    results = run.concurrent([
+        ('dependencies', check_dependencies, fingerprint_dependencies),
+        ('dbt_debug', initialize_dbt, fingerprint_dbt_config),
+        ('ingest_bronze', ingest_bronze, fingerprint_sources, lambda: BRONZE_MANIFEST.exists()),
+    ])
+    if not results['dependencies']:
         print_error("Please install missing dependencies and try again")
         sys.exit(1)
-    
-    # Step 2: Initialize DBT
-    if not initialize_dbt():
+    if not results['dbt_debug']:
         print_error("DBT initialization failed")
         sys.exit(1)
-    
-    # Step 3: Copy source data
-    if not copy_source_data():
+    if not results['ingest_bronze']:
         print_error("Data preparation failed")
         sys.exit(1)
     
-    # Step 4: Run DBT transformation
-    if not run_dbt_transformation():
+    # Step 4: Run DBT transformation (seeds + models)
+    if not run.step('dbt_run', run_dbt_transformation, fingerprint_transformations,
+                    lambda: warehouse_path().exists()):
         print_error("DBT transformation failed")
+        run.print_report()
         sys.exit(1)
     
-    # Step 5: Run DBT tests (optional, non-blocking)
-    run_dbt_tests()
-    
-    # Step 6: Export to CSV
-    if not export_to_csv():
-        print_warning("CSV export had issues, but pipeline completed")
+    # Steps 5-6 share the DuckDB file (dbt test opens it read-write): sequential
+    # Step 5: Run DBT tests (optional, non-blocking; failures are rerun next time)
+    if not run.step('dbt_test', run_dbt_tests, lambda: _digest(run.state.get('dbt_run'))):
+        print_warning("DBT tests failed, continuing with the export")
+    
+    # Step 6: Export Gold tables (Parquet and/or CSV)
+    export_ok = run.step(
+        'export_gold',
+        lambda: export_gold_tables(args.export_format, args.partition),
+        lambda: _digest(run.state.get('dbt_run'), gold_row_counts(), args.export_format, args.partition),
+        lambda: gold_exports_exist(args.export_format)
+    )
+    if not export_ok:
+        print_warning("Gold export had issues, but pipeline completed")
     
     # Step 7: Generate summary
     generate_summary()
+    run.print_report()
     
     end_time = datetime.now()
     duration = (end_time - start_time).total_seconds()